@@ -0,0 +1,61 @@
+-- Schema mínimo para benchmarks locais do seed (docker compose --profile bench)
+-- Reproduz apenas as tabelas/colunas usadas por scripts/seed_processes_to_supabase.py
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+DO $$
+BEGIN
+    CREATE TYPE processcategory AS ENUM (
+        'governanca', 'acesso_seguranca', 'operacao', 'areas_comuns',
+        'convivencia', 'eventos', 'emergencias'
+    );
+    CREATE TYPE documenttype AS ENUM (
+        'manual', 'regulamento', 'pop', 'fluxograma', 'aviso',
+        'comunicado', 'checklist', 'formulario', 'politica'
+    );
+    CREATE TYPE processstatus AS ENUM ('rascunho', 'em_revisao', 'aprovado', 'rejeitado');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS stakeholders (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name TEXT NOT NULL,
+    email TEXT,
+    type TEXT,
+    role TEXT,
+    user_role TEXT,
+    is_active BOOLEAN DEFAULT true
+);
+
+CREATE TABLE IF NOT EXISTS processes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name TEXT NOT NULL,
+    category processcategory NOT NULL,
+    subcategory TEXT,
+    document_type documenttype NOT NULL,
+    status processstatus NOT NULL DEFAULT 'rascunho',
+    creator_id UUID REFERENCES stakeholders(id),
+    current_version_number INTEGER DEFAULT 1,
+    content_hash TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_processes_name_unique ON processes(name);
+
+CREATE TABLE IF NOT EXISTS process_versions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    process_id UUID NOT NULL REFERENCES processes(id) ON DELETE CASCADE,
+    version_number INTEGER NOT NULL,
+    content JSONB NOT NULL,
+    content_text TEXT,
+    entities_involved JSONB,
+    variables_applied JSONB,
+    previous_version_id UUID,
+    change_summary TEXT,
+    created_by UUID REFERENCES stakeholders(id),
+    status processstatus NOT NULL DEFAULT 'rascunho',
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_process_versions_process_id ON process_versions(process_id);
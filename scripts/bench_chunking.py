@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark de estratégias de chunking (chunking.py) sobre o catálogo local,
+sem banco: para cada configuração, quantos chunks e tokens seriam gravados
+em knowledge_base_documents, quantas requisições de embedding e a
+qualidade de recuperação num conjunto de consultas rotuladas.
+
+Cada consulta rotulada (scripts/bench/chunking_queries.json) indica o
+processo e um trecho da resposta. Uma consulta é acertada em k quando um
+dos k primeiros chunks é do processo certo e contém o trecho (sem
+diferenciar acentos e maiúsculas), independente de como o texto foi
+cortado. Relatados: recall@k (para cada k de --k), MRR e recall@k por
+processo (algum chunk do processo nos k primeiros).
+
+Uso:
+    python scripts/bench_chunking.py --embedder local
+    python scripts/bench_chunking.py --targets 64,128,256,512 --overlap 32 --mode hybrid --output /tmp/chunking.json
+
+Requisitos:
+    pip install numpy
+"""
+
+import json
+import sys
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from catalog_cache import load_catalog
+from chunking import DEFAULT_OVERLAP_TOKENS, chunker, count_tokens
+from embedders import embedder_from_env
+from ingest_processes import Item, build_documents, catalog_items
+from lexical_search import LexicalIndex, hybrid_search_indices
+from vector_search import VectorSearch, require_numpy
+
+DEFAULT_QUERIES_PATH = 'scripts/bench/chunking_queries.json'
+
+
+def _normalize(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ' '.join(''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold().split())
+
+
+def load_queries(path: str, items: List[Item]) -> List[Dict[str, Any]]:
+    """Consultas rotuladas; avisa sobre processos ou respostas que não existem no catálogo."""
+    with open(path, 'r', encoding='utf-8') as f:
+        queries = json.load(f)
+    names = {process['name'] for process, _ in items}
+    texts: Dict[str, str] = {}
+    for process, version in items:
+        texts[process['name']] = _normalize(json.dumps(version.get('content'), ensure_ascii=False)
+                                            + ' ' + process['name'])
+    valid = []
+    for query in queries:
+        if query['process'] not in names:
+            print(f"⚠️  Processo não encontrado no catálogo: {query['process']!r}", file=sys.stderr)
+        elif _normalize(query['answer']) not in texts[query['process']]:
+            print(f"⚠️  Resposta não encontrada em {query['process']!r}: {query['answer']!r}", file=sys.stderr)
+        else:
+            valid.append(query)
+    return valid
+
+
+def evaluate(items: List[Item], queries: List[Dict[str, Any]], query_embeddings: List[Any], embedder: Any,
+             build: Any, ks: List[int], mode: str = 'vector', embed_batch_size: int = 64) -> Dict[str, Any]:
+    """Chunks, tokens, requisições e qualidade de uma estratégia de chunking."""
+    requests_before = embedder.requests
+    start = time.perf_counter()
+    documents = build_documents(items, embedder, embed_batch_size, build)
+    build_seconds = time.perf_counter() - start
+    names = {version['id']: process['name'] for process, version in items}
+    rows = [{**row, 'process_name': names[row['process_version_id']]}
+            for _, version in items for row in documents[version['id']]]
+    tokens = [count_tokens(row['content']) for row in rows]
+
+    vectors = VectorSearch.from_rows(rows)
+    lexical = LexicalIndex.from_rows(vectors.rows) if mode == 'hybrid' else None
+    depth = max(ks)
+    hits = {k: 0 for k in ks}
+    process_hits = {k: 0 for k in ks}
+    reciprocal = 0.0
+    for query, embedding in zip(queries, query_embeddings):
+        if lexical is not None:
+            found = [i for i, *_ in hybrid_search_indices(vectors, lexical, embedding, query['query'], -1.0, depth)]
+        else:
+            found = [i for i, _ in vectors.search_indices(embedding, -1.0, depth)]
+        answer = _normalize(query['answer'])
+        first: Optional[int] = None
+        first_process: Optional[int] = None
+        for rank, index in enumerate(found, 1):
+            row = vectors.rows[index]
+            if row['process_name'] != query['process']:
+                continue
+            first_process = first_process or rank
+            if first is None and answer in _normalize(row['content']):
+                first = rank
+        for k in ks:
+            hits[k] += first is not None and first <= k
+            process_hits[k] += first_process is not None and first_process <= k
+        reciprocal += 1.0 / first if first else 0.0
+
+    count = len(queries) or 1
+    return {
+        'chunks': len(rows),
+        'tokens': sum(tokens),
+        'mean_tokens': round(sum(tokens) / len(tokens), 1) if tokens else 0,
+        'max_tokens': max(tokens, default=0),
+        'embedding_requests': embedder.requests - requests_before,
+        'build_seconds': round(build_seconds, 3),
+        **{f'recall@{k}': round(hits[k] / count, 4) for k in ks},
+        'mrr': round(reciprocal / count, 4),
+        **{f'process_recall@{k}': round(process_hits[k] / count, 4) for k in ks},
+    }
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark de chunking: tamanho do índice x qualidade')
+    parser.add_argument('--file', default='frontend/src/data/processes.ts', help='Catálogo de processos')
+    parser.add_argument('--queries', default=DEFAULT_QUERIES_PATH, help='Consultas rotuladas (JSON)')
+    parser.add_argument('--targets', default='64,128,256,512', help='Tamanhos alvo (tokens) do chunking adaptativo')
+    parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_TOKENS, help='Sobreposição (tokens)')
+    parser.add_argument('--no-merge', action='store_true', help='Não agrupar campos pequenos vizinhos')
+    parser.add_argument('--k', default='1,3,5', help='Valores de k para recall@k')
+    parser.add_argument('--mode', choices=['vector', 'hybrid'], default='vector',
+                        help='Busca usada na avaliação (hybrid = search_knowledge_base_hybrid, lexical_search.py)')
+    parser.add_argument('--embedder', choices=['api', 'local'], default='local')
+    parser.add_argument('--output', help='Salvar o relatório em JSON')
+    args = parser.parse_args()
+
+    require_numpy()
+    try:
+        embedder = embedder_from_env(args.embedder)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
+    items = catalog_items(load_catalog(args.file))
+    queries = load_queries(args.queries, items)
+    if not queries:
+        print("Erro: nenhuma consulta rotulada válida")
+        sys.exit(1)
+    ks = sorted(int(k) for k in args.k.split(','))
+    query_embeddings = embedder.embed([query['query'] for query in queries])
+    print(f"📚 {len(items)} processos, {len(queries)} consultas rotuladas, embedder {embedder.model}, busca {args.mode}")
+
+    configs = [('fields', chunker('fields'))]
+    for target in (int(t) for t in args.targets.split(',') if t):
+        configs.append((f"adaptive-{target}", chunker('adaptive', target, args.overlap, not args.no_merge)))
+
+    report: Dict[str, Any] = {'processes': len(items), 'queries': len(queries), 'mode': args.mode,
+                              'embedder': embedder.model, 'overlap': args.overlap, 'results': {}}
+    header = f"{'estratégia':<16} {'chunks':>7} {'tokens':>8} {'média':>6} {'máx':>5} {'req':>4} " + \
+             ' '.join(f"{'R@' + str(k):>6}" for k in ks) + f" {'MRR':>6}"
+    print(header)
+    for name, build in configs:
+        result = evaluate(items, queries, query_embeddings, embedder, build, ks, args.mode)
+        report['results'][name] = result
+        print(f"{name:<16} {result['chunks']:>7} {result['tokens']:>8} {result['mean_tokens']:>6} "
+              f"{result['max_tokens']:>5} {result['embedding_requests']:>4} "
+              + ' '.join(f"{result[f'recall@{k}']:>6.3f}" for k in ks) + f" {result['mrr']:>6.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Relatório salvo em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline local de seed (parse → conversão → SQL) sobre
+catálogos sintéticos (synthetic_catalog.py), sem rede nem banco.
+
+Etapas medidas separadamente, cada uma com vazão e pico de memória
+(tracemalloc, numa execução à parte para não distorcer o tempo):
+    extract        parse_processes_simple.extract_processes_from_ts
+    parse_cold     seed_processes_to_supabase.parse_typescript_array sem snapshot
+    parse_warm     parse_typescript_array com o snapshot do catalog_cache
+    convert        convert_process_to_db_format
+    generate_sql   seed_batch_remaining.generate_sql_for_process
+
+`convert` e `generate_sql` esvaziam o cache de diagramas (mermaid_graph) antes
+de cada execução: o tempo inclui uma compilação de diagrama por processo,
+como num seed real.
+
+Os resultados são salvos em JSON; com --baseline, cada etapa é comparada
+com a execução anterior e regressões acima da tolerância fazem o script
+terminar com código 1.
+
+Uso:
+    python scripts/bench_pipeline.py --counts 1000,10000 --output scripts/bench/baselines/pipeline.json
+    python scripts/bench_pipeline.py --counts 1000,10000 --baseline scripts/bench/baselines/pipeline.json
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from catalog_cache import default_cache_path
+from mermaid_graph import clear_compiled
+from parse_processes_simple import extract_processes_from_ts
+from seed_batch_remaining import generate_sql_for_process
+from seed_processes_to_supabase import convert_process_to_db_format, parse_typescript_array
+from synthetic_catalog import write_catalog
+
+STAGES = ['extract', 'parse_cold', 'parse_warm', 'convert', 'generate_sql']
+
+
+def _measure(fn: Callable[[], Any], repeat: int, setup: Optional[Callable[[], None]] = None,
+             memory: bool = True) -> Dict[str, float]:
+    """Mediana do tempo de `repeat` execuções e pico de memória de uma execução extra."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    result = {'seconds': statistics.median(timings), 'min_seconds': min(timings)}
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            fn()
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def bench_catalog(path: str, repeat: int = 3, memory: bool = True) -> Dict[str, Any]:
+    """Executa todas as etapas sobre o catálogo em `path`."""
+    size = os.path.getsize(path)
+    cache_path = default_cache_path(path)
+
+    def drop_snapshot() -> None:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    def quiet(fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> Any:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return fn()
+        return run
+
+    processes = extract_processes_from_ts(path)
+    count = len(processes)
+    stages: Dict[str, Dict[str, float]] = {
+        'extract': _measure(lambda: extract_processes_from_ts(path), repeat, memory=memory),
+        'parse_cold': _measure(quiet(lambda: parse_typescript_array(path)), repeat, drop_snapshot, memory),
+    }
+    quiet(lambda: parse_typescript_array(path))()
+    stages['parse_warm'] = _measure(quiet(lambda: parse_typescript_array(path)), repeat, memory=memory)
+    stages['convert'] = _measure(lambda: [convert_process_to_db_format(p, 'bench') for p in processes],
+                                 repeat, clear_compiled, memory)
+    stages['generate_sql'] = _measure(lambda: [generate_sql_for_process(p) for p in processes],
+                                      repeat, clear_compiled, memory)
+    drop_snapshot()
+
+    for stage in stages.values():
+        seconds = stage['seconds']
+        stage['processes_per_sec'] = round(count / seconds, 1) if seconds else None
+        stage['mb_per_sec'] = round(size / (1024 * 1024) / seconds, 2) if seconds else None
+        stage['seconds'] = round(seconds, 6)
+        stage['min_seconds'] = round(stage['min_seconds'], 6)
+        if 'peak_mb' in stage:
+            stage['peak_mb'] = round(stage['peak_mb'], 2)
+    return {'processes': count, 'bytes': size, 'stages': stages}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Linhas de comparação com o baseline; regressões marcadas com ❌."""
+    lines = []
+    for key, run in results['runs'].items():
+        base_run = baseline.get('runs', {}).get(key)
+        if not base_run:
+            lines.append(f"   {key}: sem baseline")
+            continue
+        for stage, data in run['stages'].items():
+            base = base_run['stages'].get(stage)
+            if not base or not base.get('seconds'):
+                continue
+            delta = data['seconds'] / base['seconds'] - 1
+            mark = '❌' if delta > tolerance else '✅'
+            lines.append(f"   {mark} {key:<14} {stage:<13} {base['seconds']:>9.4f}s → "
+                         f"{data['seconds']:>9.4f}s ({delta:+.1%})")
+    return lines
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark de parse/conversão/SQL com catálogos sintéticos')
+    parser.add_argument('--counts', default='1000,10000', help='Tamanhos de catálogo (separados por vírgula)')
+    parser.add_argument('--workflow-steps', type=int, default=6)
+    parser.add_argument('--raci-rows', type=int, default=6)
+    parser.add_argument('--mermaid-lines', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=3, help='Execuções por etapa (mediana)')
+    parser.add_argument('--no-memory', action='store_true', help='Não medir pico de memória (mais rápido)')
+    parser.add_argument('--output', help='Salvar resultados em JSON (baseline para próximas execuções)')
+    parser.add_argument('--baseline', help='Comparar com um JSON salvo anteriormente')
+    parser.add_argument('--note', help='Observação gravada no JSON (ex.: por que o baseline mudou)')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Regressão tolerada por etapa (0.2 = 20%% mais lento)')
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.counts.split(',') if count.strip()]
+    results: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'workflow_steps': args.workflow_steps,
+            'raci_rows': args.raci_rows,
+            'mermaid_lines': args.mermaid_lines,
+            'repeat': args.repeat,
+        },
+        'runs': {},
+    }
+    if args.note:
+        results['note'] = args.note
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = os.path.join(tmp, f'processes_{count}.ts')
+            with open(path, 'w', encoding='utf-8') as out:
+                write_catalog(out, count, args.workflow_steps, args.raci_rows, args.mermaid_lines)
+            print(f"📊 {count} processos ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+            run = bench_catalog(path, args.repeat, not args.no_memory)
+            results['runs'][str(count)] = run
+            for stage in STAGES:
+                data = run['stages'][stage]
+                peak = f"{data['peak_mb']:>8.1f} MB" if 'peak_mb' in data else ''
+                print(f"   {stage:<13} {data['seconds']:>9.4f}s  {data['processes_per_sec']:>12} proc/s  {peak}")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Resultados salvos em: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n📈 Comparação com {args.baseline}:")
+        lines = compare(results, baseline, args.tolerance)
+        for line in lines:
+            print(line)
+        if any('❌' in line for line in lines):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
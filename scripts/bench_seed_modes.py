@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compara os modos de seed via HTTP (um por vez, em lote, concorrente,
+incremental) contra o Supabase fake (fake_supabase.py), com latência,
+jitter e falhas injetadas: número de requisições, bytes e tempo total,
+sem rede.
+
+Uso:
+    python scripts/bench_seed_modes.py --latency 0.05 --jitter 0.02
+    python scripts/bench_seed_modes.py --count 500 --error-rate 0.05 --modes bulk,bulk-concurrent
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import seed_processes_to_supabase as seed
+from bench_seed_backends import replicate_catalog
+from catalog_cache import load_catalog
+from fake_supabase import FakeSupabase
+from request_policy import RequestRunner
+from seed_manifest import SeedManifest
+
+MODES = ['single', 'single-concurrent', 'bulk', 'bulk-concurrent', 'rpc', 'incremental', 'incremental-rerun']
+
+
+def run_mode(mode: str, catalog: List[Dict[str, Any]], args: Any) -> Dict[str, Any]:
+    client = FakeSupabase(args.latency, args.jitter, args.error_rate, seed=args.seed)
+    runner = RequestRunner(max_retries=args.max_retries, base_delay=args.base_delay)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = SeedManifest(os.path.join(tmp, 'manifest.json'))
+        modes: Dict[str, Callable[[str], Dict[str, int]]] = {
+            'single': lambda creator: seed.seed_processes(client, catalog, creator, 1, runner),
+            'single-concurrent': lambda creator: seed.seed_processes(client, catalog, creator,
+                                                                     args.concurrency, runner),
+            'bulk': lambda creator: seed.seed_processes_bulk(client, catalog, creator, args.batch_size, 1, runner),
+            'bulk-concurrent': lambda creator: seed.seed_processes_bulk(client, catalog, creator, args.batch_size,
+                                                                        args.concurrency, runner),
+            'rpc': lambda creator: seed.seed_processes_rpc(client, catalog, creator, args.max_bytes, 1, runner),
+            'incremental': lambda creator: seed.seed_processes_incremental(client, catalog, creator, manifest,
+                                                                           args.batch_size, args.concurrency,
+                                                                           runner),
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            if mode == 'incremental-rerun':
+                # Primeira carga fora da medição; mede só a reexecução sem mudanças
+                modes['incremental'](runner.call(lambda: seed.get_or_create_system_stakeholder(client)))
+                client.reset_stats()
+                runner.retries = 0
+                mode_fn = modes['incremental']
+            else:
+                mode_fn = modes[mode]
+
+            start = time.perf_counter()
+            creator_id = runner.call(lambda: seed.get_or_create_system_stakeholder(client))
+            stats = mode_fn(creator_id)
+            elapsed = time.perf_counter() - start
+
+    result = {
+        'mode': mode,
+        'processes': len(catalog),
+        'seconds': round(elapsed, 4),
+        'success': stats['success'],
+        'skipped': stats['skipped'],
+        'errors': stats['errors'],
+        'retries': runner.retries,
+    }
+    client_stats = client.stats()
+    client_stats['injected_errors'] = client_stats.pop('errors')
+    result.update(client_stats)
+    return result
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Comparar modos de seed contra o Supabase fake')
+    parser.add_argument('--file', default='frontend/src/data/processes.ts', help='Catálogo base')
+    parser.add_argument('--count', type=int, default=0, help='Replicar o catálogo até N processos (0 = original)')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Modos: {', '.join(MODES)}")
+    parser.add_argument('--latency', type=float, default=0.03, help='Latência por requisição (s)')
+    parser.add_argument('--jitter', type=float, default=0.01, help='Variação da latência (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probabilidade de erro 503 por requisição')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--max-bytes', type=int, default=seed.DEFAULT_MAX_BYTES, help='Payload máximo do modo rpc (bytes)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-retries', type=int, default=5)
+    parser.add_argument('--base-delay', type=float, default=0.05, help='Base do backoff entre tentativas (s)')
+    parser.add_argument('--seed', type=int, default=0, help='Semente da latência/erros injetados')
+    parser.add_argument('--output', help='Salvar resultados em JSON')
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        print(f"❌ Modos desconhecidos: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    catalog = load_catalog(args.file)
+    if args.count:
+        catalog = replicate_catalog(catalog, args.count)
+
+    print(f"📊 {len(catalog)} processos | latência {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms"
+          f" | erros {args.error_rate:.0%} | lote {args.batch_size} | concorrência {args.concurrency}\n")
+    print(f"{'modo':<18} {'tempo':>9} {'req':>6} {'KB env':>9} {'KB rec':>9} {'retries':>8} {'falhas':>7} {'erros':>6}")
+    results = []
+    for mode in modes:
+        result = run_mode(mode, catalog, args)
+        results.append(result)
+        print(f"{mode:<18} {result['seconds']:>8.3f}s {result['requests']:>6} "
+              f"{result['bytes_sent'] / 1024:>9.1f} {result['bytes_received'] / 1024:>9.1f} "
+              f"{result['retries']:>8} {result['injected_errors']:>7} {result['errors']:>6}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Resultados salvos em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Cache do catálogo parseado de frontend/src/data/processes.ts, compartilhado
+por todos os scripts de seed.
+
+O snapshot guarda mtime, tamanho e sha256 do arquivo de origem. Se mtime e
+tamanho batem, a carga é uma única leitura mmap + marshal (sem parse nem
+decode de JSON); se mudaram mas o sha256 é o mesmo, só o cabeçalho é
+regravado; caso contrário o arquivo é parseado de novo com ts_parser.
+"""
+
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from ts_parser import iter_processes
+
+DEFAULT_SOURCE = 'frontend/src/data/processes.ts'
+CACHE_DIR = 'scripts/.cache'
+
+# Incrementar quando o formato do snapshot ou a saída do parser mudar
+CACHE_FORMAT = 1
+MAGIC = b'VDFCAT\x00' + bytes([CACHE_FORMAT])
+
+# magic, mtime_ns, tamanho, sha256, versão do marshal, versão do Python (major, minor)
+HEADER = struct.Struct('<8sqq32sIBB')
+
+
+def default_cache_path(source: str) -> str:
+    """Um snapshot por arquivo de origem (nome + hash curto do caminho absoluto)."""
+    key = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(source)}-{key}.snapshot")
+
+
+def _runtime_tag() -> Tuple[int, int, int]:
+    return marshal.version, sys.version_info[0], sys.version_info[1]
+
+
+def _read_header(cache_path: str) -> Optional[Tuple[int, int, bytes]]:
+    try:
+        with open(cache_path, 'rb') as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) < HEADER.size:
+        return None
+    magic, mtime_ns, size, digest, marshal_version, major, minor = HEADER.unpack(raw)
+    if magic != MAGIC or (marshal_version, major, minor) != _runtime_tag():
+        return None
+    return mtime_ns, size, digest
+
+
+def _read_snapshot(cache_path: str) -> List[Dict[str, Any]]:
+    """Lê o corpo do snapshot via mmap, sem cópia intermediária do arquivo."""
+    with open(cache_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return marshal.loads(view[HEADER.size:])
+            finally:
+                view.release()
+
+
+def _write_snapshot(cache_path: str, stat: os.stat_result, digest: bytes,
+                    processes: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Grava o snapshot de forma atômica; sem `processes`, reaproveita o corpo atual."""
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if processes is None:
+        with open(cache_path, 'rb') as f:
+            f.seek(HEADER.size)
+            body = f.read()
+    else:
+        body = marshal.dumps(processes)
+    header = HEADER.pack(MAGIC, stat.st_mtime_ns, stat.st_size, digest, *_runtime_tag())
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, cache_path)
+
+
+def load_catalog(source: str = DEFAULT_SOURCE, cache_path: Optional[str] = None,
+                 use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Retorna os processos de `source`, reparseando só quando o arquivo mudou.
+    `use_cache=False` força o parse e não toca no snapshot.
+    """
+    cache_path = cache_path or default_cache_path(source)
+    stat = os.stat(source)
+    header = _read_header(cache_path) if use_cache else None
+
+    if header and header[:2] == (stat.st_mtime_ns, stat.st_size):
+        return _read_snapshot(cache_path)
+
+    with open(source, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).digest()
+
+    if header and header[2] == digest:
+        # Só o mtime mudou (checkout, touch): atualiza o cabeçalho
+        _write_snapshot(cache_path, stat, digest)
+        return _read_snapshot(cache_path)
+
+    processes = list(iter_processes(raw.decode('utf-8')))
+    if use_cache:
+        _write_snapshot(cache_path, stat, digest, processes)
+    return processes
+
+
+def cache_status(source: str = DEFAULT_SOURCE, cache_path: Optional[str] = None) -> str:
+    """Descreve o estado do cache para `source`: 'fresh', 'stale' ou 'missing'."""
+    header = _read_header(cache_path or default_cache_path(source))
+    if header is None:
+        return 'missing'
+    stat = os.stat(source)
+    return 'fresh' if header[:2] == (stat.st_mtime_ns, stat.st_size) else 'stale'
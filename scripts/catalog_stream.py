@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Leitura e escrita em streaming do catálogo de processos.
+
+NDJSON (um processo JSON por linha) permite que parse, conversão e envio se
+sobreponham: o parser grava cada processo assim que termina de lê-lo e os
+consumidores leem uma linha por vez, sem carregar o arquivo inteiro.
+"""
+
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from ts_parser import iter_processes_from_file
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+
+def is_ndjson(path: str) -> bool:
+    return path.lower().endswith(NDJSON_EXTENSIONS)
+
+
+def write_ndjson(processes: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Grava um processo por linha à medida que o iterável produz. Retorna a contagem."""
+    count = 0
+    for process in processes:
+        out.write(json.dumps(process, ensure_ascii=False, separators=(',', ':')))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Lê um arquivo NDJSON de forma preguiçosa (uma linha por vez)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: JSON inválido: {e.msg}") from e
+
+
+def iter_catalog(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Itera os processos de `path` conforme a extensão: NDJSON é lido linha a
+    linha, .ts objeto a objeto (ts_parser) e .json (array) de uma vez.
+    """
+    if is_ndjson(path):
+        return iter_ndjson(path)
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return iter(json.load(f))
+    return iter_processes_from_file(path)
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Agrupa um iterável em listas de até `size` itens: (índice inicial, lote)."""
+    iterator = iter(items)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
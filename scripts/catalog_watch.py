@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Reparse incremental de processes.ts para o modo --watch.
+
+`SpanIndex` guarda o intervalo em bytes [início, fim) de cada objeto de
+topo do array. A cada gravação do arquivo, o trecho alterado é delimitado
+pelo maior prefixo e pelo maior sufixo em comum com a versão anterior;
+apenas a janela entre o último objeto intacto antes da alteração e o
+primeiro intacto depois dela é decodificada e parseada. Os objetos dessa
+janela são comparados com os antigos (por nome) e viram processos novos,
+alterados ou removidos; os offsets dos objetos seguintes são deslocados.
+Editar um processo custa o parse desse processo, independente do tamanho
+do catálogo.
+
+Alterações antes do array (imports, tipos) ou janelas que não parseiam
+(ex.: vírgula apagada entre objetos) caem no parse completo. Um arquivo
+inválido (gravação no meio da edição) é ignorado até a próxima gravação,
+mantendo o último estado válido.
+
+Uso:
+    python scripts/catalog_watch.py --file frontend/src/data/processes.ts
+    python scripts/seed_processes_to_supabase.py --watch
+"""
+
+import os
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ts_parser import ParseError, Parser, normalize_process
+
+DEFAULT_INTERVAL = 0.5
+
+
+class CatalogChange(NamedTuple):
+    """Resultado de uma atualização do índice."""
+    added: List[Dict[str, Any]]
+    modified: List[Dict[str, Any]]
+    removed: List[str]
+    parsed: int  # objetos parseados (janela ou arquivo inteiro)
+    full: bool  # True se caiu no parse completo
+
+    def changed(self) -> List[Dict[str, Any]]:
+        """Processos a enviar (novos e alterados), na ordem do arquivo."""
+        return self.added + self.modified
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """
+    Tamanho do maior prefixo comum: busca binária com startswith sobre uma
+    memoryview (memcmp sem copiar fatias do arquivo).
+    """
+    view = memoryview(b)
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.startswith(view[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """Tamanho do maior sufixo comum, sem passar de `limit` bytes."""
+    view = memoryview(b)
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.startswith(view[len(b) - mid:len(b) - lo], len(a) - mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _byte_offsets(text: str, base: int, positions: List[int]) -> List[int]:
+    """Converte offsets de caractere (crescentes) em offsets de byte UTF-8 a partir de `base`."""
+    result = []
+    char_pos, byte_pos = 0, base
+    for position in positions:
+        byte_pos += len(text[char_pos:position].encode('utf-8'))
+        char_pos = position
+        result.append(byte_pos)
+    return result
+
+
+def parse_window(text: str, leading: bool, trailing: bool) -> List[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Objetos (início, fim, objeto) de uma janela do array. `leading`: há um
+    objeto imediatamente antes (a janela começa depois do seu '}' e precisa
+    de ','); `trailing`: há um objeto logo depois (a janela termina antes do
+    seu '{' e, se tiver objetos, precisa terminar em ','). Sem `trailing`, a
+    janela vai até o ']' do array.
+    """
+    parser = Parser(text)
+    spans: List[Tuple[int, int, Dict[str, Any]]] = []
+    need_separator = leading
+    while True:
+        kind, value, start, _ = parser.peek()
+        if kind == 'eof':
+            if trailing and not need_separator:
+                return spans
+            raise ParseError("Janela incompleta", start, text)
+        if kind == 'punct' and value == ']' and not trailing:
+            return spans
+        if kind == 'punct' and value == ',' and need_separator:
+            parser.next_token()
+            need_separator = False
+        elif kind == 'punct' and value == '{' and not need_separator:
+            obj = parser.parse_value()
+            spans.append((start, parser.pos, obj))
+            need_separator = True
+        else:
+            raise ParseError(f"Esperado objeto, encontrado {value!r}", start, text)
+
+
+class SpanIndex:
+    """Offsets em bytes de cada objeto de topo do array e o processo parseado."""
+
+    def __init__(self, array_name: Optional[str] = 'processesData'):
+        self.array_name = array_name
+        self.data = b''
+        self.array_start = 0  # byte logo após o '[' do array
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.processes: List[Optional[Dict[str, Any]]] = []  # None: objeto sem nome (ignorado)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, array_name: Optional[str] = 'processesData') -> 'SpanIndex':
+        index = cls(array_name)
+        index._load(data)
+        return index
+
+    def __len__(self) -> int:
+        return sum(process is not None for process in self.processes)
+
+    def catalog(self) -> List[Dict[str, Any]]:
+        return [process for process in self.processes if process is not None]
+
+    def _load(self, data: bytes) -> None:
+        text = data.decode('utf-8')
+        parser = Parser(text)
+        parser.seek_array(self.array_name)
+        array_start = parser.pos
+        spans = list(parser.iter_array_objects())
+        positions = [array_start]
+        for start, end, _ in spans:
+            positions += [start, end]
+        offsets = _byte_offsets(text, 0, positions)
+        self.data = data
+        self.array_start = offsets[0]
+        self.starts = offsets[1::2]
+        self.ends = offsets[2::2]
+        self.processes = [self._named(obj) for _, _, obj in spans]
+
+    @staticmethod
+    def _named(obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        process = normalize_process(obj)
+        return process if process.get('name') else None
+
+    def update(self, data: bytes) -> CatalogChange:
+        """
+        Aplica a nova versão do arquivo. Levanta ParseError (ou
+        UnicodeDecodeError) se ela não parseia; o índice fica como estava.
+        """
+        old = self.data
+        if data == old:
+            return CatalogChange([], [], [], 0, False)
+        prefix = _common_prefix(old, data)
+        suffix = _common_suffix(old, data, min(len(old), len(data)) - prefix)
+        old_end = len(old) - suffix
+        delta = len(data) - len(old)
+
+        if prefix < self.array_start:
+            return self._reload(data)
+        first = bisect_right(self.ends, prefix)  # primeiro objeto que termina depois da alteração
+        last = bisect_left(self.starts, old_end)  # primeiro objeto que começa depois dela
+        window_start = self.ends[first - 1] if first else self.array_start
+        trailing = last < len(self.starts)
+        window_end = self.starts[last] + delta if trailing else len(data)
+        try:
+            text = data[window_start:window_end].decode('utf-8')
+            spans = parse_window(text, first > 0, trailing)
+        except (ParseError, UnicodeDecodeError):
+            # Ex.: vírgula apagada entre objetos intactos; o parse completo decide
+            return self._reload(data)
+
+        positions = []
+        for start, end, _ in spans:
+            positions += [start, end]
+        offsets = _byte_offsets(text, window_start, positions)
+        new_processes = [self._named(obj) for _, _, obj in spans]
+        change = self._diff(self.processes[first:last], new_processes, len(spans), False)
+
+        self.starts[first:last] = offsets[0::2]
+        self.ends[first:last] = offsets[1::2]
+        self.processes[first:last] = new_processes
+        if delta:
+            for i in range(first + len(spans), len(self.starts)):
+                self.starts[i] += delta
+                self.ends[i] += delta
+        self.data = data
+        return change
+
+    def _reload(self, data: bytes) -> CatalogChange:
+        previous = self.processes
+        fresh = SpanIndex.from_bytes(data, self.array_name)
+        self.data, self.array_start = fresh.data, fresh.array_start
+        self.starts, self.ends, self.processes = fresh.starts, fresh.ends, fresh.processes
+        return self._diff(previous, self.processes, len(self.processes), True)
+
+    @staticmethod
+    def _diff(before: List[Optional[Dict[str, Any]]], after: List[Optional[Dict[str, Any]]],
+              parsed: int, full: bool) -> CatalogChange:
+        old = {process['name']: process for process in before if process is not None}
+        added: List[Dict[str, Any]] = []
+        modified: List[Dict[str, Any]] = []
+        seen = set()
+        for process in after:
+            if process is None:
+                continue
+            name = process['name']
+            seen.add(name)
+            if name not in old:
+                added.append(process)
+            elif old[name] != process:
+                modified.append(process)
+        removed = [name for name in old if name not in seen]
+        return CatalogChange(added, modified, removed, parsed, full)
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch_catalog(path: str, on_change: Callable[[CatalogChange], None], interval: float = DEFAULT_INTERVAL,
+                  array_name: Optional[str] = 'processesData', index: Optional[SpanIndex] = None,
+                  max_events: Optional[int] = None) -> SpanIndex:
+    """
+    Observa `path` (polling de mtime/tamanho a cada `interval` segundos) e
+    chama `on_change` com as alterações de cada gravação. Uma gravação só é
+    lida quando o arquivo fica estável por um intervalo (editores gravam em
+    etapas). `max_events` encerra após N alterações (testes/benchmarks).
+    """
+    if index is None:
+        with open(path, 'rb') as f:
+            index = SpanIndex.from_bytes(f.read(), array_name)
+    seen = _stat_key(path)
+    events = 0
+    while max_events is None or events < max_events:
+        time.sleep(interval)
+        current = _stat_key(path)
+        if current is None or current == seen:
+            continue
+        time.sleep(interval)
+        if _stat_key(path) != current:
+            continue
+        seen = current
+        with open(path, 'rb') as f:
+            data = f.read()
+        start = time.perf_counter()
+        try:
+            change = index.update(data)
+        except (ParseError, UnicodeDecodeError) as e:
+            print(f"⚠️  {path} inválido, aguardando próxima gravação: {e}")
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        if not change:
+            continue
+        mode = 'parse completo' if change.full else 'incremental'
+        print(f"✏️  {len(change.added)} novos, {len(change.modified)} alterados, {len(change.removed)} removidos "
+              f"({change.parsed} objetos parseados, {mode}, {elapsed:.1f} ms)")
+        for name in change.removed:
+            print(f"   ⚠️  Removido do catálogo (mantido no banco): {name}")
+        on_change(change)
+        events += 1
+    return index
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Observar processes.ts e listar processos alterados')
+    parser.add_argument('--file', default='frontend/src/data/processes.ts', help='Catálogo de processos')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Intervalo do polling (s)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.file, 'rb') as f:
+        index = SpanIndex.from_bytes(f.read())
+    print(f"👀 Observando {args.file}: {len(index)} processos indexados em "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms (Ctrl+C para sair)")
+
+    def show(change: CatalogChange) -> None:
+        for process in change.added:
+            print(f"   ➕ {process['name']}")
+        for process in change.modified:
+            print(f"   🔄 {process['name']}")
+
+    try:
+        watch_catalog(args.file, show, args.interval, index=index)
+    except KeyboardInterrupt:
+        print("\n👋 Encerrado")
+
+
+if __name__ == '__main__':
+    main()
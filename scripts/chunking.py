@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Chunking adaptativo por tokens para a base de conhecimento.
+
+A edge function ingest-process gera um chunk por campo (nome, descrição,
+workflow, entidades, variáveis, RACI): o nome vira um chunk de poucos
+tokens e uma matriz RACI longa vira um chunk só. Aqui os mesmos textos por
+campo (ingest_processes.build_chunks) são a unidade de partida:
+
+- campos acima de `target_tokens` são divididos por linha (ou por palavra,
+  se uma linha sozinha passar do alvo), repetindo até `overlap_tokens` do
+  fim de um pedaço no começo do seguinte;
+- campos pequenos vizinhos são agrupados enquanto couberem no alvo.
+
+Todo chunk leva em metadata a origem: `chunk_types` (campos contidos),
+`sections` (campo, tokens e, em pedaços de um campo dividido,
+`part`/`parts`) e o total de `tokens`. Chunks com
+mais de um campo usam chunk_type 'content' (permitido pelo CHECK de
+knowledge_base_documents).
+
+Tokens são contados com tiktoken (cl100k_base, o encoding do
+text-embedding-3-small) quando instalado; sem ele, por uma estimativa de
+~4 caracteres por token de palavra, mais um por pontuação.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from ingest_processes import Chunker, build_chunks
+
+DEFAULT_TARGET_TOKENS = 256
+DEFAULT_OVERLAP_TOKENS = 32
+
+# Separador entre campos agrupados num mesmo chunk
+FIELD_SEPARATOR = '\n\n'
+
+_WORD_RE = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        # Encoding não disponível offline
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens de `text` (tiktoken, ou estimativa sem ele)."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == '_' else 1
+               for piece in _WORD_RE.findall(text))
+
+
+def _split_long_line(line: str, target_tokens: int, overlap_tokens: int) -> List[str]:
+    """Divide uma linha maior que o alvo em janelas de palavras sobrepostas."""
+    pieces: List[str] = []
+    words: List[Tuple[str, int]] = []
+    size = 0
+    fresh = 0
+    for word in line.split(' '):
+        tokens = count_tokens(word) or 1
+        if fresh and size + tokens > target_tokens:
+            pieces.append(' '.join(w for w, _ in words))
+            overlap: List[Tuple[str, int]] = []
+            carried = 0
+            for previous in reversed(words):
+                if carried + previous[1] > overlap_tokens or carried + previous[1] + tokens > target_tokens:
+                    break
+                overlap.insert(0, previous)
+                carried += previous[1]
+            words, size, fresh = overlap, carried, 0
+        words.append((word, tokens))
+        size += tokens
+        fresh += 1
+    if fresh:
+        pieces.append(' '.join(w for w, _ in words))
+    return pieces
+
+
+def split_text(text: str, target_tokens: int = DEFAULT_TARGET_TOKENS,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[str]:
+    """
+    Pedaços de até ~`target_tokens`, quebrando em fim de linha; cada pedaço
+    começa com as últimas linhas do anterior que somem até `overlap_tokens`.
+    """
+    segments: List[Tuple[str, int]] = []
+    for line in text.split('\n'):
+        tokens = count_tokens(line)
+        if tokens > target_tokens:
+            segments.extend((piece, count_tokens(piece))
+                            for piece in _split_long_line(line, target_tokens, overlap_tokens))
+        else:
+            segments.append((line, tokens))
+
+    pieces: List[str] = []
+    current: List[Tuple[str, int]] = []
+    size = 0
+    fresh = 0  # segmentos novos (fora da sobreposição) no pedaço atual
+    for segment in segments:
+        if fresh and size + segment[1] + 1 > target_tokens:
+            pieces.append('\n'.join(line for line, _ in current))
+            overlap: List[Tuple[str, int]] = []
+            carried = 0
+            for previous in reversed(current):
+                if (carried + previous[1] + 1 > overlap_tokens
+                        or carried + previous[1] + 1 + segment[1] > target_tokens):
+                    break
+                overlap.insert(0, previous)
+                carried += previous[1] + 1
+            current, size, fresh = overlap, carried, 0
+        current.append(segment)
+        size += segment[1] + (1 if len(current) > 1 else 0)
+        fresh += 1
+    if fresh:
+        pieces.append('\n'.join(line for line, _ in current))
+    return pieces
+
+
+def _merge_metadata(sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    metadata: Dict[str, Any] = {}
+    for section in sections:
+        for key, value in section['metadata'].items():
+            metadata.setdefault(key, value)
+    return metadata
+
+
+def adaptive_chunks(process: Dict[str, Any], content: Optional[Dict[str, Any]],
+                    target_tokens: int = DEFAULT_TARGET_TOKENS, overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                    merge: bool = True) -> List[Dict[str, Any]]:
+    """
+    Chunks no formato de build_chunks (chunk_index, chunk_type, content,
+    metadata), com campos grandes divididos e campos pequenos agrupados.
+    """
+    sections: List[Dict[str, Any]] = []
+    for field in build_chunks(process, content):
+        text = field['content']
+        tokens = count_tokens(text)
+        if tokens <= target_tokens:
+            sections.append({**field, 'tokens': tokens, 'part': None})
+            continue
+        pieces = split_text(text, target_tokens, overlap_tokens)
+        for part, piece in enumerate(pieces, 1):
+            sections.append({**field, 'content': piece, 'tokens': count_tokens(piece),
+                             'part': (part, len(pieces))})
+
+    groups: List[List[Dict[str, Any]]] = []
+    size = 0
+    for section in sections:
+        # Pedaços do mesmo campo já se sobrepõem: juntá-los duplicaria texto
+        continuation = section['part'] is not None and section['part'][0] > 1
+        if (merge and groups and not continuation
+                and size + section['tokens'] + len(FIELD_SEPARATOR) <= target_tokens):
+            groups[-1].append(section)
+            size += section['tokens'] + len(FIELD_SEPARATOR)
+        else:
+            groups.append([section])
+            size = section['tokens']
+
+    chunks: List[Dict[str, Any]] = []
+    for group in groups:
+        types = list(dict.fromkeys(section['chunk_type'] for section in group))
+        text = FIELD_SEPARATOR.join(section['content'] for section in group)
+        provenance = []
+        for section in group:
+            entry = {'chunk_type': section['chunk_type'], 'tokens': section['tokens']}
+            if section['part'] is not None:
+                entry['part'], entry['parts'] = section['part']
+            provenance.append(entry)
+        metadata = {**_merge_metadata(group), 'chunk_types': types, 'sections': provenance,
+                    'tokens': count_tokens(text)}
+        chunks.append({
+            'chunk_index': len(chunks),
+            'chunk_type': types[0] if len(types) == 1 else 'content',
+            'content': text,
+            'metadata': metadata,
+        })
+    return chunks
+
+
+def chunker(strategy: str = 'fields', target_tokens: int = DEFAULT_TARGET_TOKENS,
+            overlap_tokens: int = DEFAULT_OVERLAP_TOKENS, merge: bool = True) -> Chunker:
+    """Função (process, content) → chunks para a estratégia pedida."""
+    if strategy == 'fields':
+        return build_chunks
+    if strategy == 'adaptive':
+        def build(process: Dict[str, Any], content: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return adaptive_chunks(process, content, target_tokens, overlap_tokens, merge)
+        return build
+    raise ValueError(f"Estratégia de chunking desconhecida: {strategy}")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Geradores de embeddings para a ingestão da base de conhecimento.
+
+Todo embedder expõe `model`, `dimensions` e `embed(texts)`, que recebe uma
+lista de textos e devolve um vetor por texto, na mesma ordem. Assim o
+pipeline manda vários chunks por requisição sem saber qual backend está
+em uso.
+
+- HTTPEmbedder: endpoint /embeddings compatível com OpenAI (AI Gateway ou
+  OpenAI direto), com as mesmas variáveis de ambiente da edge function
+  ingest-process.
+- HashEmbedder: determinístico e local (feature hashing de tokens), para
+  testar e medir o pipeline sem rede nem chave de API.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+from request_policy import RequestRunner
+
+EMBEDDING_DIMENSION = 1536
+DEFAULT_MODEL = 'text-embedding-3-small'
+DEFAULT_GATEWAY_URL = 'https://gateway.vercel.ai/v1'
+OPENAI_API_URL = 'https://api.openai.com/v1/embeddings'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class HashEmbedder:
+    """
+    Embedder local: cada token (minúsculo) é mapeado por sha256 para uma
+    posição e um sinal do vetor; o resultado é normalizado (norma L2 = 1).
+    Textos com vocabulário em comum ficam próximos no cosseno, o que basta
+    para testes e benchmarks de busca.
+    """
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSION, model: str = 'local-hash-v1'):
+        self.dimensions = dimensions
+        self.model = model
+        self.requests = 0
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.sha256(token.encode('utf-8')).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        self.requests += 1
+        return [self._embed_one(text) for text in texts]
+
+
+class HTTPEmbedder:
+    """
+    Cliente do endpoint /embeddings (formato OpenAI). Uma requisição por
+    chamada de `embed`, com todos os textos em `input`; falhas transitórias
+    passam pelo retry/backoff do RequestRunner.
+    """
+
+    def __init__(self, api_url: str, api_key: str, model: str = DEFAULT_MODEL,
+                 dimensions: int = EMBEDDING_DIMENSION, runner: Optional[RequestRunner] = None,
+                 timeout: float = 60.0):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.model = model
+        self.dimensions = dimensions
+        self.runner = runner or RequestRunner()
+        self.timeout = timeout
+        self.requests = 0
+
+    def _post(self, texts: List[str]) -> Dict:
+        body = json.dumps({'model': self.model, 'input': texts, 'dimensions': self.dimensions}).encode('utf-8')
+        request = urllib.request.Request(self.api_url, data=body, method='POST', headers={
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.api_key}',
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError:
+            raise
+        except urllib.error.URLError as e:
+            # Falha de rede: ConnectionError é tratado como transitório pelo RequestRunner
+            raise ConnectionError(str(e.reason)) from e
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        self.requests += 1
+        data = self.runner.call(lambda: self._post(texts))['data']
+        if len(data) != len(texts):
+            raise ValueError(f"Resposta com {len(data)} embeddings para {len(texts)} textos")
+        return [item['embedding'] for item in sorted(data, key=lambda item: item['index'])]
+
+
+def embedder_from_env(kind: str = 'api', runner: Optional[RequestRunner] = None):
+    """
+    'local' → HashEmbedder; 'api' → HTTPEmbedder configurado como a edge
+    function: VERCEL_AI_GATEWAY_KEY (prioridade) ou OPENAI_API_KEY.
+    """
+    if kind == 'local':
+        return HashEmbedder()
+
+    gateway_key = os.getenv('VERCEL_AI_GATEWAY_KEY')
+    api_key = gateway_key or os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError('VERCEL_AI_GATEWAY_KEY ou OPENAI_API_KEY não configurada')
+    if gateway_key:
+        api_url = f"{os.getenv('VERCEL_AI_GATEWAY_URL') or DEFAULT_GATEWAY_URL}/embeddings"
+    else:
+        api_url = OPENAI_API_URL
+    return HTTPEmbedder(api_url, api_key, os.getenv('EMBEDDING_MODEL') or DEFAULT_MODEL, runner=runner)
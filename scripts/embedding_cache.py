@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Cache persistente de embeddings, chaveado por (modelo, sha256 do texto).
+
+Entre versões de um processo a maior parte dos chunks (entidades, variáveis,
+passos de workflow) não muda; com o cache, reingerir um catálogo inalterado
+não faz nenhuma chamada à API de embeddings. O armazenamento é um SQLite
+local com limite de tamanho e despejo LRU (menos usados recentemente saem
+primeiro).
+
+Uso:
+    cache = EmbeddingCache.open('scripts/.cache/embeddings.sqlite')
+    embedder = CachedEmbedder(embedder_from_env('api'), cache)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_CACHE_PATH = 'scripts/.cache/embeddings.sqlite'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (model, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used);
+"""
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    # float64: o vetor volta idêntico ao que a API devolveu
+    return array('d', vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array('d')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    Cache em SQLite com limite de `max_bytes` (soma dos vetores). Cada
+    acesso atualiza `last_used`; ao passar do limite, os vetores menos
+    usados recentemente são removidos. Thread-safe.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.conn = conn
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        row = conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0), COALESCE(MAX(last_used), 0) "
+                           "FROM embeddings").fetchone()
+        self.size_bytes, self._clock = row
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES) -> 'EmbeddingCache':
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.executescript(SCHEMA)
+        return cls(conn, path, max_bytes)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Vetores em cache para `hashes` (os ausentes não aparecem no resultado)."""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            # Limite de parâmetros do SQLite: consulta em blocos
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, blob in self.conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                    [model, *chunk],
+                ):
+                    found[key] = _unpack(blob)
+            if found:
+                tick = self._tick()
+                self.conn.executemany("UPDATE embeddings SET last_used = ? WHERE model = ? AND content_hash = ?",
+                                      [(tick, model, key) for key in found])
+                self.conn.commit()
+            hits = sum(1 for key in hashes if key in found)
+            self.hits += hits
+            self.misses += len(hashes) - hits
+        return found
+
+    def put_many(self, model: str, entries: List[Tuple[str, List[float]]]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            tick = self._tick()
+            for key, vector in entries:
+                blob = _pack(vector)
+                old = self.conn.execute("SELECT LENGTH(vector) FROM embeddings WHERE model = ? AND content_hash = ?",
+                                        (model, key)).fetchone()
+                self.conn.execute("INSERT OR REPLACE INTO embeddings (model, content_hash, vector, last_used) "
+                                  "VALUES (?, ?, ?, ?)", (model, key, blob, tick))
+                self.size_bytes += len(blob) - (old[0] if old else 0)
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Remove os vetores menos usados recentemente até caber em `max_bytes`."""
+        while self.size_bytes > self.max_bytes:
+            rows = self.conn.execute("SELECT rowid, LENGTH(vector) FROM embeddings "
+                                     "ORDER BY last_used LIMIT 256").fetchall()
+            if not rows:
+                self.size_bytes = 0
+                return
+            freed = []
+            for rowid, length in rows:
+                if self.size_bytes <= self.max_bytes:
+                    break
+                freed.append((rowid,))
+                self.size_bytes -= length
+            self.conn.executemany("DELETE FROM embeddings WHERE rowid = ?", freed)
+            self.evictions += len(freed)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses ({self.hit_rate():.1%}), "
+                f"{self.evictions} despejados, {self.size_bytes / (1024 * 1024):.1f} MB")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class CachedEmbedder:
+    """
+    Embedder que consulta o cache antes do embedder real: só os textos
+    ausentes (sem repetição) vão para a API, numa única chamada.
+    """
+
+    def __init__(self, embedder: Any, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder.model
+        self.dimensions = embedder.dimensions
+
+    @property
+    def requests(self) -> int:
+        return self.embedder.requests
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(text) for text in texts]
+        found = self.cache.get_many(self.model, hashes)
+        found = {key: vector for key, vector in found.items() if len(vector) == self.dimensions}
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self.embedder.embed(list(missing.values()))
+            new_entries = list(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model, new_entries)
+            found.update(new_entries)
+        return [found[key] for key in hashes]
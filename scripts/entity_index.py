@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Índice invertido entidade → processo / passo / papel RACI.
+
+A partir do conteúdo da versão atual de cada processo (entities, workflow e
+raci), monta as linhas de `process_entity_index` (migration 054): uma por
+ocorrência de uma entidade normalizada, com a origem (lista de entidades,
+texto de um passo do workflow ou linha RACI), o passo e o papel (R/A/C/I).
+Perguntas como "quais processos envolvem o Síndico?" ou "onde a
+Administradora é accountable?" viram consultas pontuais por `entity_key`.
+
+A manutenção é incremental: `process_entity_index_state` guarda a versão
+indexada de cada processo e só processos cujo `current_version_number`
+mudou são reindexados (apaga as linhas do processo e insere as novas).
+O seed (`--entity-index`, inclusive no `--watch`) e a ingestão
+(ingest_processes.py `--entity-index`) sincronizam só os processos que
+acabaram de tocar.
+
+Uso:
+    python scripts/entity_index.py                        # sincroniza o índice no Supabase
+    python scripts/entity_index.py --rebuild              # reindexa todos os processos
+    python scripts/entity_index.py --entity "Síndico" --role A
+    python scripts/entity_index.py --offline --entity "Administradora"   # catálogo local
+"""
+
+import os
+import re
+import sys
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from supabase import create_client, Client
+except ImportError:
+    create_client = None
+    Client = Any
+
+from instrumentation import add_instrumentation_arguments, metrics
+from request_policy import RequestRunner, TokenBucket
+
+INDEX_TABLE = 'process_entity_index'
+STATE_TABLE = 'process_entity_index_state'
+
+# Campo da linha RACI → letra do papel
+RACI_ROLES = (('responsible', 'R'), ('accountable', 'A'), ('consulted', 'C'), ('informed', 'I'))
+
+
+def normalize_entity(name: str) -> str:
+    """Chave do índice: sem acentos, minúsculas e espaços simples ("Síndico " → "sindico")."""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def _step_text(step: Any) -> str:
+    if isinstance(step, dict):
+        return str(step.get('step') or step.get('name') or step.get('title') or '')
+    return str(step or '')
+
+
+def build_entries(content: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Ocorrências de entidades no conteúdo de uma versão, sem ids:
+    {entity_key, entity_name, source, step, role}, sem repetições.
+    Entidades citadas no workflow são as conhecidas pela lista entities e
+    pela matriz RACI, procuradas como palavra inteira no texto normalizado.
+    """
+    content = content or {}
+    names: Dict[str, str] = {}
+    entries: Dict[Tuple[str, str, str, str], None] = {}
+
+    def add(name: Any, source: str, step: str = '', role: str = '') -> None:
+        key = normalize_entity(name)
+        if not key:
+            return
+        names.setdefault(key, str(name).strip())
+        entries[(key, source, step, role)] = None
+
+    for name in content.get('entities') or []:
+        add(name, 'entity')
+
+    for row in content.get('raci') or []:
+        if not isinstance(row, dict):
+            continue
+        step = _step_text(row)
+        for field, role in RACI_ROLES:
+            for name in row.get(field) or []:
+                add(name, 'raci', step, role)
+
+    if names:
+        patterns = [(key, re.compile(rf'(?<!\w){re.escape(key)}(?!\w)')) for key in names]
+        for step in content.get('workflow') or []:
+            text = _step_text(step)
+            normalized = normalize_entity(text)
+            for key, pattern in patterns:
+                if pattern.search(normalized):
+                    entries[(key, 'workflow', text, '')] = None
+
+    return [
+        {'entity_key': key, 'entity_name': names[key], 'source': source, 'step': step, 'role': role}
+        for key, source, step, role in entries
+    ]
+
+
+def index_rows(process_id: str, version_id: str, content: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Linhas de process_entity_index de uma versão."""
+    return [
+        {**entry, 'process_id': process_id, 'process_version_id': version_id}
+        for entry in build_entries(content)
+    ]
+
+
+def build_local_index(items: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, str]]]:
+    """Índice em memória: entity_key → ocorrências (com `process`), a partir de (nome, content)."""
+    index: Dict[str, List[Dict[str, str]]] = {}
+    for process_name, content in items:
+        for entry in build_entries(content):
+            index.setdefault(entry['entity_key'], []).append({**entry, 'process': process_name})
+    return index
+
+
+def lookup_local(index: Dict[str, List[Dict[str, str]]], entity: str,
+                 role: Optional[str] = None) -> List[Dict[str, str]]:
+    return [entry for entry in index.get(normalize_entity(entity), [])
+            if role is None or entry['role'] == role]
+
+
+def _execute(query: Any, runner: Optional[RequestRunner]) -> Any:
+    return metrics.execute(query, runner)
+
+
+def _fetch_all(supabase: Client, table: str, columns: str, page_size: int = 1000,
+               runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        result = _execute(supabase.table(table).select(columns).range(offset, offset + page_size - 1), runner)
+        rows.extend(result.data or [])
+        if not result.data or len(result.data) < page_size:
+            return rows
+        offset += page_size
+
+
+def _fetch_by_ids(supabase: Client, table: str, columns: str, key: str, ids: List[str],
+                  ids_per_request: int = 100, runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for start in range(0, len(ids), ids_per_request):
+        result = _execute(supabase.table(table).select(columns).in_(key, ids[start:start + ids_per_request]), runner)
+        rows.extend(result.data or [])
+    return rows
+
+
+def lookup_entity(supabase: Client, entity: str, role: Optional[str] = None,
+                  runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    """Consulta pontual no índice (com o nome do processo)."""
+    query = (supabase.table(INDEX_TABLE)
+             .select('entity_name,source,step,role,process_id,processes(name)')
+             .eq('entity_key', normalize_entity(entity)))
+    if role:
+        query = query.eq('role', role)
+    return _execute(query, runner).data or []
+
+
+def _index_group(supabase: Client, group: List[Dict[str, Any]], insert_size: int,
+                 runner: Optional[RequestRunner] = None) -> Dict[str, int]:
+    """Reindexa um grupo de processos: apaga as linhas antigas, insere as novas e grava o estado."""
+    counts = {'indexed': 0, 'entries': 0, 'missing': 0}
+    process_ids = [process['id'] for process in group]
+    result = _execute(
+        supabase.table('process_versions')
+        .select('id,process_id,version_number,content')
+        .in_('process_id', process_ids),
+        runner,
+    )
+    versions = {(row['process_id'], row['version_number']): row for row in result.data or []}
+
+    rows: List[Dict[str, str]] = []
+    states: List[Dict[str, Any]] = []
+    indexed_at = datetime.now(timezone.utc).isoformat()
+    for process in group:
+        version_number = process.get('current_version_number') or 1
+        version = versions.get((process['id'], version_number))
+        if version is None:
+            print(f"   ⚠️  Versão {version_number} não encontrada: {process.get('name')}")
+            counts['missing'] += 1
+            continue
+        process_rows = index_rows(process['id'], version['id'], version.get('content'))
+        rows.extend(process_rows)
+        states.append({'process_id': process['id'], 'process_version_id': version['id'],
+                       'version_number': version_number, 'entries_count': len(process_rows),
+                       'indexed_at': indexed_at})
+
+    # O estado só é gravado no fim: se algo falhar no meio, o grupo é refeito na próxima execução
+    _execute(supabase.table(INDEX_TABLE).delete().in_('process_id', process_ids), runner)
+    for start in range(0, len(rows), insert_size):
+        _execute(supabase.table(INDEX_TABLE).insert(rows[start:start + insert_size]), runner)
+    if states:
+        _execute(supabase.table(STATE_TABLE).upsert(states, on_conflict='process_id'), runner)
+    counts['indexed'] = len(states)
+    counts['entries'] = len(rows)
+    return counts
+
+
+def sync_entity_index(supabase: Client, rebuild: bool = False, batch_size: int = 50,
+                      insert_size: int = 1000, runner: Optional[RequestRunner] = None,
+                      process_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Atualiza o índice: reindexa os processos cuja versão atual difere da
+    versão indexada (todos, com `rebuild`). Com `process_ids`, só esses
+    processos são consultados (ex.: os que o seed acabou de enviar), sem
+    varrer as tabelas. Retorna as contagens.
+    """
+    columns = 'id,name,current_version_number'
+    state_columns = 'process_id,version_number'
+    if process_ids is not None:
+        ids = sorted(set(process_ids))
+        processes = _fetch_by_ids(supabase, 'processes', columns, 'id', ids, runner=runner)
+    else:
+        processes = _fetch_all(supabase, 'processes', columns, runner=runner)
+    indexed: Dict[str, int] = {}
+    if not rebuild:
+        if process_ids is not None:
+            states = _fetch_by_ids(supabase, STATE_TABLE, state_columns, 'process_id', ids, runner=runner)
+        else:
+            states = _fetch_all(supabase, STATE_TABLE, state_columns, runner=runner)
+        indexed = {row['process_id']: row['version_number'] for row in states}
+    stale = [process for process in processes
+             if indexed.get(process['id']) != (process.get('current_version_number') or 1)]
+
+    stats = {'processes': len(processes), 'stale': len(stale), 'indexed': 0, 'entries': 0, 'missing': 0}
+    with metrics.span('entity_index'):
+        for start in range(0, len(stale), batch_size):
+            for key, value in _index_group(supabase, stale[start:start + batch_size], insert_size, runner).items():
+                stats[key] += value
+    return stats
+
+
+def print_sync_summary(stats: Dict[str, int]) -> None:
+    print(f"🗂️  Índice de entidades: {stats['indexed']} processos reindexados "
+          f"({stats['entries']} entradas), {stats['processes'] - stats['stale']} já atualizados")
+    if stats['missing']:
+        print(f"   ⚠️  {stats['missing']} processos sem a versão atual")
+
+
+def _print_entries(entries: List[Dict[str, Any]]) -> None:
+    if not entries:
+        print("   (nenhuma ocorrência)")
+    for entry in entries:
+        process = entry.get('process') or (entry.get('processes') or {}).get('name') or entry.get('process_id')
+        where = f" — {entry['step']}" if entry.get('step') else ''
+        role = f" [{entry['role']}]" if entry.get('role') else ''
+        print(f"   {process}: {entry['source']}{role}{where}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Índice invertido entidade → processo/passo RACI')
+    parser.add_argument('--url', help='URL do Supabase', default=os.getenv('SUPABASE_URL'))
+    parser.add_argument('--key', help='Service Key do Supabase', default=os.getenv('SUPABASE_SERVICE_KEY'))
+    parser.add_argument('--rebuild', action='store_true', help='Reindexar todos os processos')
+    parser.add_argument('--batch-size', type=int, default=50, help='Processos por grupo de reindexação')
+    parser.add_argument('--entity', help='Consultar as ocorrências de uma entidade')
+    parser.add_argument('--role', choices=[letter for _, letter in RACI_ROLES],
+                        help='Filtrar a consulta por papel RACI')
+    parser.add_argument('--offline', action='store_true', help='Usar o catálogo local (--file) sem banco')
+    parser.add_argument('--file', help='Catálogo local (modo --offline)', default='frontend/src/data/processes.ts')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help='Máximo de requisições por segundo (token bucket); 0 = sem limite')
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help='Tentativas extras em falhas transitórias (HTTP 429/5xx)')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args.metrics)
+
+    if args.offline:
+        from catalog_cache import load_catalog
+        from seed_processes_to_supabase import convert_process_to_db_format
+
+        processes = load_catalog(args.file)
+        index = build_local_index(
+            (process.get('name', ''), convert_process_to_db_format(process, '')['version']['content'])
+            for process in processes
+        )
+        print(f"🗂️  {len(processes)} processos → {len(index)} entidades, "
+              f"{sum(len(entries) for entries in index.values())} entradas")
+        if args.entity:
+            print(f"\n🔎 {args.entity}" + (f" ({args.role})" if args.role else ''))
+            _print_entries(lookup_local(index, args.entity, args.role))
+        return
+
+    if not args.url or not args.key:
+        print("Erro: SUPABASE_URL e SUPABASE_SERVICE_KEY são obrigatórios")
+        print("Configure via variáveis de ambiente ou argumentos --url e --key (ou use --offline)")
+        sys.exit(1)
+
+    if create_client is None:
+        print("Erro: Biblioteca 'supabase' não instalada.")
+        print("Instale com: pip install supabase")
+        sys.exit(1)
+
+    supabase: Client = create_client(args.url, args.key)
+    runner = RequestRunner(
+        rate_limiter=TokenBucket(args.rate_limit) if args.rate_limit > 0 else None,
+        max_retries=args.max_retries,
+    )
+
+    if args.entity:
+        print(f"🔎 {args.entity}" + (f" ({args.role})" if args.role else ''))
+        _print_entries(lookup_entity(supabase, args.entity, args.role, runner))
+        return
+
+    stats = sync_entity_index(supabase, args.rebuild, args.batch_size, runner=runner)
+    metrics.annotate(stats=stats, retries=runner.retries)
+    print_sync_summary(stats)
+
+
+if __name__ == '__main__':
+    main()
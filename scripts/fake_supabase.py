@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Substituto local (em processo) do cliente Supabase/PostgREST, com o
+subconjunto da API de tabelas usado pelos scripts:
+
+    client.table(nome).select(colunas).eq(...).in_(...).range(a, b).execute()
+    .insert(linhas) / .upsert(linhas, on_conflict=..., ignore_duplicates=...)
+    .update(valores).eq(...) / .delete().in_(...)
+    client.rpc('seed_processes_bulk', {'p_processes': [...]})
+
+Cada `execute()` é uma "requisição": conta requisições e bytes (corpo
+enviado e resposta em JSON), aplica latência com jitter e pode falhar com
+um status HTTP configurável (por padrão 503, transitório para o
+RequestRunner). As tabelas ficam em memória; índices únicos de
+`processes(name)` e `process_versions(process_id, version_number)` são
+respeitados como no banco (erro 409 / 23505). Funções RPC são emuladas em
+Python (FAKE_FUNCTIONS), com a mesma semântica das migrations.
+
+Uso:
+    from fake_supabase import FakeSupabase
+    supabase = FakeSupabase(latency=0.05, jitter=0.01, error_rate=0.02)
+    stats = seed_processes_bulk(supabase, processes, creator_id, batch_size=100)
+    print(supabase.summary())
+"""
+
+import copy
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Colunas com índice único por tabela
+DEFAULT_UNIQUE = {
+    'processes': [('name',)],
+    'process_versions': [('process_id', 'version_number')],
+    'process_entity_index_state': [('process_id',)],
+}
+
+# Valores default das colunas (como no schema)
+DEFAULT_COLUMNS = {
+    'processes': {'current_version_number': 1, 'content_hash': None},
+}
+
+
+class FakeAPIError(Exception):
+    """Erro no formato do postgrest (status HTTP em `status_code` e `response`)."""
+
+    class _Response:
+        def __init__(self, status_code: int, headers: Optional[Dict[str, str]] = None):
+            self.status_code = status_code
+            self.headers = headers or {}
+
+    def __init__(self, message: str, status_code: int, code: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.code = code or str(status_code)
+        self.response = self._Response(status_code)
+
+
+class FakeResponse:
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+
+
+def _size(payload: Any) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def _split_columns(columns: str) -> List[str]:
+    """Separa 'a,b,rel(c,d)' respeitando parênteses."""
+    parts, depth, current = [], 0, ''
+    for char in columns:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+class FakeQuery:
+    """Query builder encadeável; nada acontece até `execute()`."""
+
+    def __init__(self, client: 'FakeSupabase', table: str):
+        self.client = client
+        self.table = table
+        self.operation = 'select'
+        self.columns = '*'
+        self.payload: Any = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.bounds: Optional[Tuple[int, int]] = None
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+
+    def select(self, columns: str = '*', **_: Any) -> 'FakeQuery':
+        self.operation = 'select'
+        self.columns = columns
+        return self
+
+    def insert(self, rows: Any, **_: Any) -> 'FakeQuery':
+        self.operation = 'insert'
+        self.payload = rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None, ignore_duplicates: bool = False,
+               **_: Any) -> 'FakeQuery':
+        self.operation = 'upsert'
+        self.payload = rows
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: Dict[str, Any], **_: Any) -> 'FakeQuery':
+        self.operation = 'update'
+        self.payload = values
+        return self
+
+    def delete(self, **_: Any) -> 'FakeQuery':
+        self.operation = 'delete'
+        return self
+
+    def eq(self, column: str, value: Any) -> 'FakeQuery':
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def neq(self, column: str, value: Any) -> 'FakeQuery':
+        self.filters.append(lambda row: row.get(column) != value)
+        return self
+
+    def in_(self, column: str, values: Sequence[Any]) -> 'FakeQuery':
+        wanted = set(values)
+        self.filters.append(lambda row: row.get(column) in wanted)
+        return self
+
+    def range(self, start: int, end: int) -> 'FakeQuery':
+        self.bounds = (start, end)
+        return self
+
+    def limit(self, count: int) -> 'FakeQuery':
+        self.bounds = (0, count - 1)
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+
+def _fn_seed_processes_bulk(client: 'FakeSupabase', params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Emula seed_processes_bulk (migration 053): created / exists / duplicate por registro."""
+    creator_id = params.get('p_creator_id')
+    if creator_id is None:
+        creator = next((row for row in client.rows('stakeholders')
+                        if row.get('email') == 'sistema@villadelfiori.com'), None)
+        if creator is None:
+            raise FakeAPIError('Stakeholder criador não encontrado (informe p_creator_id)', 400, 'P0001')
+        creator_id = creator['id']
+
+    result, first = [], {}
+    for record in params.get('p_processes') or []:
+        name = record['name']
+        if name in first:
+            result.append({'name': name, 'outcome': 'duplicate', 'process_id': first[name], 'version_id': None})
+            continue
+        existing = client._conflict('processes', {'name': name})
+        if existing is not None:
+            first[name] = existing['id']
+            result.append({'name': name, 'outcome': 'exists', 'process_id': existing['id'], 'version_id': None})
+            continue
+        status = record.get('status') or 'rascunho'
+        process = client._new_row('processes', {
+            'name': name,
+            'category': record.get('category'),
+            'subcategory': record.get('subcategory'),
+            'document_type': record.get('document_type'),
+            'status': status,
+            'creator_id': creator_id,
+            'content_hash': record.get('content_hash'),
+        })
+        version = client._new_row('process_versions', {
+            'process_id': process['id'],
+            'version_number': 1,
+            'content': record.get('content'),
+            'content_text': record.get('content_text') or '',
+            'entities_involved': record.get('entities_involved') or [],
+            'variables_applied': record.get('variables_applied') or {},
+            'created_by': creator_id,
+            'status': status,
+        })
+        client.rows('processes').append(process)
+        client.rows('process_versions').append(version)
+        first[name] = process['id']
+        result.append({'name': name, 'outcome': 'created', 'process_id': process['id'], 'version_id': version['id']})
+    return result
+
+
+# Funções RPC disponíveis no fake: nome → implementação(client, params)
+FAKE_FUNCTIONS: Dict[str, Callable[['FakeSupabase', Dict[str, Any]], List[Dict[str, Any]]]] = {
+    'seed_processes_bulk': _fn_seed_processes_bulk,
+}
+
+
+class FakeSupabase:
+    """
+    Cliente fake. `latency` e `jitter` em segundos (latência uniforme em
+    [latency - jitter, latency + jitter]); `error_rate` é a probabilidade de
+    uma requisição falhar com `error_status` antes de alterar dados.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None,
+                 unique: Optional[Dict[str, List[Tuple[str, ...]]]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.unique = DEFAULT_UNIQUE if unique is None else unique
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    # ---- estatísticas ----
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.by_operation: Dict[str, int] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'by_operation': dict(sorted(self.by_operation.items())),
+        }
+
+    def summary(self) -> str:
+        return (f"{self.requests} requisições ({self.errors} com erro injetado), "
+                f"{self.bytes_sent / 1024:.1f} KB enviados, {self.bytes_received / 1024:.1f} KB recebidos")
+
+    # ---- API ----
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> FakeQuery:
+        """Chamada de função (POST /rpc/<função>); `table` guarda o nome da função."""
+        query = FakeQuery(self, function)
+        query.operation = 'rpc'
+        query.payload = params or {}
+        return query
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(table, [])
+
+    def _execute(self, query: FakeQuery) -> FakeResponse:
+        with self._lock:
+            self.requests += 1
+            key = f"{query.table}.{query.operation}"
+            self.by_operation[key] = self.by_operation.get(key, 0) + 1
+            if query.payload is not None:
+                self.bytes_sent += _size(query.payload)
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+
+        # Latência fora do lock: requisições concorrentes se sobrepõem
+        if delay:
+            time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise FakeAPIError(f"Erro injetado ({self.error_status})", self.error_status)
+
+        with self._lock:
+            data = getattr(self, f"_do_{query.operation}")(query)
+            self.bytes_received += _size(data)
+        return FakeResponse(data)
+
+    # ---- operações (executadas sob o lock) ----
+
+    def _matching(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        return [row for row in self.rows(query.table) if all(f(row) for f in query.filters)]
+
+    def _project(self, row: Dict[str, Any], columns: str) -> Dict[str, Any]:
+        if columns.strip() == '*':
+            return copy.deepcopy(row)
+        result = {}
+        for column in _split_columns(columns):
+            if '(' in column:
+                # Recurso embutido por chave estrangeira: rel(col, ...)
+                relation, inner = column[:-1].split('(', 1)
+                result[relation] = self._embed(row, relation, inner)
+            elif column == '*':
+                result.update(copy.deepcopy(row))
+            else:
+                result[column] = copy.deepcopy(row.get(column))
+        return result
+
+    def _embed(self, row: Dict[str, Any], relation: str, columns: str) -> Optional[Dict[str, Any]]:
+        # processes → process_id, stakeholders → stakeholder_id
+        for fk in (f"{relation}_id", f"{relation[:-1]}_id", f"{relation[:-2]}_id"):
+            if fk in row:
+                target = next((r for r in self.rows(relation) if r.get('id') == row[fk]), None)
+                return self._project(target, columns) if target else None
+        return None
+
+    def _do_select(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        rows = self._matching(query)
+        if query.bounds:
+            rows = rows[query.bounds[0]:query.bounds[1] + 1]
+        return [self._project(row, query.columns) for row in rows]
+
+    def _conflict(self, table: str, row: Dict[str, Any],
+                  keys: Optional[List[Tuple[str, ...]]] = None) -> Optional[Dict[str, Any]]:
+        for columns in keys if keys is not None else self.unique.get(table, []):
+            value = tuple(row.get(column) for column in columns)
+            for existing in self.rows(table):
+                if tuple(existing.get(column) for column in columns) == value:
+                    return existing
+        return None
+
+    def _new_row(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': str(uuid.uuid4()),
+            **DEFAULT_COLUMNS.get(table, {}),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            **copy.deepcopy(row),
+        }
+
+    def _do_insert(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        rows = query.payload if isinstance(query.payload, list) else [query.payload]
+        # Statement único: se uma linha viola o índice, nada é inserido
+        staged: List[Dict[str, Any]] = []
+        for row in rows:
+            new = self._new_row(query.table, row)
+            if self._conflict(query.table, new) or any(
+                self._same_key(query.table, new, other) for other in staged
+            ):
+                raise FakeAPIError('duplicate key value violates unique constraint', 409, '23505')
+            staged.append(new)
+        self.rows(query.table).extend(staged)
+        return copy.deepcopy(staged)
+
+    def _same_key(self, table: str, a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        return any(all(a.get(c) == b.get(c) for c in columns) for columns in self.unique.get(table, []))
+
+    def _do_upsert(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        rows = query.payload if isinstance(query.payload, list) else [query.payload]
+        keys = [tuple(c.strip() for c in query.on_conflict.split(','))] if query.on_conflict else None
+        result = []
+        for row in rows:
+            existing = self._conflict(query.table, row, keys)
+            if existing is None:
+                new = self._new_row(query.table, row)
+                self.rows(query.table).append(new)
+                result.append(copy.deepcopy(new))
+            elif not query.ignore_duplicates:
+                existing.update(copy.deepcopy(row))
+                result.append(copy.deepcopy(existing))
+        return result
+
+    def _do_update(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        rows = self._matching(query)
+        for row in rows:
+            row.update(copy.deepcopy(query.payload))
+        return copy.deepcopy(rows)
+
+    def _do_rpc(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        function = FAKE_FUNCTIONS.get(query.table)
+        if function is None:
+            raise FakeAPIError(f"Função não encontrada: {query.table}", 404, 'PGRST202')
+        return function(self, query.payload)
+
+    def _do_delete(self, query: FakeQuery) -> List[Dict[str, Any]]:
+        table = self.rows(query.table)
+        removed = [row for row in table if all(f(row) for f in query.filters)]
+        removed_ids = {id(row) for row in removed}
+        table[:] = [row for row in table if id(row) not in removed_ids]
+        return removed
+
+
+def create_client(url: str = '', key: str = '', **kwargs: Any) -> FakeSupabase:
+    """Mesma assinatura de supabase.create_client (url e key são ignorados)."""
+    return FakeSupabase(**kwargs)
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Ingestão em lote dos processos aprovados na base de conhecimento.
+
+Equivalente em Python de scripts/ingest_existing_processes.ts + edge function
+ingest-process: os chunks são montados a partir de `process_versions.content`
+exatamente como na edge function, mas os embeddings são pedidos em lotes de
+até N textos por requisição (em vez de um por chunk) e os documentos de
+vários processos são gravados em `knowledge_base_documents` com um único
+insert por lote.
+
+Uso:
+    python scripts/ingest_processes.py
+    python scripts/ingest_processes.py --embed-batch-size 128 --batch-size 20 --concurrency 4
+    python scripts/ingest_processes.py --offline --output scripts/kb_documents.jsonl
+    python scripts/ingest_processes.py --vector-index --dsn "$DATABASE_URL"
+    python scripts/ingest_processes.py --entity-index
+
+Os embeddings ficam em cache local (embedding_cache.py), chaveados por
+(modelo, sha256 do chunk): reingerir um catálogo inalterado não chama a API.
+
+Requisitos:
+    - SUPABASE_URL e SUPABASE_SERVICE_KEY (ou --url e --key)
+    - VERCEL_AI_GATEWAY_KEY ou OPENAI_API_KEY (exceto com --embedder local)
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from embedding_cache import DEFAULT_CACHE_PATH, CachedEmbedder, EmbeddingCache
+from embedders import embedder_from_env
+from entity_index import print_sync_summary, sync_entity_index
+from instrumentation import add_instrumentation_arguments, metrics, profile
+from request_policy import RequestRunner, TokenBucket, run_ordered
+from vector_index import ensure_vector_index, print_ensure_summary
+
+try:
+    from supabase import create_client, Client
+except ImportError:
+    # Só é obrigatória fora do modo --offline; verificado em main()
+    create_client = None
+    Client = Any
+
+DEFAULT_EMBED_BATCH_SIZE = 64
+
+# Um item de ingestão: (linha de processes, linha de process_versions)
+Item = Tuple[Dict[str, Any], Dict[str, Any]]
+
+# (processo, content da versão) → chunks
+Chunker = Callable[[Dict[str, Any], Optional[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def _js_truthy(value: Any) -> bool:
+    """Truthiness do JavaScript (listas e objetos vazios são verdadeiros)."""
+    if isinstance(value, (list, dict)):
+        return True
+    return bool(value)
+
+
+def _js_string(value: Any) -> str:
+    """Conversão de template string do JavaScript (`${value}`)."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ','.join('' if item is None else _js_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+
+def _js_json(value: Any) -> str:
+    """JSON.stringify (sem espaços, sem escapar unicode)."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _js_entries(value: Any) -> List[Tuple[str, Any]]:
+    """Object.entries: índices para arrays; chaves inteiras primeiro para objetos."""
+    if isinstance(value, list):
+        return [(str(index), item) for index, item in enumerate(value)]
+    integer_keys = sorted((key for key in value if key.isdigit()), key=int)
+    return [(key, value[key]) for key in integer_keys] + \
+           [(key, item) for key, item in value.items() if not key.isdigit()]
+
+
+@metrics.timed('chunk')
+def build_chunks(process: Dict[str, Any], content: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Monta os chunks de um processo como a edge function ingest-process:
+    nome, descrição, workflow, entidades, variáveis, RACI e, se nenhum
+    desses existir, o conteúdo completo.
+    """
+    content = content or {}
+    category = process.get('category')
+    document_type = process.get('document_type')
+    chunks: List[Dict[str, Any]] = []
+
+    def add(chunk_type: str, text: str, metadata: Dict[str, Any]) -> None:
+        chunks.append({
+            'chunk_index': len(chunks),
+            'chunk_type': chunk_type,
+            'content': text,
+            'metadata': metadata,
+        })
+
+    if process.get('name'):
+        add('name', process['name'], {'category': category, 'document_type': document_type})
+
+    description = content.get('description')
+    if _js_truthy(description):
+        add('description', description if isinstance(description, str) else _js_json(description),
+            {'category': category, 'document_type': document_type})
+
+    workflow = content.get('workflow')
+    if isinstance(workflow, list):
+        lines = []
+        for index, step in enumerate(workflow):
+            if isinstance(step, str):
+                lines.append(f"{index + 1}. {step}")
+            else:
+                step = step if isinstance(step, dict) else {}
+                label = next((step[key] for key in ('step', 'description') if _js_truthy(step.get(key))), None)
+                lines.append(f"{index + 1}. {_js_string(label) if label is not None else _js_json(step)}")
+        add('workflow', '\n'.join(lines), {
+            'category': category,
+            'document_type': document_type,
+            'workflow_steps': len(workflow),
+        })
+
+    entities = content.get('entities')
+    if isinstance(entities, list):
+        add('entities', f"Entidades envolvidas: {', '.join('' if e is None else _js_string(e) for e in entities)}",
+            {'category': category, 'entities': entities})
+
+    variables = content.get('variables')
+    if isinstance(variables, (list, dict)):
+        add('variables', '\n'.join(f"{key}: {_js_string(value)}" for key, value in _js_entries(variables)),
+            {'category': category})
+
+    raci = content.get('raci')
+    if isinstance(raci, list):
+        lines = []
+        for entry in raci:
+            if isinstance(entry, str):
+                lines.append(entry)
+                continue
+            entry = entry if isinstance(entry, dict) else {}
+            role = _js_string(entry['role']) if _js_truthy(entry.get('role')) else 'N/A'
+            responsible = _js_string(entry['responsible']) if _js_truthy(entry.get('responsible')) else 'N/A'
+            lines.append(f"{role}: {responsible}")
+        add('raci', '\n'.join(lines), {'category': category})
+
+    if not chunks:
+        add('content', _js_json(content), {'category': category, 'document_type': document_type})
+
+    return chunks
+
+
+def embed_chunks(embedder: Any, chunks: List[Dict[str, Any]],
+                 batch_size: int = DEFAULT_EMBED_BATCH_SIZE) -> List[Optional[List[float]]]:
+    """
+    Gera os embeddings de `chunks` com até `batch_size` textos por chamada.
+    Chunks de texto vazio ficam com None (a API rejeita entrada vazia; na
+    edge function esses chunks também ficam de fora).
+    """
+    vectors: List[Optional[List[float]]] = [None] * len(chunks)
+    pending = [i for i, chunk in enumerate(chunks) if chunk['content']]
+    for start in range(0, len(pending), batch_size):
+        indexes = pending[start:start + batch_size]
+        with metrics.span('embed'):
+            batch_vectors = embedder.embed([chunks[i]['content'] for i in indexes])
+        for i, vector in zip(indexes, batch_vectors):
+            vectors[i] = vector
+    return vectors
+
+
+def build_documents(items: List[Item], embedder: Any,
+                    embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+                    chunker: Chunker = build_chunks) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Chunks + embeddings de vários processos de uma vez. Retorna as linhas
+    de knowledge_base_documents agrupadas por id da versão. `chunker` troca
+    os chunks por campo da edge function (ex.: chunking.adaptive_chunks).
+    """
+    owners: List[Item] = []
+    chunks: List[Dict[str, Any]] = []
+    for process, version in items:
+        for chunk in chunker(process, version.get('content')):
+            owners.append((process, version))
+            chunks.append(chunk)
+
+    documents: Dict[str, List[Dict[str, Any]]] = {version['id']: [] for _, version in items}
+    for (process, version), chunk, vector in zip(owners, chunks, embed_chunks(embedder, chunks, embed_batch_size)):
+        if vector is None:
+            continue
+        documents[version['id']].append({
+            'process_id': process['id'],
+            'process_version_id': version['id'],
+            **chunk,
+            'embedding': vector,
+        })
+    return documents
+
+
+def _execute(query: Any, runner: Optional[RequestRunner]) -> Any:
+    return metrics.execute(query, runner)
+
+
+def fetch_approved_processes(supabase: Client, page_size: int = 1000,
+                             runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    """Todos os processos aprovados, paginados com `range`."""
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        result = _execute(
+            supabase.table('processes')
+            .select('id,name,category,document_type,status,current_version_number')
+            .eq('status', 'aprovado')
+            .range(offset, offset + page_size - 1),
+            runner,
+        )
+        rows.extend(result.data or [])
+        if not result.data or len(result.data) < page_size:
+            return rows
+        offset += page_size
+
+
+def fetch_current_versions(supabase: Client, processes: List[Dict[str, Any]], ids_per_request: int = 100,
+                           runner: Optional[RequestRunner] = None) -> Tuple[List[Item], List[Dict[str, Any]]]:
+    """
+    Busca a versão atual (current_version_number) de cada processo com uma
+    consulta `in_` por grupo de ids. Retorna (itens, processos sem versão).
+    """
+    items: List[Item] = []
+    missing: List[Dict[str, Any]] = []
+    for start in range(0, len(processes), ids_per_request):
+        group = processes[start:start + ids_per_request]
+        result = _execute(
+            supabase.table('process_versions')
+            .select('id,process_id,version_number,content')
+            .in_('process_id', [process['id'] for process in group]),
+            runner,
+        )
+        versions = {(row['process_id'], row['version_number']): row for row in result.data or []}
+        for process in group:
+            version = versions.get((process['id'], process.get('current_version_number') or 1))
+            if version is None:
+                missing.append(process)
+            else:
+                items.append((process, version))
+    return items, missing
+
+
+def _set_status(supabase: Client, version_ids: List[str], values: Dict[str, Any],
+                runner: Optional[RequestRunner] = None) -> None:
+    if version_ids:
+        _execute(supabase.table('knowledge_base_ingestion_status').update(values)
+                 .in_('process_version_id', version_ids), runner)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ingest_group(supabase: Client, items: List[Item], embedder: Any, embed_batch_size: int,
+                  runner: Optional[RequestRunner] = None,
+                  chunker: Chunker = build_chunks) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Ingere um grupo de processos: status 'processing', embeddings em lote,
+    remoção dos chunks antigos das versões, um insert com todos os
+    documentos e status 'completed' (um update por contagem de chunks).
+    """
+    lines: List[str] = []
+    version_ids = [version['id'] for _, version in items]
+    try:
+        _set_status(supabase, version_ids, {'status': 'processing', 'started_at': _now()}, runner)
+        documents = build_documents(items, embedder, embed_batch_size, chunker)
+        _execute(supabase.table('knowledge_base_documents').delete()
+                 .in_('process_version_id', version_ids), runner)
+        rows = [row for version_id in version_ids for row in documents[version_id]]
+        if rows:
+            _execute(supabase.table('knowledge_base_documents').insert(rows), runner)
+    except Exception as e:
+        for process, _ in items:
+            lines.append(f"   ❌ Erro ao ingerir {process['name']}: {e}")
+        try:
+            _set_status(supabase, version_ids, {'status': 'failed', 'error_message': str(e)}, runner)
+        except Exception as update_error:
+            lines.append(f"   ⚠️  Erro ao atualizar status de falha: {update_error}")
+        return lines, {'success': 0, 'errors': len(items), 'chunks': 0}
+
+    by_count: Dict[int, List[str]] = {}
+    for process, version in items:
+        count = len(documents[version['id']])
+        by_count.setdefault(count, []).append(version['id'])
+        lines.append(f"   ✅ {process['name']} ({count} chunks)")
+    completed_at = _now()
+    for count, ids in by_count.items():
+        _set_status(supabase, ids, {'status': 'completed', 'chunks_count': count,
+                                    'completed_at': completed_at}, runner)
+    return lines, {'success': len(items), 'errors': 0, 'chunks': sum(len(docs) for docs in documents.values())}
+
+
+def ingest_versions(supabase: Client, items: List[Item], embedder: Any, batch_size: int = 20,
+                    embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE, concurrency: int = 1,
+                    runner: Optional[RequestRunner] = None, chunker: Chunker = build_chunks) -> Dict[str, int]:
+    """Ingere os itens em grupos de `batch_size` processos (até `concurrency` em paralelo)."""
+    stats = {'total': len(items), 'success': 0, 'errors': 0, 'chunks': 0}
+    tasks: Iterator[Callable[[], Tuple[List[str], Dict[str, int]]]] = (
+        partial(_ingest_group, supabase, items[start:start + batch_size], embedder, embed_batch_size, runner,
+                chunker)
+        for start in range(0, len(items), batch_size)
+    )
+    for lines, counts in run_ordered(tasks, concurrency):
+        for line in lines:
+            print(line)
+        for key, value in counts.items():
+            stats[key] += value
+    return stats
+
+
+def catalog_items(processes: List[Dict[str, Any]]) -> List[Item]:
+    """Itens de ingestão a partir do catálogo local (ids sintéticos), para o modo --offline."""
+    from seed_processes_to_supabase import convert_process_to_db_format
+
+    items: List[Item] = []
+    for i, process in enumerate(processes, 1):
+        db_data = convert_process_to_db_format(process, '')
+        row = {'id': f'local-process-{i}', **db_data['process']}
+        items.append((row, {'id': f'local-version-{i}', 'process_id': row['id'], 'version_number': 1,
+                            'content': db_data['version']['content']}))
+    return items
+
+
+def run_offline(args: Any, embedder: Any, chunker: Chunker = build_chunks) -> None:
+    """Chunking + embeddings do catálogo local, sem banco (teste e benchmark)."""
+    from catalog_cache import load_catalog
+
+    items = catalog_items(load_catalog(args.file))
+    start = time.perf_counter()
+    with profile(args.profile), metrics.span('ingest'):
+        documents = build_documents(items, embedder, args.embed_batch_size, chunker)
+    elapsed = time.perf_counter() - start
+    rows = [row for _, version in items for row in documents[version['id']]]
+
+    print(f"✅ {len(items)} processos → {len(rows)} chunks")
+    print(f"📨 {embedder.requests} requisições de embedding ({args.embed_batch_size} textos por requisição)")
+    if isinstance(embedder, CachedEmbedder):
+        print(f"🗄️  Cache: {embedder.cache.summary()}")
+    print(f"⏱️  {elapsed:.3f}s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(_js_json(row) + '\n')
+        print(f"💾 Documentos salvos em: {args.output}")
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ingerir processos aprovados na base de conhecimento')
+    parser.add_argument('--url', help='URL do Supabase', default=os.getenv('SUPABASE_URL'))
+    parser.add_argument('--key', help='Service Key do Supabase', default=os.getenv('SUPABASE_SERVICE_KEY'))
+    parser.add_argument('--embedder', choices=['api', 'local'], default='api',
+                        help='api: AI Gateway/OpenAI; local: embedder determinístico sem rede')
+    parser.add_argument('--embed-batch-size', type=int, default=DEFAULT_EMBED_BATCH_SIZE,
+                        help='Máximo de textos por requisição de embeddings')
+    parser.add_argument('--batch-size', type=int, default=20,
+                        help='Processos por grupo (um insert em knowledge_base_documents por grupo)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Número máximo de grupos ingeridos em paralelo')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                        help='Máximo de requisições por segundo (token bucket); 0 = sem limite')
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help='Tentativas extras em falhas transitórias (HTTP 429/5xx)')
+    parser.add_argument('--chunking', choices=['fields', 'adaptive'], default='fields',
+                        help='fields: um chunk por campo (como a edge function); adaptive: por tokens (chunking.py)')
+    parser.add_argument('--chunk-tokens', type=int, default=256, help='Tamanho alvo dos chunks adaptativos (tokens)')
+    parser.add_argument('--chunk-overlap', type=int, default=32,
+                        help='Sobreposição entre pedaços de um campo dividido (tokens)')
+    parser.add_argument('--no-merge', action='store_true', help='Não agrupar campos pequenos vizinhos')
+    parser.add_argument('--offline', action='store_true',
+                        help='Usar o catálogo local (--file) sem banco; não grava nada no Supabase')
+    parser.add_argument('--file', help='Arquivo processes.ts (modo --offline)',
+                        default='frontend/src/data/processes.ts')
+    parser.add_argument('--output', help='Salvar os documentos gerados em NDJSON (modo --offline)')
+    parser.add_argument('--cache', help='Arquivo do cache de embeddings', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--cache-max-mb', type=int, default=512,
+                        help='Tamanho máximo do cache (MB); acima disso, despejo LRU')
+    parser.add_argument('--no-cache', action='store_true', help='Não consultar nem gravar o cache de embeddings')
+    parser.add_argument('--vector-index', action='store_true',
+                        help='Criar/verificar o índice vetorial após a ingestão (scripts/vector_index.py)')
+    parser.add_argument('--entity-index', action='store_true',
+                        help='Atualizar o índice entidade → processo/passo dos processos ingeridos (scripts/entity_index.py)')
+    parser.add_argument('--dsn', help='Conexão direta ao Postgres para o --vector-index',
+                        default=os.getenv('DATABASE_URL'))
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args.metrics)
+
+    runner = RequestRunner(
+        rate_limiter=TokenBucket(args.rate_limit) if args.rate_limit > 0 else None,
+        max_retries=args.max_retries,
+    )
+    try:
+        embedder = embedder_from_env(args.embedder, runner)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        print("Use --embedder local para gerar embeddings sem API")
+        sys.exit(1)
+    if not args.no_cache:
+        embedder = CachedEmbedder(embedder, EmbeddingCache.open(args.cache, args.cache_max_mb * 1024 * 1024))
+
+    from chunking import chunker as make_chunker
+    chunker = make_chunker(args.chunking, args.chunk_tokens, args.chunk_overlap, not args.no_merge)
+
+    print("🚀 Iniciando ingestão de processos...")
+    print(f"🧠 Embeddings: {embedder.model} (até {args.embed_batch_size} textos por requisição)")
+    if args.chunking == 'adaptive':
+        print(f"🧩 Chunking adaptativo: alvo {args.chunk_tokens} tokens, sobreposição {args.chunk_overlap}")
+
+    if args.offline:
+        run_offline(args, embedder, chunker)
+        return
+
+    if not args.url or not args.key:
+        print("Erro: SUPABASE_URL e SUPABASE_SERVICE_KEY são obrigatórios")
+        print("Configure via variáveis de ambiente ou argumentos --url e --key")
+        sys.exit(1)
+
+    if create_client is None:
+        print("Erro: Biblioteca 'supabase' não instalada.")
+        print("Instale com: pip install supabase")
+        sys.exit(1)
+
+    supabase: Client = create_client(args.url, args.key)
+
+    print("\n📋 Buscando processos aprovados...")
+    processes = fetch_approved_processes(supabase, runner=runner)
+    if not processes:
+        print("✅ Nenhum processo aprovado encontrado.")
+        return
+    items, missing = fetch_current_versions(supabase, processes, runner=runner)
+    print(f"✅ Encontrados {len(processes)} processos aprovados")
+    for process in missing:
+        print(f"   ⚠️  Versão não encontrada: {process['name']}")
+
+    print(f"\n💾 Ingerindo {len(items)} processos em grupos de {args.batch_size}...")
+    with profile(args.profile), metrics.span('ingest'):
+        stats = ingest_versions(supabase, items, embedder, args.batch_size, args.embed_batch_size,
+                                args.concurrency, runner, chunker)
+    metrics.annotate(stats=stats, retries=runner.retries, embedding_requests=embedder.requests)
+
+    print("\n" + "=" * 50)
+    print("📊 Resumo da Ingestão:")
+    print(f"   ✅ Sucesso: {stats['success']}")
+    print(f"   ❌ Erros: {stats['errors'] + len(missing)}")
+    print(f"   🧩 Chunks: {stats['chunks']}")
+    print(f"   📨 Requisições de embedding: {embedder.requests}")
+    if isinstance(embedder, CachedEmbedder):
+        print(f"   🗄️  Cache: {embedder.cache.summary()}")
+    if runner.retries:
+        print(f"   🔁 Retentativas: {runner.retries}")
+    print(f"   📄 Total: {len(processes)}")
+    print("=" * 50)
+
+    if args.entity_index:
+        # Só os processos ingeridos com versão ainda não indexada são reindexados
+        print("\n🗂️  Atualizando índice de entidades...")
+        index_stats = sync_entity_index(supabase, runner=runner, process_ids=[item[0]['id'] for item in items])
+        metrics.annotate(entity_index=index_stats)
+        print_sync_summary(index_stats)
+
+    if args.vector_index:
+        if not args.dsn:
+            print("⚠️  --vector-index requer --dsn (ou DATABASE_URL); rode scripts/vector_index.py ensure depois")
+        else:
+            # Só cria/reconstrói quando a tabela cruza os limiares de crescimento
+            print("\n🧭 Verificando índice vetorial...")
+            with metrics.span('vector_index'):
+                index_result = ensure_vector_index(args.dsn)
+            metrics.annotate(vector_index={key: index_result.get(key) for key in ('action', 'reason', 'rows')})
+            print_ensure_summary(index_result)
+
+    if stats['errors'] or missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
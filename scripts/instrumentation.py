@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Instrumentação leve dos scripts de seed e ingestão: tempo por etapa
+(parse, convert, generate_sql...), cada requisição PostgREST por tabela e
+verbo (http.processes.insert, http.process_versions.insert...), histograma
+de latência, bytes enviados/recebidos e retentativas.
+
+Desligada por padrão (custo de uma checagem de atributo por chamada). Os
+scripts ligam com `--metrics relatorio.json`, que grava o relatório em JSON
+e imprime um resumo; `--profile saida.pstats` grava o cProfile da etapa
+principal de cada script.
+
+Uso:
+    from instrumentation import metrics
+    metrics.start(args.metrics)       # grava o JSON ao sair
+    with metrics.span('parse'):
+        processes = load_catalog(path)
+    result = metrics.execute(supabase.table('processes').insert(rows), runner)
+    with profile(args.profile):
+        seed(...)
+"""
+
+import atexit
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Limites superiores dos baldes do histograma, em ms (o último é +Inf)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Verbo PostgREST a partir do método HTTP (cliente supabase/postgrest-py)
+HTTP_VERBS = {'GET': 'select', 'HEAD': 'select', 'POST': 'insert', 'PATCH': 'update', 'DELETE': 'delete'}
+
+
+def _size(payload: Any) -> int:
+    if payload is None:
+        return 0
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def describe_query(query: Any) -> Tuple[str, str, Any]:
+    """
+    (tabela, verbo, corpo) de um query builder do postgrest-py (path,
+    http_method, json, headers) ou do FakeSupabase (table, operation, payload).
+    Chamadas de função viram (função, 'rpc', parâmetros).
+    """
+    if hasattr(query, 'operation'):
+        return query.table, query.operation, query.payload
+    path = str(getattr(query, 'path', '') or '')
+    table = path.rstrip('/').rsplit('/', 1)[-1] or '?'
+    if '/rpc/' in path:
+        return table, 'rpc', getattr(query, 'json', None)
+    method = str(getattr(query, 'http_method', '') or '').upper()
+    verb = HTTP_VERBS.get(method, method.lower() or '?')
+    headers = getattr(query, 'headers', None) or {}
+    if verb == 'insert' and 'resolution=' in str(headers.get('prefer', headers.get('Prefer', ''))):
+        verb = 'upsert'
+    return table, verb, getattr(query, 'json', None)
+
+
+class SpanStats:
+    """Agregado de uma etapa: contagem, tempos, histograma, bytes, retentativas e erros."""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets', 'bytes_sent', 'bytes_received',
+                 'retries', 'errors')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.errors = 0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        ms = seconds * 1000
+        for index, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Limite superior (ms) do balde que contém o percentil, limitado ao máximo observado."""
+        if not self.count:
+            return None
+        max_ms = round(self.max * 1000, 3)
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= target and count:
+                return min(BUCKETS_MS[index], max_ms)
+        return max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else None,
+            'min_ms': round(self.min * 1000, 3) if self.count else None,
+            'max_ms': round(self.max * 1000, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'histogram_ms': {
+                **{f"le_{bound}": self.buckets[index] for index, bound in enumerate(BUCKETS_MS)},
+                'le_inf': self.buckets[-1],
+            },
+        }
+        for key in ('bytes_sent', 'bytes_received', 'retries', 'errors'):
+            if getattr(self, key):
+                data[key] = getattr(self, key)
+        return data
+
+
+class Metrics:
+    """Coletor thread-safe de spans agregados por nome."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.spans: Dict[str, SpanStats] = {}
+        self.extra: Dict[str, Any] = {}
+        self.started = time.perf_counter()
+
+    def enable(self) -> 'Metrics':
+        self.enabled = True
+        self.reset()
+        return self
+
+    def start(self, report_path: Optional[str]) -> None:
+        """
+        Com `report_path`, liga a coleta e agenda a gravação do relatório no
+        fim do processo (inclusive após sys.exit e retornos antecipados).
+        """
+        if report_path:
+            self.enable()
+            atexit.register(self.write_report, report_path)
+
+    def annotate(self, **values: Any) -> None:
+        """Acrescenta campos ao relatório (ex.: estatísticas do seed)."""
+        self.extra.update(values)
+
+    def _stats(self, name: str) -> SpanStats:
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        return stats
+
+    def record(self, name: str, seconds: float, bytes_sent: int = 0, bytes_received: int = 0,
+               retries: int = 0, error: bool = False) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats(name)
+            stats.add(seconds)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.retries += retries
+            stats.errors += error
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Mede o bloco como uma ocorrência de `name` (erros contados à parte)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error=error)
+
+    def timed(self, name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        """Decorador: cada chamada da função é uma ocorrência de `name`."""
+        def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> T:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def iter_span(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        Repassa `items` medindo o tempo de cada next() como uma ocorrência de
+        `name` (ex.: parse de NDJSON em streaming, intercalado com o envio).
+        """
+        iterator = iter(items)
+        if not self.enabled:
+            yield from iterator
+            return
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(name, time.perf_counter() - start)
+            yield item
+
+    def execute(self, query: Any, runner: Any = None) -> Any:
+        """
+        Executa a query (via RequestRunner, se houver) registrando cada
+        tentativa em `http.<tabela>.<verbo>`: latência, bytes e retentativas.
+        """
+        if not self.enabled:
+            return runner.execute(query) if runner else query.execute()
+
+        table, verb, payload = describe_query(query)
+        name = f"http.{table}.{verb}"
+        bytes_sent = _size(payload)
+        attempts = 0
+
+        def attempt() -> Any:
+            nonlocal attempts
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                result = query.execute()
+            except Exception:
+                self.record(name, time.perf_counter() - start, bytes_sent, retries=int(attempts > 1), error=True)
+                raise
+            self.record(name, time.perf_counter() - start, bytes_sent,
+                        _size(getattr(result, 'data', None)), retries=int(attempts > 1))
+            return result
+
+        return runner.call(attempt) if runner else attempt()
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório estruturado: spans ordenados por tempo total e totais de rede."""
+        with self._lock:
+            spans = sorted(self.spans.items(), key=lambda item: -item[1].total)
+            http = [stats for name, stats in self.spans.items() if name.startswith('http.')]
+            report: Dict[str, Any] = {
+                'script': os.path.basename(sys.argv[0]),
+                'argv': sys.argv[1:],
+                'python': platform.python_version(),
+                'wall_seconds': round(time.perf_counter() - self.started, 6),
+                'network': {
+                    'requests': sum(stats.count for stats in http),
+                    'seconds': round(sum(stats.total for stats in http), 6),
+                    'bytes_sent': sum(stats.bytes_sent for stats in http),
+                    'bytes_received': sum(stats.bytes_received for stats in http),
+                    'retries': sum(stats.retries for stats in http),
+                    'errors': sum(stats.errors for stats in http),
+                },
+                'spans': {name: stats.to_dict() for name, stats in spans},
+            }
+        report.update(self.extra)
+        return report
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"{'etapa':<40} {'n':>7} {'total':>9} {'média':>9} {'p95':>8}"]
+        for name, data in self.report()['spans'].items():
+            p95 = f"≤{data['p95_ms']:g}" if data['p95_ms'] is not None else '-'
+            lines.append(f"{name:<40} {data['count']:>7} {data['total_seconds']:>8.3f}s "
+                         f"{data['mean_ms']:>7.2f}ms {p95:>8}")
+        return lines
+
+    def write_report(self, path: str) -> Dict[str, Any]:
+        """Grava o relatório em JSON e imprime o resumo por etapa."""
+        report = self.report()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print("\n⏱️  Tempo por etapa:")
+        for line in self.summary_lines():
+            print(f"   {line}")
+        network = report['network']
+        if network['requests']:
+            print(f"   🌐 {network['requests']} requisições, {network['bytes_sent'] / 1024:.1f} KB enviados, "
+                  f"{network['retries']} retentativas")
+        print(f"📈 Métricas salvas em: {path}")
+        return report
+
+
+@contextlib.contextmanager
+def profile(path: Optional[str], top: int = 15) -> Iterator[None]:
+    """
+    cProfile do bloco (só da thread atual; use --concurrency 1 para ver o
+    trabalho das requisições). Grava o pstats em `path` e imprime as `top`
+    funções por tempo acumulado. Sem `path`, não faz nada.
+    """
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(top)
+        print(f"\n🔬 Perfil salvo em: {path} (python -m pstats {path})")
+        print('\n'.join(line for line in out.getvalue().splitlines()[-(top + 4):] if line.strip()))
+
+
+def add_instrumentation_arguments(parser: Any) -> None:
+    """Adiciona --metrics e --profile a um argparse.ArgumentParser."""
+    parser.add_argument('--metrics', help='Gravar relatório de tempo por etapa/requisição em JSON')
+    parser.add_argument('--profile', help='Gravar cProfile (pstats) da etapa principal neste arquivo')
+
+
+metrics = Metrics()
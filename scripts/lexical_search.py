@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Índice lexical offline (português) espelhando o lado full-text de
+`search_knowledge_base_hybrid` (migrations 014/016), para avaliar e
+pré-computar a busca textual sem o banco, ou como pré-filtro local.
+
+Análise como `to_tsvector('portuguese', ...)`: minúsculas, stopwords do
+Snowball (que ainda ocupam posição), stemmer Snowball Portuguese e, além do
+Postgres, remoção de acentos no lexema final ("síndico" e "sindico" viram
+"sindic"). A consulta segue `plainto_tsquery`: todos os termos precisam
+aparecer (AND).
+
+Postings em arrays NumPy contíguos (CSR por termo: documentos, tf e
+posições). Dois rankings textuais:
+    ts_rank  emulação de ts_rank(tsvector, tsquery) com pesos padrão, para
+             reproduzir o combined_score da função SQL
+    bm25     BM25 (k1=1.2, b=0.75), normalizado pelo melhor candidato na
+             fusão híbrida
+
+A fusão é a da função SQL: candidatos com similaridade >= match_threshold
+OU match textual, apenas aprovados e `metadata @> filter_metadata`,
+combined_score = similarity * vector_weight + text_rank * text_weight.
+
+Uso:
+    python scripts/lexical_search.py terms --text "Manutenção preventiva dos elevadores"
+    python scripts/lexical_search.py query --input scripts/kb_export.jsonl --text "vazamento de gás"
+    python scripts/lexical_search.py query --input scripts/kb_export.jsonl --text "vazamento de gás" \\
+        --mode hybrid --embedder local --match-threshold 0.5
+    python scripts/lexical_search.py bench --input scripts/kb_export.jsonl --embedder local
+
+Requisitos:
+    pip install numpy
+"""
+
+import json
+import math
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from vector_search import (APPROVED_STATUS, RESULT_FIELDS, VectorSearch, iter_export, jsonb_contains,
+                           percentile, require_numpy)
+
+# Limites do tsvector do Postgres: posição máxima e posições por lexema
+MAX_POSITION = 16383
+MAX_POSITIONS_PER_LEXEME = 256
+
+# Peso das posições sem rótulo (D) em ts_rank com os pesos padrão {0.1, 0.2, 0.4, 1.0}
+DEFAULT_WEIGHT = 0.1
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Stopwords do dicionário portuguese_stem (snowball portuguese.stop)
+STOPWORDS = frozenset('''
+de a o que e do da em um para com não uma os no se na por mais as dos como mas ao ele das à seu sua
+ou quando muito nos já eu também só pelo pela até isso ela entre depois sem mesmo aos seus quem nas
+me esse eles você essa num nem suas meu às minha numa pelos elas qual nós lhe deles essas esses
+pelas este dele tu te vocês vos lhes meus minhas teu tua teus tuas nosso nossa nossos nossas dela
+delas esta estes estas aquele aquela aqueles aquelas isto aquilo estou está estamos estão estive
+esteve estivemos estiveram estava estávamos estavam estivera estivéramos esteja estejamos estejam
+estivesse estivéssemos estivessem estiver estivermos estiverem hei há havemos hão houve houvemos
+houveram houvera houvéramos haja hajamos hajam houvesse houvéssemos houvessem houver houvermos
+houverem houverei houverá houveremos houverão houveria houveríamos houveriam sou somos são era
+éramos eram fui foi fomos foram fora fôramos seja sejamos sejam fosse fôssemos fossem for formos
+forem serei será seremos serão seria seríamos seriam tenho tem temos tém tinha tínhamos tinham tive
+teve tivemos tiveram tivera tivéramos tenha tenhamos tenham tivesse tivéssemos tivessem tiver
+tivermos tiverem terei terá teremos terão teria teríamos teriam
+'''.split())
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+# ---- stemmer Snowball Portuguese ----
+# Mesmo algoritmo do dicionário portuguese_stem do Postgres. 'ã'/'õ' são
+# tratados como 'a~'/'o~' (vogal + consoante) durante o stemming.
+
+_VOWELS = frozenset('aeiouáéíóúâêô')
+
+_STANDARD_SUFFIXES: Dict[str, str] = {}
+for _suffix in ('eza ezas ico ica icos icas ismo ismos ável ível ista istas oso osa osos osas amento amentos '
+                'imento imentos adora ador aça~o adoras adores aço~es ante antes ância').split():
+    _STANDARD_SUFFIXES[_suffix] = 'delete'
+_STANDARD_SUFFIXES.update({'logia': 'log', 'logias': 'log', 'uça~o': 'u', 'uço~es': 'u',
+                           'ência': 'ente', 'ências': 'ente', 'amente': 'amente', 'mente': 'mente',
+                           'idade': 'idade', 'idades': 'idade', 'iva': 'iva', 'ivo': 'iva', 'ivas': 'iva',
+                           'ivos': 'iva', 'ira': 'ira', 'iras': 'ira'})
+
+_VERB_SUFFIXES = frozenset('''
+ada ida ia aria eria iria ará ara erá era irá ava asse esse isse aste este iste ei arei erei irei am iam
+ariam eriam iriam aram eram iram avam em arem erem irem assem essem issem ado ido ando endo indo ara~o
+era~o ira~o ar er ir as adas idas ias arias erias irias arás aras erás eras irás avas es ardes erdes irdes
+ares eres ires asses esses isses astes estes istes is ais eis íeis aríeis eríeis iríeis áreis areis éreis
+ereis íreis ireis ásseis ésseis ísseis áveis ados idos ámos amos íamos aríamos eríamos iríamos áramos
+éramos íramos ávamos emos aremos eremos iremos ássemos êssemos íssemos imos armos ermos irmos eu iu ou
+ira iras
+'''.split())
+
+_RESIDUAL_SUFFIXES = ('os', 'a', 'i', 'o', 'á', 'í', 'ó')
+
+
+def _after(word: str, start: int, vowel: bool) -> int:
+    """Posição logo após a próxima vogal (ou consoante) a partir de `start`; len(word) se não houver."""
+    for index in range(start, len(word)):
+        if (word[index] in _VOWELS) == vowel:
+            return index + 1
+    return len(word)
+
+
+def _regions(word: str) -> Tuple[int, int, int]:
+    """(RV, R1, R2) como definidos pelo Snowball."""
+    n = len(word)
+    rv = n
+    if n >= 2:
+        if word[0] in _VOWELS:
+            rv = _after(word, 2, word[1] not in _VOWELS)
+        elif word[1] not in _VOWELS:
+            rv = _after(word, 2, True)
+        elif n >= 3:
+            rv = 3
+    r1 = _after(word, _after(word, 0, True), False)
+    r2 = _after(word, _after(word, r1, True), False)
+    return rv, r1, r2
+
+
+def _longest_suffix(word: str, suffixes: Iterable[str], limit: int = 0) -> Optional[str]:
+    """Maior sufixo de `suffixes` que começa em `limit` ou depois."""
+    best = None
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= limit and (best is None or len(suffix) > len(best)):
+            best = suffix
+    return best
+
+
+def _cut_if(word: str, suffixes: Sequence[str], limit: int) -> Tuple[str, Optional[str]]:
+    for suffix in suffixes:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= limit:
+                return word[:-len(suffix)], suffix
+            break
+    return word, None
+
+
+def _standard_suffix(word: str, rv: int, r1: int, r2: int) -> Optional[str]:
+    suffix = _longest_suffix(word, _STANDARD_SUFFIXES)
+    if suffix is None:
+        return None
+    start = len(word) - len(suffix)
+    action = _STANDARD_SUFFIXES[suffix]
+    stem = word[:start]
+    if action == 'ira':
+        return stem + 'ir' if start >= rv and stem.endswith('e') else None
+    if action == 'amente':
+        if start < r1:
+            return None
+        stem, removed = _cut_if(stem, ('iv', 'os', 'ic', 'ad'), r2)
+        if removed == 'iv':
+            stem, _ = _cut_if(stem, ('at',), r2)
+        return stem
+    if start < r2:
+        return None
+    if action in ('log', 'u', 'ente'):
+        return stem + action
+    if action == 'mente':
+        return _cut_if(stem, ('ante', 'avel', 'ível'), r2)[0]
+    if action == 'idade':
+        return _cut_if(stem, ('abil', 'ic', 'iv'), r2)[0]
+    if action == 'iva':
+        return _cut_if(stem, ('at',), r2)[0]
+    return stem
+
+
+def _verb_suffix(word: str, rv: int) -> Optional[str]:
+    suffix = _longest_suffix(word, _VERB_SUFFIXES, rv)
+    return word[:-len(suffix)] if suffix else None
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Stemmer Snowball Portuguese (palavra já em minúsculas)."""
+    word = word.replace('ã', 'a~').replace('õ', 'o~')
+    rv, r1, r2 = _regions(word)
+
+    changed = _standard_suffix(word, rv, r1, r2)
+    if changed is None:
+        changed = _verb_suffix(word, rv)
+    if changed is not None:
+        word = changed
+        if word.endswith('ci') and len(word) - 1 >= rv:
+            word = word[:-1]
+    else:
+        suffix = _longest_suffix(word, _RESIDUAL_SUFFIXES)
+        if suffix and len(word) - len(suffix) >= rv:
+            word = word[:-len(suffix)]
+
+    if word[-1:] in ('e', 'é', 'ê'):
+        if len(word) - 1 >= rv:
+            word = word[:-1]
+            if (word.endswith('gu') or word.endswith('ci')) and len(word) - 1 >= rv:
+                word = word[:-1]
+    elif word.endswith('ç'):
+        word = word[:-1] + 'c'
+    return word.replace('a~', 'ã').replace('o~', 'õ')
+
+
+def fold_accents(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+@lru_cache(maxsize=65536)
+def lexeme(token: str, fold: bool = True) -> Optional[str]:
+    """Lexema de um token em minúsculas, ou None para stopwords."""
+    if token in STOPWORDS:
+        return None
+    if token.isdigit():
+        return token
+    stemmed = stem(token)
+    return fold_accents(stemmed) if fold else stemmed
+
+
+def analyze(text: str, fold: bool = True) -> List[Tuple[str, int]]:
+    """(lexema, posição) como to_tsvector('portuguese'): stopwords contam posição."""
+    result = []
+    for position, token in enumerate(_TOKEN_RE.findall(text.lower()), 1):
+        term = lexeme(token, fold)
+        if term is not None:
+            result.append((term, min(position, MAX_POSITION)))
+    return result
+
+
+def query_terms(text: str, fold: bool = True) -> List[str]:
+    """Lexemas distintos e ordenados de plainto_tsquery (todos obrigatórios)."""
+    return sorted({term for term, _ in analyze(text, fold)})
+
+
+def _word_distance(distance: int) -> float:
+    if distance > 100:
+        return 1e-30
+    return 1.0 / (1.005 + 0.05 * math.exp(distance / 1.5 - 2))
+
+
+def _rank_or(positions: List[Optional[Sequence[int]]]) -> float:
+    """calc_rank_or do tsrank.c com todas as posições de peso D."""
+    rank = 0.0
+    for term_positions in positions:
+        if term_positions is None:
+            continue
+        # Com pesos iguais, wjm é o da primeira posição e a correção se anula: resta resj / (pi^2 / 6)
+        rank += sum(DEFAULT_WEIGHT / ((j + 1) * (j + 1)) for j in range(len(term_positions))) / 1.64493406685
+    return rank / len(positions) if positions else 0.0
+
+
+def _rank_and(positions: List[Optional[Sequence[int]]]) -> float:
+    """calc_rank_and do tsrank.c: proximidade entre pares de termos."""
+    rank = -1.0
+    for i, current in enumerate(positions):
+        if current is None:
+            continue
+        for previous in positions[:i]:
+            if previous is None:
+                continue
+            for a in current:
+                for b in previous:
+                    distance = abs(a - b)
+                    if distance:
+                        weight = math.sqrt(DEFAULT_WEIGHT * DEFAULT_WEIGHT * _word_distance(distance))
+                        rank = weight if rank < 0 else 1.0 - (1.0 - rank) * (1.0 - weight)
+    return rank
+
+
+def ts_rank(positions: List[Optional[Sequence[int]]]) -> float:
+    """
+    ts_rank(to_tsvector(...), plainto_tsquery(...)) sem normalização, dadas
+    as posições de cada termo distinto da consulta no documento (None se ausente).
+    """
+    if len(positions) < 2:
+        rank = _rank_or(positions)
+    else:
+        rank = _rank_and(positions)
+    return rank if rank >= 0 else 1e-20
+
+
+class LexicalIndex:
+    """
+    Índice invertido em memória no formato CSR: para o termo t, os postings
+    ficam em [term_ptr[t], term_ptr[t + 1]) de `docs`/`tf`, e as posições do
+    posting p em [pos_ptr[p], pos_ptr[p + 1]) de `positions`.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], vocabulary: Dict[str, int], term_ptr: 'np.ndarray',
+                 docs: 'np.ndarray', tf: 'np.ndarray', pos_ptr: 'np.ndarray', positions: 'np.ndarray',
+                 doc_len: 'np.ndarray', fold: bool = True):
+        self.rows = rows
+        self.vocabulary = vocabulary
+        self.term_ptr = term_ptr
+        self.docs = docs
+        self.tf = tf
+        self.pos_ptr = pos_ptr
+        self.positions = positions
+        self.doc_len = doc_len
+        self.fold = fold
+        self.avg_len = float(doc_len.mean()) if len(doc_len) else 0.0
+        self.approved = np.fromiter((row.get('process_status', APPROVED_STATUS) == APPROVED_STATUS for row in rows),
+                                    dtype=bool, count=len(rows))
+        self._filter_masks: Dict[str, 'np.ndarray'] = {}
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], fold: bool = True) -> 'LexicalIndex':
+        """Indexa o campo `content` de cada linha (a posição na lista é o id do documento)."""
+        require_numpy()
+        postings: Dict[str, List[Tuple[int, List[int]]]] = {}
+        doc_len = np.zeros(len(rows), dtype=np.int32)
+        for doc, row in enumerate(rows):
+            terms: Dict[str, List[int]] = {}
+            analyzed = analyze(row.get('content') or '', fold)
+            doc_len[doc] = len(analyzed)
+            for term, position in analyzed:
+                terms.setdefault(term, []).append(position)
+            for term, term_positions in terms.items():
+                postings.setdefault(term, []).append((doc, term_positions))
+
+        vocabulary: Dict[str, int] = {}
+        term_ptr = [0]
+        docs: List[int] = []
+        tf: List[int] = []
+        pos_ptr = [0]
+        positions: List[int] = []
+        for term in sorted(postings):
+            vocabulary[term] = len(vocabulary)
+            for doc, term_positions in postings[term]:
+                docs.append(doc)
+                tf.append(min(len(term_positions), 65535))
+                positions.extend(term_positions[:MAX_POSITIONS_PER_LEXEME])
+                pos_ptr.append(len(positions))
+            term_ptr.append(len(docs))
+        return cls(rows, vocabulary, np.asarray(term_ptr, dtype=np.int64), np.asarray(docs, dtype=np.int32),
+                   np.asarray(tf, dtype=np.uint16), np.asarray(pos_ptr, dtype=np.int64),
+                   np.asarray(positions, dtype=np.uint16), doc_len, fold)
+
+    @classmethod
+    def from_export(cls, path: str, fold: bool = True) -> 'LexicalIndex':
+        rows = []
+        for row in iter_export(path):
+            row.pop('embedding', None)
+            rows.append(row)
+        return cls.from_rows(rows, fold)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.term_ptr, self.docs, self.tf, self.pos_ptr,
+                                              self.positions, self.doc_len))
+
+    def filter_mask(self, filter_metadata: Optional[Dict[str, Any]]) -> 'np.ndarray':
+        """Linhas aprovadas e com metadata @> filtro, memoizado por filtro."""
+        if not filter_metadata:
+            return self.approved
+        key = json.dumps(filter_metadata, sort_keys=True)
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter((jsonb_contains(row.get('metadata') or {}, filter_metadata) for row in self.rows),
+                               dtype=bool, count=len(self.rows)) & self.approved
+            self._filter_masks[key] = mask
+        return mask
+
+    # ---- consulta ----
+
+    def terms(self, query_text: str) -> List[str]:
+        return query_terms(query_text, self.fold)
+
+    def _postings(self, term: str) -> Tuple[int, int]:
+        index = self.vocabulary.get(term)
+        if index is None:
+            return 0, 0
+        return int(self.term_ptr[index]), int(self.term_ptr[index + 1])
+
+    def match(self, terms: Sequence[str]) -> 'np.ndarray':
+        """Documentos com todos os termos (to_tsvector @@ plainto_tsquery), em ordem crescente."""
+        if not terms:
+            return np.zeros(0, dtype=np.int32)
+        spans = sorted((self._postings(term) for term in terms), key=lambda span: span[1] - span[0])
+        start, end = spans[0]
+        result = self.docs[start:end]
+        for start, end in spans[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, self.docs[start:end], assume_unique=True)
+        return result
+
+    def bm25(self, terms: Sequence[str]) -> 'np.ndarray':
+        """Score BM25 de todos os documentos (0 onde nenhum termo aparece)."""
+        scores = np.zeros(len(self.rows), dtype=np.float32)
+        n = len(self.rows)
+        for term in terms:
+            start, end = self._postings(term)
+            if start == end:
+                continue
+            docs = self.docs[start:end]
+            tf = self.tf[start:end].astype(np.float32)
+            idf = math.log(1 + (n - (end - start) + 0.5) / ((end - start) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[docs] / (self.avg_len or 1.0))
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def ts_rank(self, terms: Sequence[str], docs: 'np.ndarray') -> 'np.ndarray':
+        """ts_rank de cada documento de `docs` (1e-20/0 sem termos, como no Postgres)."""
+        ranks = np.zeros(len(docs), dtype=np.float64)
+        if not terms:
+            return ranks
+        # Postings de cada termo localizados por busca binária (docs crescentes dentro do termo)
+        found: List[Dict[int, Sequence[int]]] = []
+        for term in terms:
+            start, end = self._postings(term)
+            slots = start + np.searchsorted(self.docs[start:end], docs)
+            present = slots < end
+            present[present] = self.docs[slots[present]] == docs[present]
+            found.append({
+                int(i): self.positions[self.pos_ptr[slot]:self.pos_ptr[slot + 1]].tolist()
+                for i, slot in zip(np.flatnonzero(present), slots[present])
+            })
+        for i in range(len(docs)):
+            ranks[i] = ts_rank([term_docs.get(i) for term_docs in found])
+        return ranks
+
+    def search_indices(self, query_text: str, match_count: int = 10, filter_metadata: Optional[Dict[str, Any]] = None,
+                       scoring: str = 'bm25') -> List[Tuple[int, float]]:
+        """(linha, score) dos documentos que casam com a consulta, melhores primeiro."""
+        terms = self.terms(query_text)
+        docs = self.match(terms)
+        docs = docs[self.filter_mask(filter_metadata)[docs]]
+        if not len(docs) or match_count <= 0:
+            return []
+        scores = self.bm25(terms)[docs] if scoring == 'bm25' else self.ts_rank(terms, docs)
+        order = np.argsort(-scores, kind='stable')[:match_count]
+        return [(int(docs[i]), float(scores[i])) for i in order]
+
+    def search(self, query_text: str, match_count: int = 10, filter_metadata: Optional[Dict[str, Any]] = None,
+               scoring: str = 'bm25') -> List[Dict[str, Any]]:
+        results = []
+        for index, score in self.search_indices(query_text, match_count, filter_metadata, scoring):
+            row = self.rows[index]
+            result = {field: row.get(field) for field in RESULT_FIELDS}
+            result['text_rank'] = score
+            results.append(result)
+        return results
+
+
+def hybrid_search_indices(vectors: VectorSearch, lexical: LexicalIndex, query_embedding: Any, query_text: str,
+                          match_threshold: float = 0.7, match_count: int = 10,
+                          filter_metadata: Optional[Dict[str, Any]] = None, vector_weight: float = 0.7,
+                          text_weight: float = 0.3, scoring: str = 'ts_rank') -> List[Tuple[int, float, float, float]]:
+    """
+    (linha, similarity, text_rank, combined_score) como search_knowledge_base_hybrid.
+    `lexical` precisa ter sido montado sobre `vectors.rows` (mesma ordem).
+    """
+    query = np.asarray(query_embedding, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    similarity = vectors.matrix @ (query / norm if norm else query)
+    terms = lexical.terms(query_text)
+    candidate = similarity >= match_threshold
+    candidate[lexical.match(terms)] = True
+    docs = np.flatnonzero(candidate & vectors.filter_mask(filter_metadata))
+    if not len(docs) or match_count <= 0:
+        return []
+
+    if scoring == 'bm25':
+        rank = lexical.bm25(terms)[docs].astype(np.float64)
+        best = rank.max()
+        if best > 0:
+            rank /= best
+    else:
+        rank = lexical.ts_rank(terms, docs)
+    combined = similarity[docs] * vector_weight + rank * text_weight
+    if len(docs) > match_count:
+        top = np.argpartition(-combined, match_count - 1)[:match_count]
+    else:
+        top = np.arange(len(docs))
+    top = top[np.argsort(-combined[top], kind='stable')]
+    return [(int(docs[i]), float(similarity[docs[i]]), float(rank[i]), float(combined[i])) for i in top]
+
+
+def hybrid_search(vectors: VectorSearch, lexical: LexicalIndex, query_embedding: Any, query_text: str,
+                  match_threshold: float = 0.7, match_count: int = 10, filter_metadata: Optional[Dict[str, Any]] = None,
+                  vector_weight: float = 0.7, text_weight: float = 0.3, scoring: str = 'ts_rank') -> List[Dict[str, Any]]:
+    """Mesmas colunas de search_knowledge_base_hybrid."""
+    results = []
+    for index, similarity, rank, combined in hybrid_search_indices(
+            vectors, lexical, query_embedding, query_text, match_threshold, match_count, filter_metadata,
+            vector_weight, text_weight, scoring):
+        row = vectors.rows[index]
+        result = {field: row.get(field) for field in RESULT_FIELDS}
+        result.update(similarity=similarity, text_rank=rank, combined_score=combined)
+        results.append(result)
+    return results
+
+
+def bench_queries(rows: List[Dict[str, Any]], limit: int) -> List[Tuple[int, str, set]]:
+    """
+    Consultas de avaliação sem rótulos manuais: o chunk `name` de cada
+    processo é a consulta e os demais chunks do mesmo processo são os relevantes.
+    """
+    by_process: Dict[Any, List[int]] = {}
+    for index, row in enumerate(rows):
+        by_process.setdefault(row.get('process_id'), []).append(index)
+    queries = []
+    for index, row in enumerate(rows):
+        if row.get('chunk_type') == 'name' and row.get('content'):
+            relevant = set(by_process[row.get('process_id')]) - {index}
+            if relevant:
+                queries.append((index, row['content'], relevant))
+        if len(queries) >= limit:
+            break
+    return queries
+
+
+def run_bench(vectors: VectorSearch, lexical: LexicalIndex, queries: List[Tuple[int, str, set]],
+              embeddings: List[Any], match_threshold: float, match_count: int, vector_weight: float,
+              text_weight: float) -> Dict[str, Any]:
+    """Latência (p50/p95) e qualidade (hit@k, recall@k, MRR) por modo de busca."""
+    modes = {
+        'vector': lambda text, emb: [i for i, _ in vectors.search_indices(emb, match_threshold, match_count + 1)],
+        'lexical_bm25': lambda text, emb: [i for i, _ in lexical.search_indices(text, match_count + 1)],
+        'hybrid_ts_rank': lambda text, emb: [i for i, *_ in hybrid_search_indices(
+            vectors, lexical, emb, text, match_threshold, match_count + 1, None, vector_weight, text_weight)],
+        'hybrid_bm25': lambda text, emb: [i for i, *_ in hybrid_search_indices(
+            vectors, lexical, emb, text, match_threshold, match_count + 1, None, vector_weight, text_weight, 'bm25')],
+    }
+    report: Dict[str, Any] = {'rows': len(vectors), 'queries': len(queries), 'match_count': match_count,
+                              'match_threshold': match_threshold, 'vocabulary': len(lexical.vocabulary),
+                              'postings_kb': round(lexical.nbytes() / 1024, 1)}
+    for mode, search in modes.items():
+        latencies, hits, recalls, reciprocal = [], [], [], []
+        for (source, text, relevant), embedding in zip(queries, embeddings):
+            start = time.perf_counter()
+            found = search(text, embedding)
+            latencies.append((time.perf_counter() - start) * 1000)
+            # O próprio chunk da consulta não conta
+            found = [i for i in found if i != source][:match_count]
+            ranks = [position for position, i in enumerate(found, 1) if i in relevant]
+            hits.append(1.0 if ranks else 0.0)
+            recalls.append(len(ranks) / min(len(relevant), match_count))
+            reciprocal.append(1.0 / ranks[0] if ranks else 0.0)
+        count = len(latencies) or 1
+        report[mode] = {
+            'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 3) if latencies else None,
+            f'hit@{match_count}': round(sum(hits) / count, 4),
+            f'recall@{match_count}': round(sum(recalls) / count, 4),
+            'mrr': round(sum(reciprocal) / count, 4),
+        }
+    return report
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Índice lexical offline (espelho de search_knowledge_base_hybrid)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    terms = sub.add_parser('terms', help='Mostrar os lexemas de um texto (como to_tsvector)')
+    terms.add_argument('--text', required=True)
+
+    query = sub.add_parser('query', help='Consultar uma exportação (lexical ou híbrida)')
+    query.add_argument('--text', required=True, help='Texto da consulta')
+    query.add_argument('--mode', choices=['lexical', 'hybrid'], default='lexical')
+    query.add_argument('--filter', help='filter_metadata em JSON, ex.: \'{"category": "emergencias"}\'')
+
+    bench = sub.add_parser('bench', help='Latência e qualidade: vetorial x lexical x híbrida')
+    bench.add_argument('--queries', type=int, default=200)
+    bench.add_argument('--output', help='Salvar o relatório em JSON')
+
+    for command in (terms, query, bench):
+        command.add_argument('--no-fold', action='store_true',
+                             help='Manter acentos nos lexemas (paridade exata com o Postgres)')
+    for command in (query, bench):
+        command.add_argument('--input', required=True, help='Exportação NDJSON (vector_search.py export)')
+        command.add_argument('--scoring', choices=['ts_rank', 'bm25'], default=None,
+                             help='Ranking textual (padrão: bm25 no modo lexical, ts_rank no híbrido)')
+        command.add_argument('--embedder', choices=['api', 'local'], default='api')
+        command.add_argument('--match-threshold', type=float, default=0.7)
+        command.add_argument('--match-count', type=int, default=10)
+        command.add_argument('--vector-weight', type=float, default=0.7)
+        command.add_argument('--text-weight', type=float, default=0.3)
+
+    args = parser.parse_args()
+    fold = not args.no_fold
+
+    if args.command == 'terms':
+        for term, position in analyze(args.text, fold):
+            print(f"{position:>4}  {term}")
+        print(f"plainto_tsquery: {' & '.join(query_terms(args.text, fold)) or '(vazia)'}")
+        return
+
+    require_numpy()
+    start = time.perf_counter()
+    if args.command == 'query' and args.mode == 'lexical':
+        vectors = None
+        lexical = LexicalIndex.from_export(args.input, fold)
+    else:
+        vectors = VectorSearch.from_export(args.input)
+        lexical = LexicalIndex.from_rows(vectors.rows, fold)
+    print(f"📦 {len(lexical)} chunks, {len(lexical.vocabulary)} lexemas, "
+          f"{lexical.nbytes() / 1024:.1f} KB de postings em {time.perf_counter() - start:.2f}s")
+
+    from embedders import embedder_from_env
+
+    if args.command == 'query':
+        filter_metadata = json.loads(args.filter) if args.filter else None
+        print(f"🔎 plainto_tsquery: {' & '.join(lexical.terms(args.text)) or '(vazia)'}")
+        if vectors is None:
+            for result in lexical.search(args.text, args.match_count, filter_metadata, args.scoring or 'bm25'):
+                print(f"{result['text_rank']:.4f}  [{result['chunk_type']}] {result['process_name'] or '-'}: "
+                      f"{result['content'][:80]!r}")
+            return
+        embedding = embedder_from_env(args.embedder).embed([args.text])[0]
+        for result in hybrid_search(vectors, lexical, embedding, args.text, args.match_threshold, args.match_count,
+                                    filter_metadata, args.vector_weight, args.text_weight, args.scoring or 'ts_rank'):
+            print(f"{result['combined_score']:.4f} (vetor {result['similarity']:.4f}, texto {result['text_rank']:.4f})  "
+                  f"[{result['chunk_type']}] {result['process_name'] or '-'}: {result['content'][:60]!r}")
+        return
+
+    queries = bench_queries(vectors.rows, args.queries)
+    if not queries:
+        print("Erro: a exportação não tem chunks 'name' para gerar consultas")
+        sys.exit(1)
+    embeddings = embedder_from_env(args.embedder).embed([text for _, text, _ in queries])
+    report = run_bench(vectors, lexical, queries, embeddings, args.match_threshold, args.match_count,
+                       args.vector_weight, args.text_weight)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Relatório salvo em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
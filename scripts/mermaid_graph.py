@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Pré-compilação dos diagramas mermaid (flowchart/graph) dos processos.
+
+O seed grava em `content.mermaid_graph`, ao lado do texto original
+(`content.mermaid_diagram`), uma estrutura pronta para desenhar: nós com
+rótulo em linhas (`<br/>` já resolvido), forma e estilo; arestas com rótulo,
+traço e ponta; subgrafos; e uma dica de layout (camada e posição de cada nó,
+arestas de retorno marcadas). O frontend pode desenhar sem carregar o parser
+do mermaid, e diagramas inválidos aparecem no seed, não no navegador.
+
+Formato (campos com valor padrão são omitidos):
+    {
+      "version": 1, "direction": "TD",
+      "nodes": [{"id": "A", "lines": ["Revisão", "(Síndico)"], "shape": "diamond",
+                 "style": {"fill": "#1e3a8a"}, "classes": ["x"], "rank": 0, "order": 0}],
+      "edges": [{"from": "E", "to": "F", "label": "Sim", "line": "dotted",
+                 "head": "none", "both": true, "minlen": 2, "back": true}],
+      "subgraphs": [{"id": "S1", "title": "Etapa 1", "nodes": ["A", "B"], "direction": "LR"}],
+      "layout": {"ranks": 6, "width": 2}
+    }
+
+Uso:
+    python scripts/mermaid_graph.py                  # valida o catálogo
+    python scripts/mermaid_graph.py --show "Nome do processo"
+"""
+
+import html
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+GRAPH_VERSION = 1
+
+HEADER_RE = re.compile(r'^(?:flowchart|graph)(?:\s+(TD|TB|BT|RL|LR))?$', re.IGNORECASE)
+ID_RE = re.compile(r'\w+')
+NODE_ID_RE = re.compile(r'\s*(\w+)')
+AMPERSAND_RE = re.compile(r'\s*&')
+BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+ENTITY_RE = re.compile(r'#(\w+);')
+
+# Links: "-->", "---", "==>", "-.->", "--o", "--x", "<-->", "--->"...
+_LINK_END = r'(?:-{2,}|={2,}|-?\.+-)[>ox]|-{3,}|={3,}|-\.+-'
+LINK_RE = re.compile(rf'\s*(?P<both><)?(?P<arrow>{_LINK_END})')
+# Links com texto no meio: "-- Sim -->", "== Sim ==>", "-. Sim .->"
+TEXT_LINK_RE = re.compile(
+    r'\s*(?P<both><)?(?P<start>--|==|-\.)\s*(?P<text>"[^"]*"|[^"|]+?)\s*'
+    r'(?P<arrow>(?:-{2,}|={2,}|\.+-)[>ox]|-{3,}|={3,}|\.+-)(?=[\s\w])'
+)
+PIPE_LABEL_RE = re.compile(r'\s*\|(?P<label>[^|]*)\|')
+
+# (abertura, fechamento, forma), aberturas mais longas primeiro
+SHAPES = [
+    ('(((', ')))', 'double-circle'),
+    ('((', '))', 'circle'),
+    ('([', '])', 'stadium'),
+    ('[[', ']]', 'subroutine'),
+    ('[(', ')]', 'cylinder'),
+    ('{{', '}}', 'hexagon'),
+    ('[/', '/]', 'parallelogram'),
+    ('[/', '\\]', 'trapezoid'),
+    ('[\\', '\\]', 'parallelogram-alt'),
+    ('[\\', '/]', 'trapezoid-alt'),
+    ('[', ']', 'rect'),
+    ('(', ')', 'round'),
+    ('{', '}', 'diamond'),
+    ('>', ']', 'asymmetric'),
+]
+_OPENINGS = sorted({opening for opening, _, _ in SHAPES}, key=len, reverse=True)
+# Primeiro caractere → aberturas possíveis (a maioria dos nós não tem forma)
+_OPENINGS_BY_CHAR: Dict[str, List[str]] = {}
+for _opening in _OPENINGS:
+    _OPENINGS_BY_CHAR.setdefault(_opening[0], []).append(_opening)
+_CLOSINGS: Dict[str, List[Tuple[str, str]]] = {}
+for _opening, _closing, _shape in SHAPES:
+    _CLOSINGS.setdefault(_opening, []).append((_closing, _shape))
+HEADS = {'>': 'arrow', 'o': 'circle', 'x': 'cross'}
+
+
+class MermaidError(ValueError):
+    """Diagrama fora do subconjunto suportado, com a linha do problema."""
+
+    def __init__(self, line: int, reason: str):
+        super().__init__(f"linha {line}: {reason}")
+        self.line = line
+        self.reason = reason
+
+
+def _entity(match: 're.Match[str]') -> str:
+    """Códigos de entidade do mermaid: #quot; → ", #35; → #."""
+    code = match.group(1)
+    return html.unescape(f"&#{code};" if code.isdigit() else f"&{code};")
+
+
+def _label_lines(text: str) -> List[str]:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    text = ENTITY_RE.sub(_entity, text)
+    return [line.strip() for line in BR_RE.split(text)]
+
+
+def _css(text: str) -> Dict[str, str]:
+    style = {}
+    for part in text.rstrip(';').split(','):
+        key, sep, value = part.partition(':')
+        if sep and key.strip():
+            style[key.strip()] = value.strip()
+    return style
+
+
+class _Parser:
+    def __init__(self):
+        self.direction = 'TD'
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: List[Dict[str, Any]] = []
+        self.class_defs: Dict[str, Dict[str, str]] = {}
+        self.link_styles: List[Tuple[int, Optional[List[int]], Dict[str, str]]] = []
+        self.subgraphs: List[Dict[str, Any]] = []
+        self.stack: List[Dict[str, Any]] = []
+        self.line = 0
+
+    def error(self, reason: str) -> MermaidError:
+        return MermaidError(self.line, reason)
+
+    def node(self, node_id: str) -> Dict[str, Any]:
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = {'id': node_id, 'lines': [node_id]}
+            if self.stack:
+                self.stack[-1]['nodes'].append(node_id)
+        return node
+
+    def parse_node(self, text: str, pos: int) -> Tuple[str, int]:
+        match = NODE_ID_RE.match(text, pos)
+        if not match:
+            rest = text[pos:].lstrip()
+            raise self.error(f"nó esperado em: {rest[:30]!r}")
+        node = self.node(match.group(1))
+        pos = match.end()
+
+        candidates = _OPENINGS_BY_CHAR.get(text[pos:pos + 1], ())
+        opening = next((o for o in candidates if text.startswith(o, pos)), None)
+        if opening is not None:
+            pos += len(opening)
+            closings = _CLOSINGS[opening]
+            if text.startswith('"', pos):
+                end_quote = text.find('"', pos + 1)
+                if end_quote < 0:
+                    raise self.error(f"aspas sem fechamento no nó {node['id']}")
+                found = [(end_quote + 1, c, shape) for c, shape in closings if text.startswith(c, end_quote + 1)]
+            else:
+                found = sorted((text.find(c, pos), c, shape) for c, shape in closings if text.find(c, pos) >= 0)
+            if not found:
+                raise self.error(f"forma sem fechamento no nó {node['id']} (esperado {closings[0][0]!r})")
+            end, closing, shape = found[0]
+            node['lines'] = _label_lines(text[pos:end])
+            if shape != 'rect':
+                node['shape'] = shape
+            else:
+                node.pop('shape', None)
+            pos = end + len(closing)
+
+        if text.startswith(':::', pos):
+            match = ID_RE.match(text, pos + 3)
+            if not match:
+                raise self.error("nome de classe esperado após ':::'")
+            node.setdefault('classes', []).append(match.group())
+            pos = match.end()
+        return node['id'], pos
+
+    def parse_group(self, text: str, pos: int) -> Tuple[List[str], int]:
+        ids = []
+        while True:
+            node_id, pos = self.parse_node(text, pos)
+            ids.append(node_id)
+            match = AMPERSAND_RE.match(text, pos)
+            if match:
+                pos = match.end()
+                continue
+            return ids, pos
+
+    def parse_link(self, text: str, pos: int) -> Tuple[Dict[str, Any], int]:
+        label = None
+        match = LINK_RE.match(text, pos)
+        if match is None:
+            match = TEXT_LINK_RE.match(text, pos)
+            if match is None:
+                raise self.error(f"ligação esperada em: {text[pos:pos + 30]!r}")
+            label = '\n'.join(_label_lines(match.group('text')))
+        pos = match.end()
+        arrow = match.group('arrow')
+        pipe = PIPE_LABEL_RE.match(text, pos)
+        if pipe:
+            label = '\n'.join(_label_lines(pipe.group('label')))
+            pos = pipe.end()
+
+        edge: Dict[str, Any] = {}
+        if label:
+            edge['label'] = label
+        if '=' in arrow:
+            edge['line'] = 'thick'
+        elif '.' in arrow:
+            edge['line'] = 'dotted'
+        head = HEADS.get(arrow[-1])
+        if head is None:
+            edge['head'] = 'none'
+        elif head != 'arrow':
+            edge['head'] = head
+        if match.group('both'):
+            edge['both'] = True
+        body = arrow.count('.') if '.' in arrow else len(arrow) - 2
+        if body > 1:
+            edge['minlen'] = body
+        return edge, pos
+
+    def parse_chain(self, text: str) -> None:
+        sources, pos = self.parse_group(text, 0)
+        while text[pos:].strip():
+            edge, pos = self.parse_link(text, pos)
+            targets, pos = self.parse_group(text, pos)
+            for source in sources:
+                for target in targets:
+                    self.edges.append({'from': source, 'to': target, **edge})
+            sources = targets
+
+    def parse_statement(self, text: str) -> None:
+        keyword, _, rest = text.partition(' ')
+        rest = rest.strip()
+        if keyword == 'style':
+            node_id, _, css = rest.partition(' ')
+            self.node(node_id).setdefault('style', {}).update(_css(css))
+        elif keyword == 'classDef':
+            names, _, css = rest.partition(' ')
+            for name in names.split(','):
+                self.class_defs.setdefault(name.strip(), {}).update(_css(css))
+        elif keyword == 'class':
+            ids, _, name = rest.rpartition(' ')
+            for node_id in ids.split(','):
+                self.node(node_id.strip()).setdefault('classes', []).append(name.strip())
+        elif keyword == 'linkStyle':
+            which, _, css = rest.partition(' ')
+            indexes = None if which == 'default' else [int(i) for i in which.split(',') if i.strip().isdigit()]
+            self.link_styles.append((self.line, indexes, _css(css)))
+        elif keyword == 'click':
+            pass  # interatividade não faz parte do grafo
+        elif keyword == 'subgraph':
+            match = re.match(r'^(\w+)\s*\[(.*)\]$', rest)
+            if match:
+                sub_id, title = match.group(1), match.group(2)
+            else:
+                sub_id, title = rest.strip('"'), rest
+            subgraph = {'id': sub_id, 'title': '\n'.join(_label_lines(title)), 'nodes': []}
+            self.subgraphs.append(subgraph)
+            self.stack.append(subgraph)
+        elif keyword == 'end' and not rest:
+            if not self.stack:
+                raise self.error("'end' sem subgraph aberto")
+            self.stack.pop()
+        elif keyword == 'direction' and self.stack:
+            self.stack[-1]['direction'] = 'TD' if rest.upper() == 'TB' else rest.upper()
+        else:
+            self.parse_chain(text)
+
+    def parse(self, source: str) -> Dict[str, Any]:
+        header_seen = False
+        for self.line, raw in enumerate(source.splitlines(), 1):
+            text = raw.strip().rstrip(';').strip()
+            if not text or text.startswith('%%'):
+                continue
+            if not header_seen:
+                match = HEADER_RE.match(text)
+                if not match:
+                    raise self.error(f"cabeçalho não suportado: {text[:40]!r} (esperado flowchart/graph)")
+                direction = (match.group(1) or 'TD').upper()
+                self.direction = 'TD' if direction == 'TB' else direction
+                header_seen = True
+                continue
+            self.parse_statement(text)
+        if not header_seen:
+            raise MermaidError(0, "diagrama vazio")
+        if self.stack:
+            raise self.error(f"subgraph {self.stack[-1]['id']!r} sem 'end'")
+        if not self.nodes:
+            raise self.error("diagrama sem nós")
+        return self.build()
+
+    def build(self) -> Dict[str, Any]:
+        for line, indexes, style in self.link_styles:
+            for index in (range(len(self.edges)) if indexes is None else indexes):
+                if index >= len(self.edges):
+                    raise MermaidError(line, f"linkStyle {index} sem ligação correspondente")
+                self.edges[index].setdefault('style', {}).update(style)
+        default_style = self.class_defs.get('default')
+        if default_style:
+            for node in self.nodes.values():
+                node['style'] = {**default_style, **node.get('style', {})}
+        ranks, width = _layout(self.nodes, self.edges)
+        graph: Dict[str, Any] = {
+            'version': GRAPH_VERSION,
+            'direction': self.direction,
+            'nodes': list(self.nodes.values()),
+            'edges': self.edges,
+        }
+        if self.class_defs:
+            graph['classes'] = self.class_defs
+        if self.subgraphs:
+            graph['subgraphs'] = self.subgraphs
+        graph['layout'] = {'ranks': ranks, 'width': width}
+        return graph
+
+
+def _layout(nodes: Dict[str, Dict[str, Any]], edges: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Dica de layout em camadas: arestas de retorno (ciclos, na ordem de
+    declaração) ficam marcadas com `back`; no grafo restante, `rank` é o
+    caminho mais longo desde as raízes (respeitando `minlen`) e `order` a
+    posição na camada, pela média das posições dos predecessores.
+    """
+    out: Dict[str, List[Dict[str, Any]]] = {node_id: [] for node_id in nodes}
+    for edge in edges:
+        out[edge['from']].append(edge)
+
+    # DFS iterativa: aresta para um nó ainda na pilha é de retorno
+    state: Dict[str, int] = {}
+    post: List[str] = []
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(out[root]))]
+        while stack:
+            node_id, children = stack[-1]
+            edge = next(children, None)
+            if edge is None:
+                state[node_id] = 2
+                post.append(node_id)
+                stack.pop()
+                continue
+            target = edge['to']
+            if state.get(target) == 1:
+                edge['back'] = True
+            elif target not in state:
+                state[target] = 1
+                stack.append((target, iter(out[target])))
+
+    rank = {node_id: 0 for node_id in nodes}
+    preds: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+    for node_id in reversed(post):  # ordem topológica do grafo sem arestas de retorno
+        for edge in out[node_id]:
+            if edge.get('back'):
+                continue
+            target = edge['to']
+            rank[target] = max(rank[target], rank[node_id] + edge.get('minlen', 1))
+            preds[target].append(node_id)
+
+    declared = {node_id: index for index, node_id in enumerate(nodes)}
+    layers: Dict[int, List[str]] = {}
+    for node_id in nodes:
+        layers.setdefault(rank[node_id], []).append(node_id)
+    order: Dict[str, int] = {}
+    for level in sorted(layers):
+        def key(node_id: str) -> Tuple[float, int]:
+            placed = [order[p] for p in preds[node_id] if p in order]
+            return (sum(placed) / len(placed) if placed else float(declared[node_id]), declared[node_id])
+        for position, node_id in enumerate(sorted(layers[level], key=key)):
+            order[node_id] = position
+
+    for node_id, node in nodes.items():
+        node['rank'] = rank[node_id]
+        node['order'] = order[node_id]
+    return max(rank.values()) + 1, max(len(layer) for layer in layers.values())
+
+
+def parse_mermaid(source: str) -> Dict[str, Any]:
+    """Compila um flowchart mermaid na estrutura de grafo. Levanta MermaidError."""
+    return _Parser().parse(source)
+
+
+# Texto do diagrama → (grafo, erro). Sem limite de tamanho: cada diagrama
+# distinto é compilado uma única vez por execução, mesmo em catálogos grandes
+_compiled: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+
+
+def compile_diagram(source: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    (grafo, None) ou (None, erro). Resultado em cache por texto do diagrama
+    (a conversão roda mais de uma vez por processo): não altere o grafo.
+    """
+    result = _compiled.get(source)
+    if result is None:
+        try:
+            result = parse_mermaid(source), None
+        except MermaidError as e:
+            result = None, str(e)
+        # Corrida entre threads só compila o mesmo diagrama duas vezes
+        _compiled[source] = result
+    return result
+
+
+def clear_compiled() -> None:
+    """Esvazia o cache de compile_diagram (benchmarks que medem a compilação)."""
+    _compiled.clear()
+
+
+_invalid: Dict[str, str] = {}
+_invalid_lock = threading.Lock()
+
+
+def diagram_fields(name: str, source: str) -> Dict[str, Any]:
+    """
+    Campos extras do `content` para o diagrama de um processo:
+    {'mermaid_graph': ...} ou, se inválido, {'mermaid_error': ...}, com aviso
+    impresso uma vez por processo.
+    """
+    graph, error = compile_diagram(source)
+    if graph is not None:
+        return {'mermaid_graph': graph}
+    with _invalid_lock:
+        first = name not in _invalid
+        _invalid[name] = error
+    if first:
+        print(f"⚠️  Diagrama mermaid inválido em {name!r}: {error}", file=sys.stderr)
+    return {'mermaid_error': error}
+
+
+def invalid_diagrams() -> Dict[str, str]:
+    """Processos com diagrama inválido vistos até agora: nome → erro."""
+    with _invalid_lock:
+        return dict(_invalid)
+
+
+def main():
+    import argparse
+    import json
+
+    from catalog_cache import DEFAULT_SOURCE, load_catalog
+
+    parser = argparse.ArgumentParser(description='Validar e compilar os diagramas mermaid do catálogo')
+    parser.add_argument('--file', default=DEFAULT_SOURCE, help='Catálogo (processes.ts, .json ou .ndjson)')
+    parser.add_argument('--show', help='Imprimir o grafo compilado deste processo')
+    args = parser.parse_args()
+
+    processes = load_catalog(args.file)
+    with_diagram = [p for p in processes if p.get('mermaid_diagram')]
+    if args.show:
+        process = next((p for p in with_diagram if p.get('name') == args.show), None)
+        if process is None:
+            print(f"Erro: processo sem diagrama ou inexistente: {args.show}")
+            sys.exit(1)
+        print(json.dumps(parse_mermaid(process['mermaid_diagram']), ensure_ascii=False, indent=2))
+        return
+
+    errors = 0
+    for process in with_diagram:
+        graph, error = compile_diagram(process['mermaid_diagram'])
+        if error:
+            errors += 1
+            print(f"❌ {process.get('name')}: {error}")
+    print(f"✅ {len(with_diagram) - errors}/{len(with_diagram)} diagramas compilados")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
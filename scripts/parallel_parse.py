@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Parse paralelo de vários catálogos no formato de processes.ts (um arquivo
+por módulo ou por cliente), com globs e divisão de arquivos grandes.
+
+Arquivos .ts grandes são cortados em fatias de ~`shard_bytes` em linhas
+que abrem um objeto de topo do array (mesma indentação do primeiro objeto),
+sem varrer o arquivo no processo principal. Cada fatia é parseada por
+ts_parser num pool de processos, que também confirma o corte: uma fatia que
+parseia inteira termina num objeto de topo, então a seguinte começa em um.
+Um corte inválido (ex.: dentro de um template literal) faz o trecho ser
+refeito em sequência. Os resultados voltam na ordem (arquivo, fatia), então
+a saída é a mesma do parse sequencial. Ids repetidos entre fatias ou
+arquivos são detectados com arquivo:linha das duas ocorrências.
+
+Uso:
+    python scripts/parallel_parse.py 'catalogs/**/*.ts' --workers 8 --output scripts/processes.ndjson
+    python scripts/parallel_parse.py frontend/src/data/processes.ts extra.ts --compare
+"""
+
+import glob
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from catalog_stream import is_ndjson, iter_catalog, write_ndjson
+from ts_parser import ParseError, Parser, iter_processes_from_file, normalize_process
+
+DEFAULT_SHARD_BYTES = 1024 * 1024
+MIN_SHARD_BYTES = 64 * 1024
+SEPARATOR_RE = re.compile(rb'(?:\s+|//[^\n]*|/\*[\s\S]*?\*/)*')
+
+
+class Shard(NamedTuple):
+    """Fatia de um arquivo: bytes [start, end) a partir de um '{' de objeto de topo."""
+    path: str
+    start: int
+    end: int
+    last: bool
+
+
+class ShardResult(NamedTuple):
+    """
+    Resultado de uma fatia: (linha relativa, processo) de cada objeto, número
+    de quebras de linha da fatia, se o array terminou nela e o erro de parse
+    (fatia descartada) se houver.
+    """
+    processes: List[Tuple[int, Dict[str, Any]]]
+    newlines: int
+    closed: bool
+    error: Optional[str]
+
+
+class DuplicateIdError(ValueError):
+    """Ids repetidos: lista de (id, 'arquivo:linha' da primeira, 'arquivo:linha' da repetida)."""
+
+    def __init__(self, duplicates: List[Tuple[Any, str, str]]):
+        lines = [f"id {pid!r}: {first} e {second}" for pid, first, second in duplicates[:20]]
+        if len(duplicates) > 20:
+            lines.append(f"... e mais {len(duplicates) - 20}")
+        super().__init__(f"{len(duplicates)} id(s) duplicado(s):\n  " + '\n  '.join(lines))
+        self.duplicates = duplicates
+
+
+def expand_sources(patterns: Iterable[str]) -> List[str]:
+    """
+    Expande globs (inclusive `**`) na ordem dos padrões; dentro de cada padrão
+    os arquivos são ordenados. Caminhos repetidos aparecem uma vez só.
+    """
+    paths: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            raise FileNotFoundError(f"Arquivo não encontrado: {pattern}")
+        for path in matches:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def _array_re(array_name: Optional[str]) -> 're.Pattern[bytes]':
+    if array_name is None:
+        return re.compile(rb'=\s*\[')
+    return re.compile(rb'\b' + re.escape(array_name.encode()) + rb'\b[^=;]*=\s*\[')
+
+
+def plan_shards(path: str, shard_bytes: int = DEFAULT_SHARD_BYTES,
+                array_name: Optional[str] = 'processesData') -> Tuple[int, List[Shard]]:
+    """
+    Escolhe os cortes sem varrer o arquivo: a partir de cada múltiplo de
+    `shard_bytes`, procura (find, em C) a próxima linha com a mesma
+    indentação do primeiro objeto seguida de '{'. O corte é só um candidato;
+    parse_shard confirma que a fatia anterior termina num objeto de topo.
+    Retorna (linha do primeiro objeto, fatias).
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ParseError(f"{path}: Array '{array_name}' não encontrado", 0)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        match = _array_re(array_name).search(data)
+        if not match:
+            raise ParseError(f"{path}: Array '{array_name}' não encontrado", 0)
+        first = SEPARATOR_RE.match(data, match.end()).end()
+        line = 1 + data[:first].count(b'\n')
+        if data[first:first + 1] != b'{':
+            # Array vazio ou conteúdo inesperado: uma fatia só (o parser reporta)
+            return line, [Shard(path, first, size, True)]
+
+        indent = data[data.rfind(b'\n', 0, first) + 1:first]
+        cuts = [first]
+        if indent.strip() == b'':
+            marker = b'\n' + indent + b'{'
+            target = first + shard_bytes
+            while target < size:
+                cut = data.find(marker, target)
+                if cut < 0:
+                    break
+                cuts.append(cut + len(marker) - 1)
+                target = cuts[-1] + shard_bytes
+    ends = cuts[1:] + [size]
+    return line, [Shard(path, start, end, end == size) for start, end in zip(cuts, ends)]
+
+
+def _parse_objects(text: str) -> Tuple[List[Tuple[int, Dict[str, Any]]], int]:
+    """(linha relativa, processo) dos objetos de `text` (sequência '{...}, ...]') e onde o parse parou."""
+    parser = Parser(text)
+    results: List[Tuple[int, Dict[str, Any]]] = []
+    line, counted = 0, 0
+    for obj_start, _, obj in parser.iter_array_objects():
+        line += text.count('\n', counted, obj_start)
+        counted = obj_start
+        process = normalize_process(obj)
+        if process.get('name'):
+            results.append((line, process))
+    return results, parser.pos
+
+
+def parse_shard(shard: Shard) -> ShardResult:
+    """
+    Parseia uma fatia no worker. Fatias intermediárias recebem um ']' no fim;
+    se o parse consome tudo, o texto termina exatamente num objeto de topo,
+    logo o corte seguinte também é válido. Qualquer erro devolve a fatia com
+    `error` para o processo principal refazer o trecho em sequência.
+    """
+    with open(shard.path, 'rb') as f:
+        f.seek(shard.start)
+        text = f.read(shard.end - shard.start).decode('utf-8')
+    newlines = text.count('\n')
+    if not shard.last:
+        text += '\n]'
+    try:
+        processes, stop = _parse_objects(text)
+    except ParseError as e:
+        return ShardResult([], newlines, False, e.reason)
+    # Numa fatia intermediária, parar antes do ']' acrescentado = fim real do array
+    return ShardResult(processes, newlines, shard.last or stop < len(text), None)
+
+
+def _parse_rest(shard: Shard, line: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """Parse sequencial do início da fatia até o fim do arquivo (corte inválido ou erro real)."""
+    with open(shard.path, 'rb') as f:
+        f.seek(shard.start)
+        text = f.read().decode('utf-8')
+    try:
+        processes, _ = _parse_objects(text)
+    except ParseError as e:
+        error_line = line + text.count('\n', 0, min(e.pos, len(text)))
+        raise ParseError(f"{shard.path}:{error_line}: {e.reason}", shard.start) from None
+    return [(line + relative, process) for relative, process in processes]
+
+
+def _is_typescript(path: str) -> bool:
+    # .json / .ndjson / .jsonl não são fatiados: vão por catalog_stream.iter_catalog
+    return not path.lower().endswith(('.json', '.ndjson', '.jsonl'))
+
+
+def iter_sources(paths: List[str], workers: Optional[int] = None, shard_bytes: Optional[int] = None,
+                 array_name: Optional[str] = 'processesData'
+                 ) -> Iterator[Tuple[str, Optional[int], Dict[str, Any]]]:
+    """
+    Itera (arquivo, linha, processo) de todos os arquivos, na ordem dos
+    arquivos e, dentro de cada um, na ordem do texto. Arquivos .ts são
+    fatiados e parseados em `workers` processos (padrão: os.cpu_count()).
+    Sem `shard_bytes`, o tamanho é escolhido para gerar ~4 fatias por worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    if shard_bytes is None:
+        total = sum(os.path.getsize(path) for path in paths if _is_typescript(path))
+        shard_bytes = max(MIN_SHARD_BYTES, min(DEFAULT_SHARD_BYTES, total // (workers * 4) or 1))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for path in paths:
+            if not _is_typescript(path):
+                for process in iter_catalog(path):
+                    yield path, None, process
+                continue
+            line, shards = plan_shards(path, shard_bytes, array_name)
+            if executor and len(shards) > 1:
+                results = executor.map(parse_shard, shards)
+            else:
+                results = map(parse_shard, shards)
+            for shard, result in zip(shards, results):
+                if result.error is not None:
+                    for process_line, process in _parse_rest(shard, line):
+                        yield path, process_line, process
+                    break
+                for relative, process in result.processes:
+                    yield path, line + relative, process
+                if result.closed:
+                    break
+                line += result.newlines
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def parse_sources(patterns: Iterable[str], workers: Optional[int] = None, shard_bytes: Optional[int] = None,
+                  array_name: Optional[str] = 'processesData', allow_duplicates: bool = False
+                  ) -> List[Dict[str, Any]]:
+    """
+    Parseia todos os arquivos de `patterns` (caminhos ou globs) e junta os
+    processos em ordem determinística. Ids repetidos levantam
+    DuplicateIdError, a menos que `allow_duplicates` (aí só são avisados).
+    """
+    processes: List[Dict[str, Any]] = []
+    first_seen: Dict[Any, str] = {}
+    duplicates: List[Tuple[Any, str, str]] = []
+    for path, line, process in iter_sources(expand_sources(patterns), workers, shard_bytes, array_name):
+        processes.append(process)
+        pid = process.get('id')
+        if pid is None:
+            continue
+        location = f"{path}:{line}" if line else path
+        if pid in first_seen:
+            duplicates.append((pid, first_seen[pid], location))
+        else:
+            first_seen[pid] = location
+
+    if duplicates:
+        if not allow_duplicates:
+            raise DuplicateIdError(duplicates)
+        print(f"⚠️  {DuplicateIdError(duplicates)}")
+    return processes
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Parse paralelo de catálogos processes.ts')
+    parser.add_argument('sources', nargs='+', help='Arquivos ou globs (.ts, .json, .ndjson)')
+    parser.add_argument('--workers', type=int, default=0, help='Processos do pool (0 = número de CPUs)')
+    parser.add_argument('--shard-bytes', type=int, default=0,
+                        help='Tamanho aproximado das fatias (0 = automático)')
+    parser.add_argument('--allow-duplicates', action='store_true', help='Só avisar sobre ids repetidos')
+    parser.add_argument('--output', help='Salvar os processos em NDJSON (ou JSON, pela extensão)')
+    parser.add_argument('--compare', action='store_true', help='Comparar com o parse sequencial (ts_parser)')
+    args = parser.parse_args()
+
+    try:
+        paths = expand_sources(args.sources)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not paths:
+        print('❌ Nenhum arquivo corresponde aos padrões informados')
+        sys.exit(1)
+
+    workers = args.workers or os.cpu_count() or 1
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"📖 {len(paths)} arquivo(s), {size / (1024 * 1024):.1f} MB, {workers} worker(s)")
+
+    start = time.perf_counter()
+    try:
+        processes = parse_sources(paths, workers, args.shard_bytes or None,
+                                  allow_duplicates=args.allow_duplicates)
+    except (ParseError, DuplicateIdError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(processes)} processos em {elapsed:.3f}s ({len(processes) / elapsed:,.0f} proc/s)")
+
+    if args.compare:
+        start = time.perf_counter()
+        sequential = []
+        for path in paths:
+            sequential.extend(iter_processes_from_file(path) if _is_typescript(path) else iter_catalog(path))
+        baseline = time.perf_counter() - start
+        same = '✅ idêntico' if sequential == processes else '❌ DIFERENTE'
+        print(f"📊 Sequencial: {baseline:.3f}s | ganho {baseline / elapsed:.2f}x | resultado {same}")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as out:
+            if is_ndjson(args.output):
+                write_ndjson(processes, out)
+            else:
+                json.dump(processes, out, indent=2, ensure_ascii=False)
+        print(f"💾 Processos salvos em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,105 +1,95 @@
 #!/usr/bin/env python3
 """
 Script simples para extrair processos do TypeScript e converter para JSON.
-Usa uma abordagem mais direta: extrai objetos usando regex e processa manualmente.
+Usa o lexer/parser de passagem única de ts_parser.py.
 """
 
-import re
 import json
 import sys
 from pathlib import Path
 
+from catalog_cache import load_catalog
+from catalog_stream import write_ndjson
+from instrumentation import add_instrumentation_arguments, metrics, profile
+from parallel_parse import DuplicateIdError, expand_sources, parse_sources
+from ts_parser import ParseError, iter_processes_from_file
+
 def extract_processes_from_ts(file_path: str) -> list:
-    """Extrai processos do arquivo TypeScript."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """Extrai processos do arquivo TypeScript (passagem única, ver ts_parser)."""
+    return list(iter_processes_from_file(file_path))
+
+def write_ndjson_stream(input_file: str, output_file: str) -> int:
+    """
+    Modo NDJSON: cada processo é gravado assim que o parser termina de lê-lo
+    (sem montar a lista inteira). Retorna a quantidade gravada.
+    """
+    with open(output_file, 'w', encoding='utf-8') as out:
+        return write_ndjson(metrics.iter_span('parse', iter_processes_from_file(input_file)), out)
+
+def main():
+    import argparse
     
-    processes = []
+    parser = argparse.ArgumentParser(description='Extrair processos do processes.ts')
+    parser.add_argument('--input', nargs='+', default=['frontend/src/data/processes.ts'],
+                        help='Arquivo(s) processes.ts ou globs (vários = parse paralelo)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processos para o parse paralelo (0 = número de CPUs)')
+    parser.add_argument('--allow-duplicates', action='store_true',
+                        help='No parse paralelo, só avisar sobre ids repetidos entre arquivos')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json',
+                        help='json: array indentado; ndjson: um processo por linha, em streaming')
+    parser.add_argument('--output', help='Arquivo de saída (padrão: scripts/processes.json ou .ndjson)')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args.metrics)
     
-    # Encontrar todos os objetos que começam com { id: número
-    # Usar regex para encontrar blocos de objetos
-    pattern = r'\{\s*id:\s*\d+,[\s\S]*?\}(?=\s*(?:\{|$|,))'
-    matches = re.finditer(pattern, content)
+    output_file = args.output or f'scripts/processes.{args.format}'
     
-    for match in matches:
-        obj_str = match.group(0).rstrip(',').strip()
-        process = {}
-        
-        # Extrair campos básicos
-        fields = {
-            'name': r'name:\s*"([^"]+)"',
-            'category': r'category:\s*"([^"]+)"',
-            'status': r'status:\s*"([^"]+)"',
-            'description': r'description:\s*"([^"]+)"',
-            'documentType': r'documentType:\s*"([^"]+)"',
-        }
-        
-        for field, pattern_field in fields.items():
-            m = re.search(pattern_field, obj_str)
-            if m:
-                process[field] = m.group(1)
-        
-        # Extrair arrays (workflow, entities, variables)
-        for array_field in ['workflow', 'entities', 'variables']:
-            array_pattern = rf'{array_field}:\s*\[(.*?)\]'
-            m = re.search(array_pattern, obj_str, re.DOTALL)
-            if m:
-                array_str = m.group(1)
-                items = re.findall(r'"([^"]+)"', array_str)
-                process[array_field] = items
-        
-        # Extrair mermaid_diagram (template strings)
-        mermaid_pattern = r'mermaid_diagram:\s*`([^`]+)`'
-        m = re.search(mermaid_pattern, obj_str, re.DOTALL)
-        if m:
-            process['mermaid_diagram'] = m.group(1).strip()
-        
-        # Extrair RACI
-        raci_pattern = r'raci:\s*\[(.*?)\]'
-        m = re.search(raci_pattern, obj_str, re.DOTALL)
-        if m:
-            raci_str = m.group(1)
-            raci_objects = []
-            
-            # Encontrar objetos RACI individuais
-            raci_obj_pattern = r'\{\s*step:\s*"([^"]+)"[\s\S]*?\}'
-            for raci_match in re.finditer(raci_obj_pattern, raci_str, re.DOTALL):
-                raci_obj_str = raci_match.group(0)
-                raci_obj = {}
-                
-                step_m = re.search(r'step:\s*"([^"]+)"', raci_obj_str)
-                if step_m:
-                    raci_obj['step'] = step_m.group(1)
-                
-                for field in ['responsible', 'accountable', 'consulted', 'informed']:
-                    field_pattern = rf'{field}:\s*\[(.*?)\]'
-                    field_m = re.search(field_pattern, raci_obj_str, re.DOTALL)
-                    if field_m:
-                        field_str = field_m.group(1)
-                        field_items = re.findall(r'"([^"]+)"', field_str)
-                        raci_obj[field] = field_items
-                
-                if raci_obj:
-                    raci_objects.append(raci_obj)
-            
-            if raci_objects:
-                process['raci'] = raci_objects
-        
-        if process.get('name'):
-            processes.append(process)
+    try:
+        inputs = expand_sources(args.input)
+    except FileNotFoundError as e:
+        print(f'❌ {e}')
+        sys.exit(1)
     
-    return processes
-
-def main():
-    input_file = 'frontend/src/data/processes.ts'
-    output_file = 'scripts/processes.json'
+    if len(inputs) > 1 or args.workers != 1:
+        # Vários catálogos ou mais de um worker: parse em fatias num pool de processos
+        print(f'⚡ Parse paralelo de {len(inputs)} arquivo(s)...')
+        try:
+            with profile(args.profile), metrics.span('parse'):
+                processes = parse_sources(inputs, args.workers or None, allow_duplicates=args.allow_duplicates)
+        except (ParseError, DuplicateIdError) as e:
+            print(f'❌ {e}')
+            sys.exit(1)
+        if not processes:
+            print('❌ Nenhum processo encontrado')
+            sys.exit(1)
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with metrics.span('write'), open(output_file, 'w', encoding='utf-8') as f:
+            if args.format == 'ndjson':
+                write_ndjson(processes, f)
+            else:
+                json.dump(processes, f, indent=2, ensure_ascii=False)
+        print(f'💾 {args.format.upper()} salvo em: {output_file}')
+        print(f'📊 Total: {len(processes)} processos')
+        return
     
-    if not Path(input_file).exists():
-        print(f'❌ Arquivo não encontrado: {input_file}')
-        sys.exit(1)
+    input_file = inputs[0]
+    if args.format == 'ndjson':
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        print(f'🌊 Lendo {input_file} em streaming...')
+        # parse e gravação intercalados: 'parse' mede só o parser, 'parse_and_write' o total
+        with profile(args.profile), metrics.span('parse_and_write'):
+            count = write_ndjson_stream(input_file, output_file)
+        if not count:
+            print('❌ Nenhum processo encontrado')
+            sys.exit(1)
+        print(f'💾 NDJSON salvo em: {output_file}')
+        print(f'📊 Total: {count} processos')
+        return
     
     print(f'📖 Lendo {input_file}...')
-    processes = extract_processes_from_ts(input_file)
+    with profile(args.profile), metrics.span('parse'):
+        processes = load_catalog(input_file)
     
     if not processes:
         print('❌ Nenhum processo encontrado')
@@ -109,7 +99,7 @@ def main():
     
     # Salvar JSON
     Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with metrics.span('write'), open(output_file, 'w', encoding='utf-8') as f:
         json.dump(processes, f, indent=2, ensure_ascii=False)
     
     print(f'💾 JSON salvo em: {output_file}')
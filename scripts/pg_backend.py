@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Backend PostgreSQL direto para o seed de processos (sem PostgREST).
+
+Usa um pool de conexões psycopg 3. Cada lote é carregado com COPY binário em
+uma tabela temporária de staging e mesclado em `processes` e
+`process_versions` com dois INSERT ... SELECT numa única transação: se a
+criação das versões falhar, nenhum processo do lote fica sem versão.
+
+Requisitos:
+    pip install "psycopg[binary]" psycopg-pool
+"""
+
+import sys
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    Jsonb = None
+    ConnectionPool = None
+
+from request_policy import run_ordered
+
+SYSTEM_STAKEHOLDER_EMAIL = 'sistema@villadelfiori.com'
+
+# (coluna, tipo SQL, tipo do COPY binário)
+STAGE_COLUMNS = [
+    ('ord', 'INTEGER', 'int4'),
+    ('name', 'TEXT', 'text'),
+    ('category', 'TEXT', 'text'),
+    ('subcategory', 'TEXT', 'text'),
+    ('document_type', 'TEXT', 'text'),
+    ('status', 'TEXT', 'text'),
+    ('content_hash', 'TEXT', 'text'),
+    ('content', 'JSONB', 'jsonb'),
+    ('content_text', 'TEXT', 'text'),
+    ('entities_involved', 'JSONB', 'jsonb'),
+    ('variables_applied', 'JSONB', 'jsonb'),
+]
+
+CREATE_STAGE_SQL = "CREATE TEMP TABLE seed_stage ({columns}) ON COMMIT DROP".format(
+    columns=', '.join(f'{name} {sql_type}' for name, sql_type, _ in STAGE_COLUMNS)
+)
+
+COPY_STAGE_SQL = "COPY seed_stage ({columns}) FROM STDIN (FORMAT BINARY)".format(
+    columns=', '.join(name for name, _, _ in STAGE_COLUMNS)
+)
+
+MERGE_SQL = """
+WITH inserted AS (
+    INSERT INTO public.processes (
+        name, category, subcategory, document_type, status, creator_id, content_hash
+    )
+    SELECT s.name, s.category::processcategory, s.subcategory, s.document_type::documenttype,
+           s.status::processstatus, %(creator_id)s, s.content_hash
+    FROM seed_stage s
+    ORDER BY s.ord
+    ON CONFLICT (name) DO NOTHING
+    RETURNING id, name
+), versions AS (
+    INSERT INTO public.process_versions (
+        process_id, version_number, content, content_text,
+        entities_involved, variables_applied, created_by, status
+    )
+    SELECT i.id, 1, s.content, s.content_text, s.entities_involved, s.variables_applied,
+           %(creator_id)s, s.status::processstatus
+    FROM inserted i
+    JOIN seed_stage s ON s.name = i.name
+    RETURNING process_id
+)
+SELECT i.name FROM inserted i JOIN versions v ON v.process_id = i.id
+"""
+
+
+def require_driver() -> None:
+    if ConnectionPool is None:
+        print("Erro: Bibliotecas 'psycopg' e 'psycopg-pool' não instaladas.")
+        print('Instale com: pip install "psycopg[binary]" psycopg-pool')
+        sys.exit(1)
+
+
+def create_pool(dsn: str, max_size: int = 4) -> 'ConnectionPool':
+    """Cria o pool de conexões (abre até `max_size` conexões sob demanda)."""
+    require_driver()
+    return ConnectionPool(dsn, min_size=1, max_size=max_size, open=True)
+
+
+def get_or_create_system_stakeholder_pg(pool: 'ConnectionPool') -> str:
+    """Equivalente a get_or_create_system_stakeholder, direto no banco."""
+    with pool.connection() as conn:
+        row = conn.execute(
+            "SELECT id FROM public.stakeholders WHERE email = %s LIMIT 1",
+            (SYSTEM_STAKEHOLDER_EMAIL,),
+        ).fetchone()
+        if row:
+            return str(row[0])
+        row = conn.execute(
+            """INSERT INTO public.stakeholders (name, email, type, role, user_role, is_active)
+               VALUES ('Sistema', %s, 'staff', 'aprovador', 'admin', true)
+               RETURNING id""",
+            (SYSTEM_STAKEHOLDER_EMAIL,),
+        ).fetchone()
+        return str(row[0])
+
+
+def _stage_row(ord_: int, db_data: Dict[str, Any]) -> Tuple[Any, ...]:
+    process, version = db_data['process'], db_data['version']
+    return (
+        ord_,
+        process['name'],
+        process['category'],
+        process['subcategory'],
+        process['document_type'],
+        process['status'],
+        process.get('content_hash'),
+        Jsonb(version['content']),
+        version['content_text'],
+        Jsonb(version['entities_involved']),
+        Jsonb(version['variables_applied']),
+    )
+
+
+def _seed_batch_pg(pool: 'ConnectionPool', batch: List[Tuple[int, Dict[str, Any]]], total: int,
+                   creator_id: str, lines: List[str], counts: Dict[str, int],
+                   journal: Optional[Any] = None) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Carrega um lote via COPY binário e faz o merge numa única transação.
+    `lines`/`counts` trazem o resultado do pré-filtro do lote. Depois do
+    commit, o lote inteiro (criados e já existentes) vai para o `journal`
+    (SeedJournal), se houver.
+    """
+    if not batch:
+        return lines, counts
+
+    try:
+        with pool.connection() as conn, conn.transaction():
+            with conn.cursor() as cur:
+                cur.execute(CREATE_STAGE_SQL)
+                with cur.copy(COPY_STAGE_SQL) as copy:
+                    copy.set_types([copy_type for _, _, copy_type in STAGE_COLUMNS])
+                    for i, db_data in batch:
+                        copy.write_row(_stage_row(i, db_data))
+                cur.execute(MERGE_SQL, {'creator_id': creator_id})
+                created = {row[0] for row in cur.fetchall()}
+    except Exception as e:
+        for i, db_data in batch:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar processo: {db_data['process']['name']}: {e}")
+        counts['errors'] += len(batch)
+        return lines, counts
+
+    for i, db_data in batch:
+        name = db_data['process']['name']
+        if name in created:
+            lines.append(f"[{i}/{total}] ✅ Processo criado: {name}")
+            counts['success'] += 1
+        else:
+            lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+            counts['skipped'] += 1
+    if journal:
+        journal.commit((db_data['process']['name'], db_data['process']['content_hash']) for _, db_data in batch)
+    return lines, counts
+
+
+def seed_processes_pg(pool: 'ConnectionPool', processes: List[Dict[str, Any]], creator_id: str,
+                      convert: Callable[[Dict[str, Any], str], Dict[str, Any]],
+                      batch_size: int = 1000, concurrency: int = 1,
+                      journal: Optional[Any] = None) -> Dict[str, int]:
+    """
+    Insere processos direto no Postgres. `convert` é a conversão usada pelos
+    demais modos (convert_process_to_db_format). Com `concurrency` > 1, lotes
+    usam conexões distintas do pool em paralelo.
+    """
+    total = len(processes)
+    stats = {'total': total, 'success': 0, 'errors': 0, 'skipped': 0}
+
+    def batches() -> Iterator[Callable[[], Tuple[List[str], Dict[str, int]]]]:
+        seen = set()
+        for batch_start in range(0, total, batch_size):
+            batch = []
+            lines: List[str] = []
+            counts = {'success': 0, 'errors': 0, 'skipped': 0}
+            for i, process in enumerate(processes[batch_start:batch_start + batch_size], batch_start + 1):
+                try:
+                    db_data = convert(process, creator_id)
+                except Exception as e:
+                    lines.append(f"[{i}/{total}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
+                    counts['errors'] += 1
+                    continue
+                name = db_data['process']['name']
+                if name in seen:
+                    lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+                    counts['skipped'] += 1
+                    continue
+                seen.add(name)
+                batch.append((i, db_data))
+            yield partial(_seed_batch_pg, pool, batch, total, creator_id, lines, counts, journal)
+
+    for lines, counts in run_ordered(batches(), concurrency):
+        for line in lines:
+            print(line)
+        for key, value in counts.items():
+            stats[key] += value
+    return stats
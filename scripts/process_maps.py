@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Mapeamentos frontend → banco compartilhados pelos scripts de seed.
+"""
+
+# Mapeamento de categorias (frontend → banco)
+CATEGORY_MAP = {
+    "Governança": "governanca",
+    "Acesso e Segurança": "acesso_seguranca",
+    "Operação": "operacao",
+    "Áreas Comuns": "areas_comuns",
+    "Convivência": "convivencia",
+    "Eventos": "eventos",
+    "Emergências": "emergencias",
+}
+
+# Mapeamento de tipos de documento (frontend → banco)
+DOCUMENT_TYPE_MAP = {
+    "Manual": "manual",
+    "Regulamento": "regulamento",
+    "POP": "pop",
+    "Fluxograma": "fluxograma",
+    "Aviso": "aviso",
+    "Comunicado": "comunicado",
+    "Checklist": "checklist",
+    "Formulário": "formulario",
+    "Política": "politica",
+}
+
+# Mapeamento de status (frontend → banco)
+STATUS_MAP = {
+    "rascunho": "rascunho",
+    "em_revisao": "em_revisao",
+    "aprovado": "aprovado",
+    "rejeitado": "rejeitado",
+}
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Modelo compacto de processo (Process/RACIEntry com __slots__) e snapshot
+binário colunar do catálogo.
+
+Os scripts trocam processos como dicts aninhados, com as mesmas chaves
+('workflow', 'entities', 'raci', 'responsible', ...) repetidas em cada
+objeto. Aqui cada processo é um objeto com slots e as listas são tuplas.
+Strings repetidas (categoria, status, tipo de documento, nomes de entidades
+e papéis RACI) são internadas e compartilhadas por todos os processos.
+
+Snapshot (.vdfp): um cabeçalho, uma tabela de strings únicas (UTF-8
+separadas por '\\0', decodificada num único `decode` + `split`) e colunas
+`array` little-endian com ids de string, ou ponteiros no estilo CSR para as
+listas. A carga não cria um objeto por valor repetido: cada string única
+existe uma vez e é referenciada por todos os processos que a usam.
+
+`Process.to_db_format` produz o mesmo registro (e o mesmo content_hash) de
+seed_processes_to_supabase.convert_process_to_db_format, montado direto
+dos slots: as tuplas vão para o payload sem cópia em listas (o JSON é o
+mesmo).
+
+Uso:
+    python scripts/process_model.py snapshot --file frontend/src/data/processes.ts --output scripts/.cache/processes.vdfp
+    python scripts/process_model.py bench --file /tmp/processes_10k.ts
+    python scripts/seed_processes_to_supabase.py --file scripts/.cache/processes.vdfp --incremental
+"""
+
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mermaid_graph import diagram_fields
+from process_maps import CATEGORY_MAP, DOCUMENT_TYPE_MAP, STATUS_MAP
+from seed_manifest import compute_content_hash
+
+SNAPSHOT_SUFFIX = '.vdfp'
+SNAPSHOT_FORMAT = 1
+MAGIC = b'VDFPRC\x00' + bytes([SNAPSHOT_FORMAT])
+
+# magic, processos, linhas RACI, bytes da tabela de strings
+HEADER = struct.Struct('<8sIIQ')
+
+# Valor ausente (None) nas colunas de ids de string e na coluna de id
+NONE_STRING = 0xFFFFFFFF
+NONE_ID = -2 ** 63
+
+# Bits da coluna `missing`: listas ausentes no objeto (≠ lista vazia)
+MISSING_WORKFLOW, MISSING_ENTITIES, MISSING_VARIABLES, MISSING_RACI = 1, 2, 4, 8
+
+RACI_ROLES = ('responsible', 'accountable', 'consulted', 'informed')
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_all(values: Optional[Iterable[Any]]) -> Optional[Tuple[Any, ...]]:
+    return None if values is None else tuple(map(_intern, values))
+
+
+class RACIEntry:
+    """Linha da matriz RACI: passo e quem é R, A, C e I (tuplas de nomes internados)."""
+
+    __slots__ = ('step', 'responsible', 'accountable', 'consulted', 'informed')
+
+    def __init__(self, step: Optional[str], responsible: Optional[Tuple[str, ...]] = (),
+                 accountable: Optional[Tuple[str, ...]] = (), consulted: Optional[Tuple[str, ...]] = (),
+                 informed: Optional[Tuple[str, ...]] = ()):
+        self.step = step
+        self.responsible = responsible
+        self.accountable = accountable
+        self.consulted = consulted
+        self.informed = informed
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> 'RACIEntry':
+        return cls(entry.get('step'), *(_intern_all(entry.get(role)) for role in RACI_ROLES))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato do frontend (RACIEntry em types/raci.ts), com tuplas no lugar de listas."""
+        entry = {'step': self.step, 'responsible': self.responsible, 'accountable': self.accountable,
+                 'consulted': self.consulted, 'informed': self.informed}
+        if None in entry.values():
+            entry = {key: value for key, value in entry.items() if value is not None}
+        return entry
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RACIEntry) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"RACIEntry({self.step!r})"
+
+
+class Process:
+    """
+    Processo do catálogo. Campos ausentes no objeto de origem ficam None
+    (to_dict os omite); category, status e document_type são strings
+    internadas, comparáveis por identidade.
+    """
+
+    __slots__ = ('id', 'name', 'category', 'status', 'document_type', 'description',
+                 'workflow', 'entities', 'variables', 'mermaid_diagram', 'raci')
+
+    # Chave do objeto do frontend → slot
+    FIELDS = (('id', 'id'), ('name', 'name'), ('category', 'category'), ('status', 'status'),
+              ('documentType', 'document_type'), ('description', 'description'),
+              ('workflow', 'workflow'), ('entities', 'entities'), ('variables', 'variables'),
+              ('mermaid_diagram', 'mermaid_diagram'), ('raci', 'raci'))
+    _SLOT_BY_KEY = dict(FIELDS)
+
+    def __init__(self, id: Optional[int] = None, name: Optional[str] = None, category: Optional[str] = None,
+                 status: Optional[str] = None, document_type: Optional[str] = None,
+                 description: Optional[str] = None, workflow: Optional[Tuple[str, ...]] = None,
+                 entities: Optional[Tuple[str, ...]] = None, variables: Optional[Tuple[str, ...]] = None,
+                 mermaid_diagram: Optional[str] = None, raci: Optional[Tuple[RACIEntry, ...]] = None):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.status = status
+        self.document_type = document_type
+        self.description = description
+        self.workflow = workflow
+        self.entities = entities
+        self.variables = variables
+        self.mermaid_diagram = mermaid_diagram
+        self.raci = raci
+
+    @classmethod
+    def from_dict(cls, process: Dict[str, Any]) -> 'Process':
+        """A partir do dict de ts_parser/catalog_cache (chaves fora de FIELDS são descartadas)."""
+        raci = process.get('raci')
+        return cls(
+            process.get('id'),
+            process.get('name'),
+            _intern(process.get('category')),
+            _intern(process.get('status')),
+            _intern(process.get('documentType')),
+            process.get('description'),
+            _intern_all(process.get('workflow')),
+            _intern_all(process.get('entities')),
+            _intern_all(process.get('variables')),
+            process.get('mermaid_diagram'),
+            None if raci is None else tuple(RACIEntry.from_dict(entry) for entry in raci),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        process: Dict[str, Any] = {}
+        for key, slot in self.FIELDS:
+            value = getattr(self, slot)
+            if value is None:
+                continue
+            if slot == 'raci':
+                value = [{key: list(role) if isinstance(role, tuple) else role
+                          for key, role in entry.to_dict().items()} for entry in value]
+            elif isinstance(value, tuple):
+                value = list(value)
+            process[key] = value
+        return process
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Leitura com as chaves do dict do frontend, para o código que recebe os dois formatos."""
+        slot = self._SLOT_BY_KEY.get(key)
+        value = getattr(self, slot) if slot else None
+        return default if value is None else value
+
+    def to_db_format(self, creator_id: str, diagram: bool = True) -> Dict[str, Any]:
+        """Mesmo registro de convert_process_to_db_format, sem passar pelo dict do frontend."""
+        category = CATEGORY_MAP.get(self.category or '', 'governanca')
+        document_type = DOCUMENT_TYPE_MAP.get(self.document_type or 'Manual', 'manual')
+        status = STATUS_MAP.get(self.status or 'rascunho', 'rascunho')
+        description = self.description if self.description is not None else ''
+        variables = self.variables if self.variables is not None else ()
+        entities = self.entities if self.entities is not None else ()
+
+        content: Dict[str, Any] = {
+            'description': description,
+            'workflow': self.workflow if self.workflow is not None else (),
+            'entities': entities,
+            'variables': variables,
+        }
+        if self.mermaid_diagram:
+            content['mermaid_diagram'] = self.mermaid_diagram
+            if diagram:
+                content.update(diagram_fields(self.name or '', self.mermaid_diagram))
+        if self.raci:
+            content['raci'] = [entry.to_dict() for entry in self.raci]
+
+        db_data = {
+            'process': {
+                'name': self.name or '',
+                'category': category,
+                'subcategory': None,
+                'document_type': document_type,
+                'status': status,
+                'creator_id': creator_id,
+            },
+            'version': {
+                'content': content,
+                'content_text': description,
+                'entities_involved': entities,
+                'variables_applied': dict.fromkeys(variables),
+                'created_by': creator_id,
+                'status': status,
+            },
+        }
+        db_data['process']['content_hash'] = compute_content_hash(db_data)
+        return db_data
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Process) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Process({self.id!r}, {self.name!r})"
+
+
+# ---- snapshot ----
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_STRING
+        if type(value) is not str:
+            raise ValueError(f"Valor não suportado no snapshot: {value!r}")
+        found = self.ids.get(value)
+        if found is None:
+            if '\0' in value:
+                raise ValueError(f"String com '\\0' não suportada no snapshot: {value[:40]!r}")
+            found = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return found
+
+
+def _add_list(strings: _StringTable, values: Optional[Iterable[str]], ptr: array, column: array) -> bool:
+    """Acrescenta uma lista ao par (ponteiros, valores); devolve True se ela estava ausente."""
+    if values is not None:
+        column.extend(strings.add(value) for value in values)
+    ptr.append(len(column))
+    return values is None
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == 'big' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+# Ordem das colunas no arquivo: (nome, typecode)
+COLUMNS = (
+    ('id', 'q'), ('name', 'I'), ('category', 'I'), ('status', 'I'), ('document_type', 'I'),
+    ('description', 'I'), ('mermaid_diagram', 'I'), ('missing', 'B'),
+    ('workflow_ptr', 'I'), ('workflow', 'I'), ('entities_ptr', 'I'), ('entities', 'I'),
+    ('variables_ptr', 'I'), ('variables', 'I'), ('raci_ptr', 'I'), ('raci_step', 'I'), ('raci_missing', 'B'),
+) + tuple(column for role in RACI_ROLES for column in ((f'{role}_ptr', 'I'), (role, 'I')))
+
+
+def write_snapshot(processes: Iterable[Any], path: str) -> int:
+    """Grava o snapshot colunar (atômico); aceita Process ou dicts. Devolve o número de processos."""
+    strings = _StringTable()
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    for name in ('workflow_ptr', 'entities_ptr', 'variables_ptr', 'raci_ptr') + tuple(
+            f'{role}_ptr' for role in RACI_ROLES):
+        columns[name].append(0)
+
+    count = 0
+    for process in processes:
+        if not isinstance(process, Process):
+            process = Process.from_dict(process)
+        count += 1
+        columns['id'].append(NONE_ID if process.id is None else process.id)
+        for slot in ('name', 'category', 'status', 'document_type', 'description', 'mermaid_diagram'):
+            columns[slot].append(strings.add(getattr(process, slot)))
+        missing = 0
+        for slot, bit in (('workflow', MISSING_WORKFLOW), ('entities', MISSING_ENTITIES),
+                          ('variables', MISSING_VARIABLES)):
+            if _add_list(strings, getattr(process, slot), columns[f'{slot}_ptr'], columns[slot]):
+                missing |= bit
+        if process.raci is None:
+            missing |= MISSING_RACI
+        for entry in process.raci or ():
+            columns['raci_step'].append(strings.add(entry.step))
+            missing_roles = 0
+            for bit, role in enumerate(RACI_ROLES):
+                if _add_list(strings, getattr(entry, role), columns[f'{role}_ptr'], columns[role]):
+                    missing_roles |= 1 << bit
+            columns['raci_missing'].append(missing_roles)
+        columns['raci_ptr'].append(len(columns['raci_step']))
+        columns['missing'].append(missing)
+
+    blob = '\0'.join(strings.values).encode('utf-8')
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, count, len(columns['raci_step']), len(blob)))
+        f.write(struct.pack('<I', len(strings.values)))
+        f.write(blob)
+        for name, _ in COLUMNS:
+            data = _little_endian(columns[name])
+            f.write(struct.pack('<Q', len(data)))
+            f.write(data)
+    os.replace(tmp_path, path)
+    return count
+
+
+def _read_columns(view: memoryview) -> Tuple[int, int, List[str], Dict[str, array]]:
+    magic, count, raci_rows, blob_size = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo não é um snapshot de processos (ou formato incompatível)")
+    offset = HEADER.size
+    (string_count,) = struct.unpack_from('<I', view, offset)
+    offset += 4
+    strings = str(view[offset:offset + blob_size], 'utf-8').split('\0') if string_count else []
+    offset += blob_size
+    columns: Dict[str, array] = {}
+    for name, typecode in COLUMNS:
+        (size,) = struct.unpack_from('<Q', view, offset)
+        offset += 8
+        column = array(typecode)
+        column.frombytes(view[offset:offset + size])
+        if sys.byteorder == 'big' and column.itemsize > 1:
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    return count, raci_rows, strings, columns
+
+
+def read_snapshot(path: str) -> List[Process]:
+    """Carrega o snapshot: uma string por valor único, tuplas fatiadas das colunas resolvidas."""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                count, _, strings, columns = _read_columns(view)
+            finally:
+                view.release()
+
+    def resolve(name: str) -> List[Optional[str]]:
+        return [strings[i] if i != NONE_STRING else None for i in columns[name]]
+
+    scalars = {slot: resolve(slot) for slot in ('name', 'category', 'status', 'document_type',
+                                                'description', 'mermaid_diagram')}
+    lists = {slot: (columns[f'{slot}_ptr'], resolve(slot)) for slot in ('workflow', 'entities', 'variables')}
+    raci_ptr, steps, raci_missing = columns['raci_ptr'], resolve('raci_step'), columns['raci_missing']
+    roles = [(1 << bit, columns[f'{role}_ptr'], resolve(role)) for bit, role in enumerate(RACI_ROLES)]
+    raci_rows = [
+        RACIEntry(steps[row], *(None if raci_missing[row] & bit else tuple(values[ptr[row]:ptr[row + 1]])
+                                for bit, ptr, values in roles))
+        for row in range(len(steps))
+    ]
+
+    ids, missing = columns['id'], columns['missing']
+    processes: List[Process] = []
+    for i in range(count):
+        flags = missing[i]
+        process_lists = [
+            None if flags & bit else tuple(values[ptr[i]:ptr[i + 1]])
+            for (ptr, values), bit in zip(lists.values(), (MISSING_WORKFLOW, MISSING_ENTITIES, MISSING_VARIABLES))
+        ]
+        processes.append(Process(
+            None if ids[i] == NONE_ID else ids[i],
+            scalars['name'][i], scalars['category'][i], scalars['status'][i], scalars['document_type'][i],
+            scalars['description'][i], *process_lists, scalars['mermaid_diagram'][i],
+            None if flags & MISSING_RACI else tuple(raci_rows[raci_ptr[i]:raci_ptr[i + 1]]),
+        ))
+    return processes
+
+
+def is_snapshot(path: str) -> bool:
+    return path.lower().endswith(SNAPSHOT_SUFFIX)
+
+
+# ---- benchmark ----
+
+def _measure(load: Any, repeat: int) -> Tuple[Any, float, int]:
+    """
+    (resultado, melhor tempo em segundos, bytes mantidos) de `load()`. O
+    tempo é medido sem tracemalloc (que deixa cada alocação bem mais cara);
+    a memória numa execução à parte.
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = load()
+        seconds = min(seconds, time.perf_counter() - start)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, retained
+
+
+def run_bench(source: str, snapshot_path: str, repeat: int = 3) -> Dict[str, Any]:
+    """Memória por processo e tempo de carga/conversão: dicts (cache marshal, JSON) x modelo (snapshot)."""
+    from catalog_cache import _read_snapshot, default_cache_path, load_catalog
+
+    dicts = load_catalog(source)  # garante o snapshot marshal do catalog_cache
+    cache_path = default_cache_path(source)
+    json_path = snapshot_path + '.json'
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(dicts, f, ensure_ascii=False)
+    write_snapshot(dicts, snapshot_path)
+
+    def load_json() -> Any:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    marshal_dicts, marshal_seconds, marshal_bytes = _measure(lambda: _read_snapshot(cache_path), repeat)
+    _, json_seconds, json_bytes = _measure(load_json, repeat)
+    models, model_seconds, model_bytes = _measure(lambda: read_snapshot(snapshot_path), repeat)
+    os.remove(json_path)
+
+    count = len(models) or 1
+    # Conversão sem diagramas: mede a montagem do payload, não o compilador mermaid
+    stripped_dicts = [{**process, 'mermaid_diagram': None} for process in marshal_dicts]
+    stripped_models = [Process.from_dict(process) for process in stripped_dicts]
+    from seed_processes_to_supabase import convert_process_to_db_format
+    dict_payloads, dict_convert, _ = _measure(
+        lambda: [convert_process_to_db_format(process, 'creator') for process in stripped_dicts], repeat)
+    model_payloads, model_convert, _ = _measure(
+        lambda: [process.to_db_format('creator') for process in stripped_models], repeat)
+    same_hash = all(a['process']['content_hash'] == b['process']['content_hash']
+                    for a, b in zip(dict_payloads, model_payloads))
+    roundtrip = all(Process.from_dict(process) == model for process, model in zip(marshal_dicts, models))
+
+    return {
+        'processes': len(models),
+        'file_bytes': {'marshal': os.path.getsize(cache_path), 'snapshot': os.path.getsize(snapshot_path)},
+        'bytes_per_process': {
+            'dict (marshal)': marshal_bytes // count,
+            'dict (json)': json_bytes // count,
+            'model (snapshot)': model_bytes // count,
+        },
+        'load_ms': {
+            'dict (marshal)': round(marshal_seconds * 1000, 2),
+            'dict (json)': round(json_seconds * 1000, 2),
+            'model (snapshot)': round(model_seconds * 1000, 2),
+        },
+        'convert_ms': {'dict': round(dict_convert * 1000, 2), 'model': round(model_convert * 1000, 2)},
+        'same_content_hash': same_hash,
+        'roundtrip': roundtrip,
+    }
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Modelo compacto de processos e snapshot binário')
+    sub = parser.add_subparsers(dest='command', required=True)
+    snapshot = sub.add_parser('snapshot', help='Gravar o snapshot colunar do catálogo')
+    bench = sub.add_parser('bench', help='Memória e tempo de carga: dicts x modelo')
+    for command in (snapshot, bench):
+        command.add_argument('--file', default='frontend/src/data/processes.ts', help='Catálogo de processos')
+    snapshot.add_argument('--output', default='scripts/.cache/processes.vdfp')
+    bench.add_argument('--snapshot', default='/tmp/processes_bench.vdfp', help='Snapshot temporário do benchmark')
+    bench.add_argument('--repeat', type=int, default=3)
+    bench.add_argument('--output', help='Salvar o relatório em JSON')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        from catalog_cache import load_catalog
+        start = time.perf_counter()
+        count = write_snapshot(load_catalog(args.file), args.output)
+        print(f"💾 {count} processos → {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB, "
+              f"{time.perf_counter() - start:.2f}s)")
+        return
+
+    report = run_bench(args.file, args.snapshot, args.repeat)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Relatório salvo em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Quantização dos embeddings de knowledge_base_documents: mede quanto espaço
+cada representação economiza e quanto de recall perde em relação ao
+vector(1536) em float32, e gera a migration da representação escolhida.
+
+Representações avaliadas:
+    float32  baseline (vector): 4 bytes por dimensão
+    float16  halfvec do pgvector: 2 bytes por dimensão
+    int8     escalar simétrico por vetor (código int8 + escala float32);
+             só offline: o pgvector não tem tipo int8
+    binary   1 bit por dimensão (sinal, binary_quantize do pgvector), busca
+             por Hamming e re-ranqueamento dos `rescore * k` candidatos com
+             o vetor float16
+
+Recall@k é a fração do top-k exato (float32) recuperada; a latência é a do
+NumPy nesta máquina, útil para comparar as representações entre si. O erro
+máximo de similaridade indica quanto o `match_threshold` pode oscilar.
+
+Uso:
+    python scripts/quantize_embeddings.py bench --input scripts/kb_export.jsonl
+    python scripts/quantize_embeddings.py bench --synthetic 100000 --k 10 --rescore 4,16,32 --output /tmp/quant.json
+    python scripts/quantize_embeddings.py quantize --input scripts/kb_export.jsonl --representation int8 --output /tmp/kb_int8.npz
+    python scripts/quantize_embeddings.py migration --representation halfvec
+    python scripts/quantize_embeddings.py migration --representation binary --rescore 16
+
+Requisitos:
+    pip install numpy
+    pgvector >= 0.7.0 no banco (halfvec, binary_quantize) para as migrations
+"""
+
+import datetime
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from vector_search import VectorSearch, percentile, require_numpy, synthetic_index
+
+REPRESENTATIONS = ('float32', 'float16', 'int8', 'binary')
+MIGRATIONS_DIR = 'supabase/migrations'
+DEFAULT_RESCORE = 16
+
+# Limite do hnsw.ef_search no pgvector: um scan HNSW devolve no máximo
+# ef_search linhas, então ele limita os candidatos do re-ranqueamento binário
+HNSW_MAX_EF_SEARCH = 1000
+
+# Linhas por bloco nas buscas (limita a cópia temporária em float32)
+BLOCK_ROWS = 65_536
+
+
+def _popcount_table() -> 'np.ndarray':
+    return np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+class QuantizedIndex:
+    """Vetores (já normalizados) numa representação; `search` devolve o top-k estimado."""
+
+    def __init__(self, representation: str, matrix: 'np.ndarray', rescore: int = DEFAULT_RESCORE):
+        self.representation = representation
+        self.rescore = rescore
+        self.count, self.dimensions = matrix.shape
+        self.scales: Optional['np.ndarray'] = None
+        self.bits: Optional['np.ndarray'] = None
+        self._popcount = None
+        if representation == 'float32':
+            self.codes = np.ascontiguousarray(matrix, dtype=np.float32)
+        elif representation == 'float16':
+            self.codes = matrix.astype(np.float16)
+        elif representation == 'int8':
+            scales = np.abs(matrix).max(axis=1)
+            scales[scales == 0] = 1.0
+            self.codes = np.round(matrix / scales[:, None] * 127).astype(np.int8)
+            self.scales = (scales / 127).astype(np.float32)
+        elif representation == 'binary':
+            # Bits para o Hamming + float16 para o re-ranqueamento (como halfvec + binary_quantize)
+            self.bits = np.packbits(matrix > 0, axis=1)
+            self.codes = matrix.astype(np.float16)
+            if not hasattr(np, 'bitwise_count'):
+                self._popcount = _popcount_table()
+        else:
+            raise ValueError(f"Representação desconhecida: {representation}")
+
+    def bytes_per_vector(self) -> float:
+        """Bytes da representação armazenada (binary: só os bits; o halfvec de re-rank é à parte)."""
+        if self.representation == 'binary':
+            return self.bits.shape[1]
+        extra = 4 if self.scales is not None else 0
+        return self.codes.itemsize * self.dimensions + extra
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.codes, self.scales, self.bits) if array is not None)
+
+    def scores(self, query: 'np.ndarray', rows: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """Similaridade de cosseno estimada (todas as linhas ou só `rows`)."""
+        codes = self.codes if rows is None else self.codes[rows]
+        if self.representation == 'float32':
+            return codes @ query
+        result = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), BLOCK_ROWS):
+            block = codes[start:start + BLOCK_ROWS].astype(np.float32)
+            result[start:start + BLOCK_ROWS] = block @ query
+        if self.scales is not None:
+            result *= self.scales if rows is None else self.scales[rows]
+        return result
+
+    def hamming(self, query: 'np.ndarray') -> 'np.ndarray':
+        query_bits = np.packbits(query > 0)
+        distances = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, BLOCK_ROWS):
+            xor = np.bitwise_xor(self.bits[start:start + BLOCK_ROWS], query_bits)
+            counts = np.bitwise_count(xor) if self._popcount is None else self._popcount[xor]
+            distances[start:start + BLOCK_ROWS] = counts.sum(axis=1, dtype=np.int32)
+        return distances
+
+    def search(self, query: 'np.ndarray', k: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """(linhas, similaridades estimadas) do top-k, melhores primeiro."""
+        if self.representation == 'binary':
+            candidates_count = min(self.count, k * self.rescore)
+            distances = self.hamming(query)
+            candidates = np.argpartition(distances, candidates_count - 1)[:candidates_count]
+            scores = self.scores(query, candidates)
+            top = np.argsort(-scores, kind='stable')[:k]
+            return candidates[top], scores[top]
+        scores = self.scores(query)
+        k = min(k, self.count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return top, scores[top]
+
+
+def benchmark(matrix: 'np.ndarray', queries: 'np.ndarray', k: int = 10,
+              rescores: Tuple[int, ...] = (DEFAULT_RESCORE,)) -> Dict[str, Any]:
+    """
+    Tamanho, recall@k contra o float32 exato, latência e erro de similaridade
+    de cada representação (binary uma vez por fator de re-ranqueamento, como
+    `binary_x4`). Empates contam: um resultado acerta se a similaridade exata
+    dele alcança a do k-ésimo exato.
+    """
+    exact = []
+    for query in queries:
+        scores = matrix @ query
+        kth = np.partition(-scores, min(k, len(scores)) - 1)[min(k, len(scores)) - 1]
+        exact.append((scores, -kth - 1e-6))
+    variants = [(name, name, DEFAULT_RESCORE) for name in REPRESENTATIONS[:-1]]
+    variants += [(f'binary_x{rescore}', 'binary', rescore) for rescore in rescores]
+    report: Dict[str, Any] = {'rows': len(matrix), 'dimensions': matrix.shape[1], 'queries': len(queries),
+                              'k': k, 'variants': [name for name, _, _ in variants]}
+    baseline_bytes = None
+    for name, representation, rescore in variants:
+        start = time.perf_counter()
+        index = QuantizedIndex(representation, matrix, rescore)
+        build_seconds = time.perf_counter() - start
+        latencies: List[float] = []
+        recalls: List[float] = []
+        errors: List[float] = []
+        for query, (exact_scores, kth) in zip(queries, exact):
+            start = time.perf_counter()
+            rows, scores = index.search(query, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(float((exact_scores[rows] >= kth).sum()) / min(k, len(matrix)))
+            errors.append(float(np.abs(scores - exact_scores[rows]).max()) if len(rows) else 0.0)
+        bytes_per_vector = index.bytes_per_vector()
+        baseline_bytes = baseline_bytes or bytes_per_vector
+        report[name] = {
+            'bytes_per_vector': bytes_per_vector,
+            'compression': round(baseline_bytes / bytes_per_vector, 2),
+            'vectors_per_gb': int(1024 ** 3 // bytes_per_vector),
+            'memory_mb': round(index.nbytes() / 1024 ** 2, 2),
+            'build_seconds': round(build_seconds, 3),
+            f'recall@{k}': round(sum(recalls) / len(recalls), 4) if recalls else None,
+            'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 3) if latencies else None,
+            'max_similarity_error': round(max(errors), 5) if errors else None,
+        }
+    return report
+
+
+# ---- migration ----
+
+def next_migration_path(slug: str, directory: str = MIGRATIONS_DIR) -> str:
+    """Próximo número livre em supabase/migrations (NNN_slug.sql)."""
+    numbers = [int(match.group(1)) for name in os.listdir(directory)
+               if (match := re.match(r'(\d{3})_', name))]
+    return os.path.join(directory, f"{max(numbers, default=0) + 1:03d}_{slug}.sql")
+
+
+def _search_functions_sql(dimensions: int, rescore: Optional[int]) -> str:
+    """
+    search_knowledge_base, search_knowledge_base_hybrid e find_related_processes
+    (versões da migration 043) sobre a coluna halfvec, mais a sobrecarga com
+    pesos de search_knowledge_base_hybrid (7 argumentos, migration 016), que
+    sem o cast compararia halfvec com vector. Os parâmetros continuam
+    vector(dimensions): os clientes (edge functions, frontend) não mudam.
+    """
+    half = f'halfvec({dimensions})'
+    query = f'query_embedding::{half}'
+    ef_search = ''
+    if rescore:
+        # O scan do índice binário para em hnsw.ef_search linhas (padrão 40):
+        # sem subir o valor, o LIMIT match_count * rescore não tem efeito. O
+        # SET gravado na função por vector_index.apply_search_setting já vale
+        # na entrada e é lido por current_setting: fica o maior dos dois.
+        ef_search = f"""  -- Candidatos do re-ranqueamento: o scan HNSW devolve no máximo hnsw.ef_search linhas
+  PERFORM set_config('hnsw.ef_search', LEAST({HNSW_MAX_EF_SEARCH}, GREATEST(
+    40, COALESCE(current_setting('hnsw.ef_search', true)::INT, 0), match_count * {rescore}))::TEXT, true);
+"""
+        # Candidatos pelo índice binário (Hamming), re-ranqueados pelo cosseno do halfvec
+        vector_search = f"""  WITH candidates AS (
+    SELECT kb.id
+    FROM knowledge_base_documents kb
+    WHERE kb.embedding IS NOT NULL
+    ORDER BY binary_quantize(kb.embedding)::bit({dimensions}) <~> binary_quantize({query})::bit({dimensions})
+    LIMIT match_count * {rescore}
+  )
+  SELECT
+    kb.id,
+    kb.process_id,
+    kb.process_version_id,
+    kb.chunk_index,
+    kb.chunk_type,
+    kb.content,
+    kb.metadata,
+    1 - (kb.embedding <=> {query}) AS similarity,
+    p.name AS process_name,
+    p.category::TEXT AS process_category
+  FROM candidates c
+  JOIN knowledge_base_documents kb ON kb.id = c.id
+  JOIN process_versions pv ON pv.id = kb.process_version_id
+  JOIN processes p ON p.id = kb.process_id
+  WHERE 1 - (kb.embedding <=> {query}) > match_threshold
+    AND p.status = 'aprovado'
+  ORDER BY kb.embedding <=> {query}
+  LIMIT match_count"""
+    else:
+        vector_search = f"""  SELECT
+    kb.id,
+    kb.process_id,
+    kb.process_version_id,
+    kb.chunk_index,
+    kb.chunk_type,
+    kb.content,
+    kb.metadata,
+    1 - (kb.embedding <=> {query}) AS similarity,
+    p.name AS process_name,
+    p.category::TEXT AS process_category
+  FROM knowledge_base_documents kb
+  JOIN process_versions pv ON pv.id = kb.process_version_id
+  JOIN processes p ON p.id = kb.process_id
+  WHERE kb.embedding IS NOT NULL
+    AND 1 - (kb.embedding <=> {query}) > match_threshold
+    AND p.status = 'aprovado'
+  ORDER BY kb.embedding <=> {query}
+  LIMIT match_count"""
+    indented = '\n'.join(('  ' + line) if line else line for line in vector_search.splitlines())
+
+    return f"""-- Função: search_knowledge_base
+CREATE OR REPLACE FUNCTION search_knowledge_base(
+  query_embedding vector({dimensions}),
+  match_threshold FLOAT DEFAULT 0.7,
+  match_count INT DEFAULT 10,
+  filter_metadata JSONB DEFAULT '{{}}'::jsonb
+)
+RETURNS TABLE (
+  id UUID,
+  process_id UUID,
+  process_version_id UUID,
+  chunk_index INTEGER,
+  chunk_type VARCHAR(50),
+  content TEXT,
+  metadata JSONB,
+  similarity FLOAT,
+  process_name TEXT,
+  process_category TEXT
+)
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+{ef_search}  RETURN QUERY
+{vector_search};
+END;
+$$;
+
+-- Função: search_knowledge_base_hybrid
+CREATE OR REPLACE FUNCTION search_knowledge_base_hybrid(
+  query_embedding vector({dimensions}),
+  query_text TEXT,
+  match_threshold FLOAT DEFAULT 0.7,
+  match_count INT DEFAULT 10,
+  filter_metadata JSONB DEFAULT '{{}}'::jsonb
+)
+RETURNS TABLE (
+  id UUID,
+  process_id UUID,
+  process_version_id UUID,
+  chunk_index INTEGER,
+  chunk_type VARCHAR(50),
+  content TEXT,
+  metadata JSONB,
+  similarity FLOAT,
+  process_name TEXT,
+  process_category TEXT
+)
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  vector_results RECORD;
+  text_results RECORD;
+BEGIN
+{ef_search}  -- Busca vetorial
+  FOR vector_results IN
+{indented}
+  LOOP
+    RETURN NEXT vector_results;
+  END LOOP;
+
+  -- Busca full-text (se não encontrou resultados suficientes)
+  IF NOT FOUND OR (SELECT COUNT(*) FROM knowledge_base_documents) < match_count THEN
+    FOR text_results IN
+      SELECT
+        kb.id,
+        kb.process_id,
+        kb.process_version_id,
+        kb.chunk_index,
+        kb.chunk_type,
+        kb.content,
+        kb.metadata,
+        0.5 AS similarity, -- Similaridade fixa para busca textual
+        p.name AS process_name,
+        p.category::TEXT AS process_category
+      FROM knowledge_base_documents kb
+      JOIN process_versions pv ON pv.id = kb.process_version_id
+      JOIN processes p ON p.id = kb.process_id
+      WHERE kb.content ILIKE '%' || query_text || '%'
+        AND p.status = 'aprovado'
+        AND kb.id NOT IN (SELECT id FROM (SELECT kb2.id FROM knowledge_base_documents kb2 WHERE kb2.embedding IS NOT NULL AND 1 - (kb2.embedding <=> {query}) > match_threshold LIMIT match_count) sub)
+      LIMIT match_count
+    LOOP
+      RETURN NEXT text_results;
+    END LOOP;
+  END IF;
+END;
+$$;
+
+-- Função: search_knowledge_base_hybrid (sobrecarga com pesos, migration 016)
+CREATE OR REPLACE FUNCTION search_knowledge_base_hybrid(
+  query_embedding vector({dimensions}),
+  query_text TEXT,
+  match_threshold FLOAT DEFAULT 0.7,
+  match_count INT DEFAULT 10,
+  filter_metadata JSONB DEFAULT '{{}}'::jsonb,
+  vector_weight FLOAT DEFAULT 0.7,
+  text_weight FLOAT DEFAULT 0.3
+)
+RETURNS TABLE (
+  id UUID,
+  process_id UUID,
+  process_version_id UUID,
+  chunk_index INTEGER,
+  chunk_type VARCHAR(50),
+  content TEXT,
+  metadata JSONB,
+  similarity FLOAT,
+  text_rank FLOAT,
+  combined_score FLOAT,
+  process_name TEXT,
+  process_category TEXT
+)
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    kb.id,
+    kb.process_id,
+    kb.process_version_id,
+    kb.chunk_index,
+    kb.chunk_type,
+    kb.content,
+    kb.metadata,
+    -- Similaridade vetorial
+    (1 - (kb.embedding <=> {query})) AS similarity,
+    -- Rank de busca full-text
+    ts_rank(to_tsvector('portuguese', kb.content), plainto_tsquery('portuguese', query_text)) AS text_rank,
+    -- Score combinado
+    (
+      (1 - (kb.embedding <=> {query})) * vector_weight +
+      ts_rank(to_tsvector('portuguese', kb.content), plainto_tsquery('portuguese', query_text)) * text_weight
+    ) AS combined_score,
+    p.name AS process_name,
+    p.category::TEXT AS process_category
+  FROM knowledge_base_documents kb
+  INNER JOIN processes p ON p.id = kb.process_id
+  WHERE
+    kb.embedding IS NOT NULL
+    AND (
+      -- Similaridade vetorial acima do threshold
+      (1 - (kb.embedding <=> {query})) >= match_threshold
+      OR
+      -- OU match de texto relevante
+      to_tsvector('portuguese', kb.content) @@ plainto_tsquery('portuguese', query_text)
+    )
+    AND (filter_metadata = '{{}}'::jsonb OR kb.metadata @> filter_metadata)
+    AND p.status = 'aprovado'
+  ORDER BY combined_score DESC
+  LIMIT match_count;
+END;
+$$;
+
+-- Função: find_related_processes
+CREATE OR REPLACE FUNCTION find_related_processes(
+  p_process_id UUID,
+  p_limit INT DEFAULT 5
+)
+RETURNS TABLE (
+  id UUID,
+  name TEXT,
+  category TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_process_embedding {half};
+BEGIN
+  -- Buscar embedding do processo
+  SELECT AVG(kb.embedding) INTO v_process_embedding
+  FROM knowledge_base_documents kb
+  JOIN process_versions pv ON pv.id = kb.process_version_id
+  WHERE pv.process_id = p_process_id
+    AND kb.embedding IS NOT NULL;
+
+  IF v_process_embedding IS NULL THEN
+    RETURN;
+  END IF;
+
+  -- Buscar processos similares
+  RETURN QUERY
+  SELECT DISTINCT
+    p.id,
+    p.name,
+    p.category::TEXT,
+    1 - (AVG(kb2.embedding) <=> v_process_embedding) AS similarity
+  FROM processes p
+  JOIN process_versions pv2 ON pv2.process_id = p.id
+  JOIN knowledge_base_documents kb2 ON kb2.process_version_id = pv2.id
+  WHERE p.id != p_process_id
+    AND p.status = 'aprovado'
+    AND kb2.embedding IS NOT NULL
+  GROUP BY p.id, p.name, p.category
+  ORDER BY similarity DESC
+  LIMIT p_limit;
+END;
+$$;
+"""
+
+
+def migration_sql(representation: str, dimensions: int = 1536, rescore: int = DEFAULT_RESCORE,
+                  report: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Migration que converte knowledge_base_documents.embedding para halfvec
+    e, com `binary`, cria o índice HNSW sobre binary_quantize(embedding) e
+    faz as buscas re-ranquearem `rescore * match_count` candidatos.
+    """
+    if representation not in ('halfvec', 'binary'):
+        raise ValueError("Migrations disponíveis: halfvec, binary (int8 não tem tipo no pgvector)")
+    half = f'halfvec({dimensions})'
+    title = 'Embeddings em halfvec (float16)' if representation == 'halfvec' else \
+        'Embeddings em halfvec com índice binário e re-ranqueamento'
+    lines = [
+        f"-- Migration: {title}",
+        "-- Descrição: Gerada por scripts/quantize_embeddings.py. knowledge_base_documents.embedding",
+        f"--            passa de vector({dimensions}) para {half} (metade do espaço por chunk)",
+        f"-- Data: {datetime.date.today().isoformat()}",
+        "-- Requer pgvector >= 0.7.0",
+    ]
+    if report:
+        chosen = report.get(f'binary_x{rescore}' if representation == 'binary' else 'float16') or {}
+        recall = next((value for key, value in chosen.items() if key.startswith('recall@')), None)
+        lines.append(f"-- Benchmark: {report.get('rows')} vetores, recall@{report.get('k')} = {recall}, "
+                     f"{chosen.get('bytes_per_vector')} bytes/vetor")
+    lines += [
+        "",
+        "-- Índices vetoriais sobre a coluna precisam ser recriados para o novo tipo",
+        "DROP INDEX IF EXISTS idx_kb_docs_embedding;",
+        "",
+        "ALTER TABLE knowledge_base_documents",
+        f"  ALTER COLUMN embedding TYPE {half} USING embedding::{half};",
+        "",
+        f"COMMENT ON COLUMN knowledge_base_documents.embedding IS 'Embedding em {half} (float16)';",
+        "",
+    ]
+    if representation == 'binary':
+        lines += [
+            "-- Índice HNSW sobre o sinal de cada dimensão (1 bit por dimensão, distância de Hamming)",
+            "CREATE INDEX IF NOT EXISTS idx_kb_docs_embedding_binary ON knowledge_base_documents",
+            f"USING hnsw ((binary_quantize(embedding)::bit({dimensions})) bit_hamming_ops);",
+            "",
+        ]
+    lines.append(_search_functions_sql(dimensions, rescore if representation == 'binary' else None))
+    return '\n'.join(lines)
+
+
+# ---- entrada ----
+
+def load_matrix(args: Any) -> 'np.ndarray':
+    if args.input:
+        return VectorSearch.from_export(args.input).matrix
+    return synthetic_index(args.synthetic, args.dim).matrix
+
+
+def sample_queries(matrix: 'np.ndarray', count: int, seed: int = 1) -> 'np.ndarray':
+    """Consultas próximas de linhas existentes (linha + ruído), normalizadas."""
+    rng = np.random.default_rng(seed)
+    queries = matrix[rng.choice(len(matrix), size=min(count, len(matrix)), replace=False)]
+    queries = queries + 0.3 * rng.standard_normal(queries.shape, dtype=np.float32) / np.sqrt(queries.shape[1])
+    return (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Quantização de embeddings: tamanho x recall e migration')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bench = sub.add_parser('bench', help='Recall@k, latência e tamanho de cada representação')
+    quantize = sub.add_parser('quantize', help='Gravar uma representação quantizada (NPZ)')
+    for command in (bench, quantize):
+        command.add_argument('--input', help='Exportação NDJSON (vector_search.py export)')
+        command.add_argument('--synthetic', type=int, default=10_000, help='Vetores sintéticos (sem --input)')
+        command.add_argument('--dim', type=int, default=1536, help='Dimensão dos vetores sintéticos')
+    bench.add_argument('--queries', type=int, default=100)
+    bench.add_argument('--k', type=int, default=10)
+    bench.add_argument('--rescore', default='4,16,64',
+                       help='Fatores de re-ranqueamento binário a comparar (candidatos por resultado)')
+    bench.add_argument('--output', help='Salvar o relatório em JSON')
+    quantize.add_argument('--representation', choices=REPRESENTATIONS[1:], required=True)
+    quantize.add_argument('--output', required=True, help='Arquivo .npz')
+
+    migration = sub.add_parser('migration', help='Gerar a migration da representação escolhida')
+    migration.add_argument('--representation', choices=['halfvec', 'binary'], required=True)
+    migration.add_argument('--dim', type=int, default=1536)
+    migration.add_argument('--rescore', type=int, default=DEFAULT_RESCORE)
+    migration.add_argument('--report', help='Relatório do bench (JSON) para registrar no cabeçalho')
+    migration.add_argument('--output', help='Arquivo da migration (padrão: próximo número em supabase/migrations)')
+
+    args = parser.parse_args()
+
+    if args.command == 'migration':
+        report = None
+        if args.report:
+            with open(args.report, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        slug = 'halfvec_embeddings' if args.representation == 'halfvec' else 'binary_quantized_embeddings'
+        path = args.output or next_migration_path(slug)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(migration_sql(args.representation, args.dim, args.rescore, report))
+        print(f"✅ Migration gerada: {path}")
+        return
+
+    require_numpy()
+    start = time.perf_counter()
+    matrix = load_matrix(args)
+    print(f"📦 {len(matrix)} vetores de {matrix.shape[1]} dimensões em {time.perf_counter() - start:.2f}s")
+
+    if args.command == 'quantize':
+        index = QuantizedIndex(args.representation, matrix)
+        arrays = {'codes': index.codes}
+        if index.scales is not None:
+            arrays['scales'] = index.scales
+        if index.bits is not None:
+            arrays = {'bits': index.bits}
+        np.savez(args.output, **arrays)
+        print(f"💾 {args.representation}: {index.bytes_per_vector():g} bytes/vetor → {args.output}")
+        return
+
+    rescores = tuple(int(value) for value in args.rescore.split(',') if value)
+    report = benchmark(matrix, sample_queries(matrix, args.queries), args.k, rescores)
+    print(f"{'representação':<14} {'bytes':>7} {'x':>6} {'recall':>7} {'p50 ms':>8} {'p95 ms':>8} {'erro sim':>9}")
+    for name in report['variants']:
+        data = report[name]
+        print(f"{name:<14} {data['bytes_per_vector']:>7g} {data['compression']:>6} "
+              f"{data[f'recall@{args.k}']:>7.4f} {data['p50_ms']:>8.3f} {data['p95_ms']:>8.3f} "
+              f"{data['max_similarity_error']:>9.5f}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Relatório salvo em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
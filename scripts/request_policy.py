@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Política de requisições para os scripts de seed: limitador token-bucket,
+retry com backoff exponencial (full jitter) para falhas transitórias
+(HTTP 429/5xx, timeouts, conexão) e execução concorrente com saída ordenada.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Limitador de taxa thread-safe: `rate` requisições/s com rajadas até `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Bloqueia até haver `tokens` disponíveis."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Extrai o status HTTP de erros do httpx/postgrest, quando houver."""
+    response = getattr(exc, 'response', None)
+    for candidate in (getattr(exc, 'status_code', None),
+                      getattr(response, 'status_code', None),
+                      getattr(exc, 'code', None)):
+        try:
+            return int(candidate)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Indica se a falha pode ser repetida com segurança (429, 5xx, rede)."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in TRANSIENT_STATUS
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # httpx.TransportError e derivados (sem depender do import do httpx)
+    return any(cls.__name__ in ('TransportError', 'TimeoutException', 'NetworkError')
+               for cls in type(exc).__mro__)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestRunner:
+    """
+    Executa queries do cliente Supabase (`query.execute()`) aplicando o
+    limitador de taxa e retry com backoff exponencial e jitter.
+    """
+
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None, max_retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniforme entre 0 e min(max_delay, base * 2^tentativa)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                delay = _retry_after(e)
+                time.sleep(delay if delay is not None else self.backoff(attempt))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+
+    def execute(self, query: Any) -> Any:
+        return self.call(query.execute)
+
+
+def run_ordered(tasks: Iterable[Callable[[], T]], concurrency: int = 1) -> Iterator[T]:
+    """
+    Executa as tarefas com no máximo `concurrency` em paralelo e entrega os
+    resultados na ordem de submissão (janela limitada de tarefas pendentes).
+    """
+    if concurrency <= 1:
+        for task in tasks:
+            yield task()
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(task))
+            if len(pending) >= concurrency * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -3,38 +3,21 @@
 Script para gerar e executar seed dos processos restantes em lotes via MCP.
 """
 
+import itertools
 import json
+import os
+import re
 import sys
 
-# Mapeamentos
-CATEGORY_MAP = {
-    "Governança": "governanca",
-    "Acesso e Segurança": "acesso_seguranca",
-    "Operação": "operacao",
-    "Áreas Comuns": "areas_comuns",
-    "Convivência": "convivencia",
-    "Eventos": "eventos",
-    "Emergências": "emergencias",
-}
+from catalog_cache import load_catalog
+from catalog_stream import iter_chunks, iter_ndjson
+from instrumentation import add_instrumentation_arguments, metrics, profile
+from seed_journal import SeedJournal
+from sql_emitter import (DEFAULT_MAX_BYTES, iter_record_batches, journal_key, process_to_record,
+                         render_recordset_statement)
 
-DOCUMENT_TYPE_MAP = {
-    "Manual": "manual",
-    "Regulamento": "regulamento",
-    "POP": "pop",
-    "Fluxograma": "fluxograma",
-    "Aviso": "aviso",
-    "Comunicado": "comunicado",
-    "Checklist": "checklist",
-    "Formulário": "formulario",
-    "Política": "politica",
-}
-
-STATUS_MAP = {
-    "rascunho": "rascunho",
-    "em_revisao": "em_revisao",
-    "aprovado": "aprovado",
-    "rejeitado": "rejeitado",
-}
+MIGRATIONS_DIR = 'scripts/migrations'
+DEFAULT_JOURNAL_PATH = 'scripts/migrations/.seed_journal.ndjson'
 
 def escape_sql(text):
     """Escapa texto para SQL."""
@@ -42,68 +25,54 @@ def escape_sql(text):
         return ""
     return text.replace("'", "''")
 
+@metrics.timed('generate_sql')
 def generate_sql_for_process(proc):
-    """Gera SQL para um processo."""
-    name = escape_sql(proc['name'])
-    category = CATEGORY_MAP.get(proc['category'], 'governanca')
-    doc_type = DOCUMENT_TYPE_MAP.get(proc.get('documentType', 'Manual'), 'manual')
-    status = STATUS_MAP.get(proc.get('status', 'em_revisao'), 'em_revisao')
-    description = escape_sql(proc.get('description', ''))
-    
-    content = {
-        'description': proc.get('description', ''),
-        'workflow': proc.get('workflow', []),
-        'entities': proc.get('entities', []),
-        'variables': proc.get('variables', []),
-    }
-    
-    if proc.get('mermaid_diagram'):
-        content['mermaid_diagram'] = proc['mermaid_diagram']
-    
-    if proc.get('raci'):
-        content['raci'] = proc['raci']
-    
-    content_json = json.dumps(content, ensure_ascii=False).replace("'", "''")
-    entities_json = json.dumps(proc.get('entities', []), ensure_ascii=False)
-    variables = {var: None for var in proc.get('variables', [])}
-    variables_json = json.dumps(variables, ensure_ascii=False)
+    """
+    Gera SQL para um processo a partir de process_to_record (mesmo conteúdo
+    e content_hash do seed via API). seed_single_process não recebe o hash:
+    um UPDATE o grava em seguida, para o --incremental reconhecer o processo.
+    """
+    record = process_to_record(proc)
+    name = escape_sql(record['name'])
+    description = escape_sql(record['content_text'])
+    content_json = escape_sql(json.dumps(record['content'], ensure_ascii=False))
+    entities_json = escape_sql(json.dumps(record['entities_involved'], ensure_ascii=False))
+    variables_json = escape_sql(json.dumps(record['variables_applied'], ensure_ascii=False))
     
     return f"""    SELECT seed_single_process(
         '{name}',
-        '{category}',
-        '{doc_type}',
-        '{status}',
+        '{record['category']}',
+        '{record['document_type']}',
+        '{record['status']}',
         '{description}',
         '{content_json}'::jsonb,
         '{entities_json}'::jsonb,
         '{variables_json}'::jsonb
-    ) INTO v_process_id;"""
+    ) INTO v_process_id;
+    UPDATE public.processes SET content_hash = '{record['content_hash']}'
+    WHERE id = v_process_id AND content_hash IS NULL;"""
 
-def main():
-    # Ler processos
-    with open('scripts/processes.json', 'r', encoding='utf-8') as f:
-        processes = json.load(f)
-    
-    # Processos restantes (pular os 5 primeiros)
-    remaining = processes[5:]
-    
-    # Dividir em lotes de 5 processos
-    batch_size = 5
-    batches = []
-    for i in range(0, len(remaining), batch_size):
-        batch = remaining[i:i+batch_size]
-        batches.append(batch)
-    
-    print(f"📊 Total: {len(processes)} processos")
-    print(f"✅ Já inseridos: 5 processos")
-    print(f"⏳ Restam: {len(remaining)} processos")
-    print(f"📦 Lotes: {len(batches)} lotes de até {batch_size} processos cada\n")
-    
-    # Gerar SQL para cada lote
-    for batch_num, batch in enumerate(batches, 1):
+def write_set_based_batches(remaining, max_bytes, first_batch=1, journal=None, hashes=None):
+    """Gera um arquivo por lote, cada um com um único statement set-based."""
+    batch_num = first_batch - 1
+    for batch_num, batch in enumerate(iter_record_batches(remaining, max_bytes), first_batch):
+        filename = f'{MIGRATIONS_DIR}/009_seed_batch_{batch_num}.sql'
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"-- Migration: Seed lote {batch_num} ({len(batch)} processos)\n")
+            f.write("-- Esta migration insere o lote inteiro com um único statement (jsonb_to_recordset)\n\n")
+            f.write(render_recordset_statement(batch, batch_num))
+        if journal:
+            journal.emit(filename, [(name, hashes[name]) for name, _ in batch])
+        print(f"✅ Lote {batch_num}: {len(batch)} processos → {filename}")
+    return batch_num
+
+def write_migration_batches(remaining, batch_size, first_batch=1, journal=None, hashes=None):
+    """Gera um arquivo por lote, com uma chamada a seed_single_process por processo."""
+    # Gerar SQL para cada lote (um lote em memória por vez)
+    for batch_num, (_, batch) in enumerate(iter_chunks(remaining, batch_size), first_batch):
         migration_num = 8 + batch_num
         migration_name = f"009_seed_batch_{batch_num}"
-        
+    
         sql_parts = [
             f"-- Migration: Seed lote {batch_num} ({len(batch)} processos)",
             "-- Esta migration executa a função seed_single_process para um lote de processos",
@@ -113,27 +82,109 @@ def main():
             "    v_process_id UUID;",
             "BEGIN"
         ]
-        
+    
         for proc in batch:
             sql_parts.append(generate_sql_for_process(proc))
-        
+    
         sql_parts.append("END $$;")
-        
+    
         sql = '\n'.join(sql_parts)
-        
+    
         # Salvar arquivo
-        filename = f'scripts/migrations/{migration_name}.sql'
+        filename = f'{MIGRATIONS_DIR}/{migration_name}.sql'
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(sql)
-        
+        if journal:
+            journal.emit(filename, [(p['name'], hashes[p['name']]) for p in batch])
+    
         print(f"✅ Lote {batch_num}: {len(batch)} processos → {filename}")
         print(f"   Processos: {', '.join([p['name'][:30] + '...' if len(p['name']) > 30 else p['name'] for p in batch])}")
+
+def discard_unapplied_batches(journal):
+    """
+    Remove os arquivos gerados e não aplicados segundo o journal (seus
+    processos voltam a ficar pendentes) e retorna o próximo número de lote,
+    depois dos arquivos que ficaram.
+    """
+    for filename in sorted(journal.emitted):
+        if os.path.exists(filename):
+            os.remove(filename)
+            print(f"🗑️  Lote não aplicado descartado: {filename}")
+        journal.discard(filename)
+    numbers = [int(match.group(1)) for match in
+               (re.fullmatch(r'009_seed_batch_(\d+)\.sql', name) for name in os.listdir(MIGRATIONS_DIR))
+               if match]
+    return max(numbers, default=0) + 1
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Gerar migrations de seed em lotes')
+    parser.add_argument('--set-based', action='store_true',
+                        help='Um statement jsonb_to_recordset por lote, lotes limitados por bytes')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help='Tamanho máximo do payload de cada lote (com --set-based)')
+    parser.add_argument('--input', help='Ler processos de um NDJSON (em streaming) em vez do processes.ts')
+    parser.add_argument('--skip', type=int, default=5,
+                        help='Pular os N primeiros processos (inseridos antes do journal)')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH,
+                        help='Journal de checkpoints dos lotes gerados/aplicados')
+    parser.add_argument('--resume', action='store_true',
+                        help='Gerar só os processos ainda não aplicados segundo o journal')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args.metrics)
+    
+    journal = SeedJournal.open(args.journal, MIGRATIONS_DIR, args.resume)
+    first_batch = discard_unapplied_batches(journal) if args.resume else 1
+    hashes = {}
+    
+    def key(proc):
+        name, content_hash = journal_key(proc)
+        hashes.setdefault(name, content_hash)
+        return name, content_hash
+    
+    # Ler processos: NDJSON linha a linha ou cache compartilhado do processes.ts
+    if args.input:
+        processes = metrics.iter_span('parse', iter_ndjson(args.input))
+    else:
+        with metrics.span('parse'):
+            processes = load_catalog()
+    
+    # Processos restantes: pular os `skip` primeiros e o que o journal já registra
+    remaining = journal.pending(itertools.islice(processes, args.skip, None), key)
+    if isinstance(processes, list):
+        remaining = list(remaining)
+    if args.resume:
+        print(f"🧾 Journal: {len(journal.done)} processos já aplicados; novos lotes a partir do {first_batch}")
+    
+    if args.set_based:
+        if isinstance(processes, list):
+            print(f"📊 Total: {len(processes)} processos")
+            print(f"⏳ Restam: {len(remaining)} processos (lotes de até {args.max_bytes} bytes)\n")
+        with profile(args.profile), metrics.span('emit'):
+            write_set_based_batches(remaining, args.max_bytes, first_batch, journal, hashes)
+        print(f"\n💡 Depois de aplicar: python scripts/seed_journal.py --journal {args.journal} commit <arquivo>")
+        return
+    
+    # Dividir em lotes de 5 processos
+    batch_size = 5
+    
+    if isinstance(processes, list):
+        total_remaining = len(remaining)
+        print(f"📊 Total: {len(processes)} processos")
+        print(f"✅ Já inseridos: {args.skip + journal.resumed} processos")
+        print(f"⏳ Restam: {total_remaining} processos")
+        print(f"📦 Lotes: {-(-total_remaining // batch_size)} lotes de até {batch_size} processos cada\n")
+    
+    with profile(args.profile), metrics.span('emit'):
+        write_migration_batches(remaining, batch_size, first_batch, journal, hashes)
     
     print(f"\n💡 Execute as migrations via MCP do Supabase:")
     print(f"   mcp_supabase_Sindico_Virtual_apply_migration")
+    print(f"   e marque cada uma: python scripts/seed_journal.py --journal {args.journal} commit <arquivo>")
 
 if __name__ == '__main__':
-    import os
-    os.makedirs('scripts/migrations', exist_ok=True)
+    os.makedirs(MIGRATIONS_DIR, exist_ok=True)
     main()
 
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Journal de checkpoints do seed: arquivo NDJSON só de acréscimo, com fsync a
+cada registro, que guarda cada lote (ou processo) efetivado junto com o hash
+do conteúdo. Com `--resume`, os scripts pulam o que o journal já registra,
+sem consultar o banco: reiniciar uma carga interrompida custa só o que ficou
+faltando.
+
+Formato (uma linha JSON por evento):
+    {"journal": 1, "target": "https://xyz.supabase.co", "created_at": "..."}
+    {"event": "commit", "batch": null, "items": [["Nome", "sha256..."], ...]}
+    {"event": "emit", "batch": "scripts/migrations/009_seed_batch_1.sql", "items": [...]}
+    {"event": "commit", "batch": "scripts/migrations/009_seed_batch_1.sql", "items": [...]}
+    {"event": "discard", "batch": "scripts/migrations/009_seed_batch_2.sql"}
+
+`emit` é usado pelos geradores de SQL (seed_batch_remaining.py,
+seed_via_mcp.py): o arquivo gerado só conta como concluído depois de
+aplicado e marcado com
+
+    python scripts/seed_journal.py commit scripts/migrations/009_seed_batch_1.sql
+
+Uma linha final incompleta (queda no meio da escrita) é descartada ao abrir.
+"""
+
+import datetime
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+T = TypeVar('T')
+
+JOURNAL_VERSION = 1
+DEFAULT_JOURNAL_PATH = 'scripts/.seed_journal.ndjson'
+
+
+def describe_target(target: Optional[str]) -> str:
+    """Identifica o destino do seed sem credenciais (URL/DSN sem usuário e senha)."""
+    if not target:
+        return ''
+    parts = urlsplit(target)
+    if not parts.netloc:
+        return target
+    return urlunsplit((parts.scheme, parts.netloc.rsplit('@', 1)[-1], parts.path, '', ''))
+
+
+def _fsync_directory(path: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SeedJournal:
+    """Journal aberto para acréscimo; `done` mapeia nome → hash efetivado."""
+
+    def __init__(self, path: str, target: str, out: TextIO,
+                 done: Optional[Dict[str, str]] = None,
+                 emitted: Optional[Dict[str, List[Tuple[str, str]]]] = None):
+        self.path = path
+        self.target = target
+        self.done: Dict[str, str] = done or {}
+        self.emitted: Dict[str, List[Tuple[str, str]]] = emitted or {}
+        self.resumed = 0
+        self._out = out
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def read(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
+        """
+        (cabeçalho, eventos, bytes válidos). Só a última linha pode estar
+        corrompida; qualquer outra linha inválida é erro.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        header: Dict[str, Any] = {}
+        events: List[Dict[str, Any]] = []
+        valid = 0
+        offset = 0
+        while offset < len(data):
+            end = data.find(b'\n', offset)
+            if end < 0:
+                break  # última linha sem '\n': escrita interrompida
+            line = data[offset:end]
+            offset = end + 1
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    if offset >= len(data):
+                        break
+                    raise ValueError(f"{path}: linha corrompida no byte {valid}")
+                if not header:
+                    header = entry
+                else:
+                    events.append(entry)
+            valid = offset
+        if header and header.get('journal') != JOURNAL_VERSION:
+            raise ValueError(f"{path}: versão de journal não suportada: {header.get('journal')}")
+        return header, events, valid
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_JOURNAL_PATH, target: str = '', resume: bool = False) -> 'SeedJournal':
+        """
+        Com `resume`, carrega o journal existente (o destino precisa ser o
+        mesmo) e continua acrescentando nele. Sem `resume`, começa um journal
+        novo; o anterior é preservado em `<path>.prev`.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            header, events, valid = cls.read(path)
+            if header and header.get('target') != target:
+                raise ValueError(f"{path}: journal de outro destino ({header.get('target')!r}, "
+                                 f"atual {target!r})")
+            done: Dict[str, str] = {}
+            emitted: Dict[str, List[Tuple[str, str]]] = {}
+            for event in events:
+                items = [tuple(item) for item in event.get('items', [])]
+                if event.get('event') == 'emit':
+                    emitted[event['batch']] = items
+                elif event.get('event') == 'commit':
+                    done.update(items)
+                    if event.get('batch') is not None:
+                        emitted.pop(event['batch'], None)
+                elif event.get('event') == 'discard':
+                    emitted.pop(event['batch'], None)
+            with open(path, 'r+b') as f:
+                f.truncate(valid)
+                f.flush()
+                os.fsync(f.fileno())
+            journal = cls(path, target, open(path, 'a', encoding='utf-8'), done, emitted)
+            if not header:
+                journal._append({'journal': JOURNAL_VERSION, 'target': target,
+                                 'created_at': datetime.datetime.now().isoformat(timespec='seconds')})
+            return journal
+
+        if os.path.exists(path):
+            os.replace(path, f"{path}.prev")
+        journal = cls(path, target, open(path, 'w', encoding='utf-8'))
+        journal._append({'journal': JOURNAL_VERSION, 'target': target,
+                         'created_at': datetime.datetime.now().isoformat(timespec='seconds')})
+        _fsync_directory(path)
+        return journal
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._out.write(line)
+            self._out.flush()
+            os.fsync(self._out.fileno())
+
+    def is_done(self, name: str, content_hash: str) -> bool:
+        return self.done.get(name) == content_hash
+
+    def pending(self, items: Iterable[T], key: Callable[[T], Tuple[str, str]]) -> Iterator[T]:
+        """Itera só os itens ainda não efetivados; `key(item)` → (nome, hash)."""
+        for item in items:
+            if self.is_done(*key(item)):
+                self.resumed += 1
+                continue
+            yield item
+
+    def commit(self, items: Iterable[Tuple[str, str]], batch: Optional[str] = None) -> None:
+        """Registra (nome, hash) efetivados no banco, com fsync antes de retornar."""
+        items = [(name, content_hash) for name, content_hash in items]
+        if not items and batch is None:
+            return
+        self._append({'event': 'commit', 'batch': batch, 'items': items})
+        with self._lock:
+            self.done.update(items)
+            if batch is not None:
+                self.emitted.pop(batch, None)
+
+    def emit(self, batch: str, items: Iterable[Tuple[str, str]]) -> None:
+        """Registra um arquivo SQL gerado (ainda não aplicado) e seus processos."""
+        items = [(name, content_hash) for name, content_hash in items]
+        self._append({'event': 'emit', 'batch': batch, 'items': items})
+        with self._lock:
+            self.emitted[batch] = items
+
+    def discard(self, batch: str) -> None:
+        """Descarta um arquivo emitido e não aplicado (será regenerado)."""
+        self._append({'event': 'discard', 'batch': batch})
+        with self._lock:
+            self.emitted.pop(batch, None)
+
+    def commit_batch(self, batch: str) -> int:
+        """Marca um arquivo emitido como aplicado. Retorna o número de processos."""
+        if batch not in self.emitted:
+            raise KeyError(batch)
+        items = self.emitted[batch]
+        self.commit(items, batch)
+        return len(items)
+
+    def close(self) -> None:
+        self._out.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Consultar ou atualizar o journal de checkpoints do seed')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='Arquivo do journal')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='Resumo do journal')
+    commit_parser = subparsers.add_parser('commit', help='Marcar arquivos SQL gerados como aplicados')
+    commit_parser.add_argument('batches', nargs='+', help='Arquivos emitidos (como aparecem no journal)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.journal):
+        print(f"Erro: journal não encontrado: {args.journal}")
+        raise SystemExit(1)
+
+    header, _, _ = SeedJournal.read(args.journal)
+    journal = SeedJournal.open(args.journal, header.get('target', ''), resume=True)
+    try:
+        if args.command == 'status':
+            print(f"🧾 Journal: {args.journal}")
+            print(f"🎯 Destino: {journal.target or '-'}")
+            print(f"✅ Processos efetivados: {len(journal.done)}")
+            print(f"📄 Arquivos gerados aguardando aplicação: {len(journal.emitted)}")
+            for batch, items in sorted(journal.emitted.items()):
+                print(f"   {batch} ({len(items)} processos)")
+            return
+
+        missing = [batch for batch in args.batches if batch not in journal.emitted]
+        for batch in args.batches:
+            if batch in journal.emitted:
+                print(f"✅ {batch}: {journal.commit_batch(batch)} processos marcados como aplicados")
+        for batch in missing:
+            print(f"⚠️  {batch}: não está pendente no journal")
+        if missing:
+            raise SystemExit(1)
+    finally:
+        journal.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Manifest local de seed: guarda, por nome de processo, o hash do conteúdo
+convertido, o id do processo e a última versão enviada. Permite classificar
+cada processo como inalterado, novo ou modificado sem consultar o banco.
+Vale para um único destino (gravado no arquivo, como no seed_journal): ids e
+versões de outro projeto Supabase não servem.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_PATH = 'scripts/.seed_manifest.json'
+
+# Campos que dependem de quem executa o seed, não do conteúdo do processo
+_CREATOR_FIELDS = {'process': ('creator_id', 'content_hash'), 'version': ('created_by',)}
+
+# Campos de `content` derivados do diagrama (mermaid_graph.py): recompilados a
+# cada seed, não mudam o processo (hashes anteriores a eles continuam válidos)
+_DERIVED_CONTENT_FIELDS = ('mermaid_graph', 'mermaid_error')
+
+
+def compute_content_hash(db_data: Dict[str, Any]) -> str:
+    """
+    Hash estável (sha256 do JSON canônico) de um registro de
+    convert_process_to_db_format, ignorando criador, o próprio hash e os
+    campos derivados do diagrama.
+    """
+    canonical = {
+        section: {key: value for key, value in db_data[section].items() if key not in ignored}
+        for section, ignored in _CREATOR_FIELDS.items()
+    }
+    content = canonical['version'].get('content')
+    if isinstance(content, dict) and any(field in content for field in _DERIVED_CONTENT_FIELDS):
+        canonical['version']['content'] = {
+            key: value for key, value in content.items() if key not in _DERIVED_CONTENT_FIELDS
+        }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SeedManifest:
+    """Manifest em JSON, gravado de forma atômica (arquivo temporário + rename)."""
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH, entries: Optional[Dict[str, Dict[str, Any]]] = None,
+                 target: str = ''):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self.target = target
+        # Destino do manifest descartado por `load` (outro projeto), se houver
+        self.discarded_target: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MANIFEST_PATH, target: str = '') -> 'SeedManifest':
+        """
+        Carrega o manifest de `target` (describe_target da URL). Um manifest de
+        outro destino é ignorado: começa vazio e é regravado para `target`.
+        """
+        if not os.path.exists(path):
+            return cls(path, target=target)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            return cls(path, target=target)
+        if data.get('target', '') != target:
+            manifest = cls(path, target=target)
+            manifest.discarded_target = data.get('target', '')
+            return manifest
+        return cls(path, data.get('processes', {}), target)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            data = {'version': MANIFEST_VERSION, 'target': self.target, 'processes': self.entries}
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(name)
+
+    def is_unchanged(self, name: str, content_hash: str) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry.get('content_hash') == content_hash
+
+    def record(self, name: str, content_hash: str, process_id: str, version_number: int,
+               version_id: Optional[str] = None) -> None:
+        with self._lock:
+            self.entries[name] = {
+                'content_hash': content_hash,
+                'process_id': process_id,
+                'version_number': version_number,
+                'version_id': version_id,
+            }
@@ -8,54 +8,43 @@ Uso:
 Requisitos:
     - Variáveis de ambiente: SUPABASE_URL e SUPABASE_SERVICE_KEY
     - Ou passar via argumentos: --url e --key
+    - Ou conexão direta ao Postgres: --dsn "$DATABASE_URL" (sempre explícito), ver pg_backend.py
+
+Modo --watch: após o seed incremental, observa o processes.ts e envia só os
+processos cujos objetos mudaram (nova linha em process_versions), ver
+catalog_watch.py.
 """
 
 import os
-import re
 import json
 import sys
-from typing import Dict, List, Any, Optional
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
+from catalog_cache import cache_status, load_catalog
+from catalog_stream import is_ndjson, iter_chunks, iter_ndjson
+from catalog_watch import DEFAULT_INTERVAL, CatalogChange, SpanIndex, watch_catalog
+from entity_index import print_sync_summary, sync_entity_index
+from instrumentation import add_instrumentation_arguments, metrics, profile
+from mermaid_graph import diagram_fields, invalid_diagrams
+from process_maps import CATEGORY_MAP, DOCUMENT_TYPE_MAP, STATUS_MAP
+from process_model import Process, is_snapshot, read_snapshot
+from request_policy import RequestRunner, TokenBucket, run_ordered
+from seed_journal import DEFAULT_JOURNAL_PATH, SeedJournal, describe_target
+from seed_manifest import DEFAULT_MANIFEST_PATH, SeedManifest, compute_content_hash
+from sql_emitter import DEFAULT_MAX_BYTES
+
 try:
     from supabase import create_client, Client
 except ImportError:
-    print("Erro: Biblioteca 'supabase' não instalada.")
-    print("Instale com: pip install supabase")
-    sys.exit(1)
-
-
-# Mapeamento de categorias (frontend → banco)
-CATEGORY_MAP = {
-    "Governança": "governanca",
-    "Acesso e Segurança": "acesso_seguranca",
-    "Operação": "operacao",
-    "Áreas Comuns": "areas_comuns",
-    "Convivência": "convivencia",
-    "Eventos": "eventos",
-    "Emergências": "emergencias",
-}
-
-# Mapeamento de tipos de documento (frontend → banco)
-DOCUMENT_TYPE_MAP = {
-    "Manual": "manual",
-    "Regulamento": "regulamento",
-    "POP": "pop",
-    "Fluxograma": "fluxograma",
-    "Aviso": "aviso",
-    "Comunicado": "comunicado",
-    "Checklist": "checklist",
-    "Formulário": "formulario",
-    "Política": "politica",
-}
-
-# Mapeamento de status (frontend → banco)
-STATUS_MAP = {
-    "rascunho": "rascunho",
-    "em_revisao": "em_revisao",
-    "aprovado": "aprovado",
-    "rejeitado": "rejeitado",
-}
+    # Só é obrigatória no caminho HTTP (sem --dsn); verificado em main()
+    create_client = None
+    Client = Any
+
+# Até este número de nomes desconhecidos, o seed incremental consulta por nome
+MAX_NAME_LOOKUP = 500
 
 
 def parse_processes_from_json(json_file: str) -> List[Dict[str, Any]]:
@@ -67,115 +56,27 @@ def parse_processes_from_json(json_file: str) -> List[Dict[str, Any]]:
 def parse_typescript_array(file_path: str) -> List[Dict[str, Any]]:
     """
     Parse um arquivo TypeScript que contém um array de objetos.
-    Tenta primeiro usar um arquivo JSON intermediário (se existir),
-    caso contrário, tenta parsear diretamente.
+    Usa o cache compartilhado (catalog_cache): o arquivo só é parseado de
+    novo quando mtime/tamanho/hash mudaram desde o último snapshot.
     """
-    # Tentar usar arquivo JSON intermediário primeiro
-    json_file = file_path.replace('.ts', '.json')
-    json_file = json_file.replace('frontend/src/data', 'scripts')
-    
-    if os.path.exists(json_file):
-        print(f"📖 Usando arquivo JSON intermediário: {json_file}")
-        return parse_processes_from_json(json_file)
-    
-    # Se não existir, tentar parsear TypeScript diretamente
-    print("⚠️  Arquivo JSON não encontrado. Tentando parsear TypeScript diretamente...")
-    print("💡 Dica: Execute 'node scripts/convert_processes_to_json.js' primeiro para melhor resultado")
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    processes = []
-    
-    # Extrair objetos usando regex (abordagem simplificada)
-    # Procurar por padrões de objetos
-    obj_pattern = r'\{\s*id:\s*\d+,[\s\S]*?\},?(?=\s*(?:\{|$))'
-    matches = re.finditer(obj_pattern, content)
+    if cache_status(file_path) == 'fresh':
+        print(f"⚡ Usando catálogo em cache de {file_path}")
+    else:
+        print(f"🔄 Parseando {file_path} (cache ausente ou desatualizado)")
     
-    for match in matches:
-        obj_str = match.group(0).rstrip(',').strip()
-        process = {}
-        
-        # Extrair campos básicos
-        name_match = re.search(r'name:\s*"([^"]+)"', obj_str)
-        if name_match:
-            process['name'] = name_match.group(1)
-        
-        category_match = re.search(r'category:\s*"([^"]+)"', obj_str)
-        if category_match:
-            process['category'] = category_match.group(1)
-        
-        status_match = re.search(r'status:\s*"([^"]+)"', obj_str)
-        if status_match:
-            process['status'] = status_match.group(1)
-        
-        desc_match = re.search(r'description:\s*"([^"]+)"', obj_str)
-        if desc_match:
-            process['description'] = desc_match.group(1)
-        
-        doc_type_match = re.search(r'documentType:\s*"([^"]+)"', obj_str)
-        if doc_type_match:
-            process['documentType'] = doc_type_match.group(1)
-        
-        # Extrair arrays
-        workflow_match = re.search(r'workflow:\s*\[(.*?)\]', obj_str, re.DOTALL)
-        if workflow_match:
-            workflow_str = workflow_match.group(1)
-            workflow_items = re.findall(r'"([^"]+)"', workflow_str)
-            process['workflow'] = workflow_items
-        
-        entities_match = re.search(r'entities:\s*\[(.*?)\]', obj_str, re.DOTALL)
-        if entities_match:
-            entities_str = entities_match.group(1)
-            entities_items = re.findall(r'"([^"]+)"', entities_str)
-            process['entities'] = entities_items
-        
-        variables_match = re.search(r'variables:\s*\[(.*?)\]', obj_str, re.DOTALL)
-        if variables_match:
-            variables_str = variables_match.group(1)
-            variables_items = re.findall(r'"([^"]+)"', variables_str)
-            process['variables'] = variables_items
-        
-        # Extrair mermaid_diagram
-        mermaid_match = re.search(r'mermaid_diagram:\s*`([^`]+)`', obj_str, re.DOTALL)
-        if mermaid_match:
-            process['mermaid_diagram'] = mermaid_match.group(1).strip()
-        
-        # Extrair RACI
-        raci_match = re.search(r'raci:\s*\[(.*?)\]', obj_str, re.DOTALL)
-        if raci_match:
-            raci_str = raci_match.group(1)
-            raci_objects = []
-            raci_obj_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            for raci_obj_match in re.finditer(raci_obj_pattern, raci_str, re.DOTALL):
-                raci_obj_str = raci_obj_match.group(0)
-                raci_obj = {}
-                
-                step_match = re.search(r'step:\s*"([^"]+)"', raci_obj_str)
-                if step_match:
-                    raci_obj['step'] = step_match.group(1)
-                
-                for field in ['responsible', 'accountable', 'consulted', 'informed']:
-                    field_match = re.search(rf'{field}:\s*\[(.*?)\]', raci_obj_str, re.DOTALL)
-                    if field_match:
-                        field_str = field_match.group(1)
-                        field_items = re.findall(r'"([^"]+)"', field_str)
-                        raci_obj[field] = field_items
-                
-                if raci_obj:
-                    raci_objects.append(raci_obj)
-            
-            if raci_objects:
-                process['raci'] = raci_objects
-        
-        if process.get('name'):
-            processes.append(process)
-    
-    return processes
+    return load_catalog(file_path)
 
 
-def convert_process_to_db_format(process: Dict[str, Any], creator_id: str) -> Dict[str, Any]:
-    """Converte um processo do formato frontend para o formato do banco."""
+@metrics.timed('convert')
+def convert_process_to_db_format(process: Dict[str, Any], creator_id: str, diagram: bool = True) -> Dict[str, Any]:
+    """
+    Converte um processo do formato frontend (dict ou Process do snapshot) para o formato do banco.
+    Com `diagram=False` o mermaid não é compilado: o content_hash é o mesmo
+    (mermaid_graph/mermaid_error ficam fora dele), para quem só precisa do hash.
+    """
+    
+    if isinstance(process, Process):
+        return process.to_db_format(creator_id, diagram)
     
     # Mapear categoria
     category = CATEGORY_MAP.get(process.get('category', ''), 'governanca')
@@ -196,6 +97,8 @@ def convert_process_to_db_format(process: Dict[str, Any], creator_id: str) -> Di
     
     if process.get('mermaid_diagram'):
         content['mermaid_diagram'] = process['mermaid_diagram']
+        if diagram:
+            content.update(diagram_fields(process.get('name', ''), process['mermaid_diagram']))
     
     if process.get('raci'):
         content['raci'] = process['raci']
@@ -203,7 +106,7 @@ def convert_process_to_db_format(process: Dict[str, Any], creator_id: str) -> Di
     # Construir variáveis aplicadas (objeto vazio com chaves das variáveis)
     variables_applied = {var: None for var in process.get('variables', [])}
     
-    return {
+    db_data = {
         'process': {
             'name': process.get('name', ''),
             'category': category,
@@ -221,13 +124,26 @@ def convert_process_to_db_format(process: Dict[str, Any], creator_id: str) -> Di
             'status': status,
         }
     }
+    
+    # Hash estável do conteúdo (independe do criador), gravado em processes.content_hash
+    db_data['process']['content_hash'] = compute_content_hash(db_data)
+    
+    return db_data
+
+
+def add_diagram_fields(db_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa um registro convertido com `diagram=False` (o content_hash não muda)."""
+    content = db_data['version']['content']
+    if content.get('mermaid_diagram') and 'mermaid_graph' not in content and 'mermaid_error' not in content:
+        content.update(diagram_fields(db_data['process']['name'], content['mermaid_diagram']))
+    return db_data
 
 
 def get_or_create_system_stakeholder(supabase: Client) -> str:
     """Obtém ou cria stakeholder 'Sistema' para ser o criador dos processos seed."""
     
     # Tentar buscar stakeholder existente
-    result = supabase.table('stakeholders').select('id').eq('email', 'sistema@villadelfiori.com').execute()
+    result = _execute(supabase.table('stakeholders').select('id').eq('email', 'sistema@villadelfiori.com'), None)
     
     if result.data:
         return result.data[0]['id']
@@ -235,14 +151,14 @@ def get_or_create_system_stakeholder(supabase: Client) -> str:
     # Criar novo stakeholder
     # Primeiro, precisamos criar um usuário auth (ou usar um existente)
     # Por enquanto, vamos criar sem auth_user_id (será nullable)
-    result = supabase.table('stakeholders').insert({
+    result = _execute(supabase.table('stakeholders').insert({
         'name': 'Sistema',
         'email': 'sistema@villadelfiori.com',
         'type': 'staff',
         'role': 'aprovador',
         'user_role': 'admin',
         'is_active': True,
-    }).execute()
+    }), None)
     
     if result.data:
         return result.data[0]['id']
@@ -250,62 +166,641 @@ def get_or_create_system_stakeholder(supabase: Client) -> str:
     raise Exception("Não foi possível criar stakeholder Sistema")
 
 
-def seed_processes(supabase: Client, processes: List[Dict[str, Any]], creator_id: str) -> Dict[str, int]:
-    """Insere processos no banco."""
-    
-    stats = {
-        'total': len(processes),
+def _execute(query: Any, runner: Optional[RequestRunner]) -> Any:
+    """
+    Executa a query diretamente ou via RequestRunner (rate limit + retry),
+    registrada em http.<tabela>.<verbo> quando a instrumentação está ligada.
+    """
+    return metrics.execute(query, runner)
+
+
+def _total(processes: Iterable[Dict[str, Any]]) -> Any:
+    """Total para o log: len() de listas; '?' para iteradores (streaming)."""
+    return len(processes) if hasattr(processes, '__len__') else '?'
+
+
+def _new_stats(total: Any) -> Dict[str, int]:
+    return {
+        'total': total,
         'success': 0,
         'errors': 0,
         'skipped': 0,
     }
+
+
+def _journal_items(batch: Iterable[Tuple[int, Dict[str, Any]]]) -> List[Tuple[str, str]]:
+    """(nome, content_hash) dos registros convertidos, para o journal de checkpoints."""
+    return [(db_data['process']['name'], db_data['process']['content_hash']) for _, db_data in batch]
+
+
+def journal_key(process: Dict[str, Any]) -> Tuple[str, str]:
+    """(nome, content_hash) de um processo do catálogo, como gravado no journal."""
+    db_data = convert_process_to_db_format(process, '', diagram=False)
+    return db_data['process']['name'], db_data['process']['content_hash']
+
+
+def _seed_single(supabase: Client, i: int, total: int, process: Dict[str, Any], creator_id: str,
+                 runner: Optional[RequestRunner] = None, journal: Optional[SeedJournal] = None
+                 ) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Insere um processo e sua versão inicial. Retorna (linhas de log, contagens).
+    Criados e já existentes são registrados no `journal`, se houver.
+    """
+    lines: List[str] = []
+    counts = {'success': 0, 'errors': 0, 'skipped': 0}
+
+    try:
+        # Converter para formato do banco
+        db_data = convert_process_to_db_format(process, creator_id)
+        name = db_data['process']['name']
+        
+        # Verificar se processo já existe (por nome)
+        existing = _execute(supabase.table('processes').select('id').eq('name', name), runner)
+        
+        if existing.data:
+            lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+            counts['skipped'] += 1
+            if journal:
+                journal.commit(_journal_items([(i, db_data)]))
+            return lines, counts
+        
+        # Criar processo
+        process_result = _execute(supabase.table('processes').insert(db_data['process']), runner)
+        
+        if not process_result.data:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar processo: {name}")
+            counts['errors'] += 1
+            return lines, counts
+        
+        process_id = process_result.data[0]['id']
+        
+        # Criar versão inicial
+        version_data = {
+            **db_data['version'],
+            'process_id': process_id,
+            'version_number': 1,
+        }
+        
+        try:
+            version_result = _execute(supabase.table('process_versions').insert(version_data), runner)
+        except Exception:
+            version_result = None
+        
+        if version_result and version_result.data:
+            lines.append(f"[{i}/{total}] ✅ Processo criado: {name}")
+            counts['success'] += 1
+            if journal:
+                journal.commit(_journal_items([(i, db_data)]))
+        else:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar versão: {name}")
+            counts['errors'] += 1
+            # Tentar deletar processo criado
+            _execute(supabase.table('processes').delete().eq('id', process_id), runner)
     
+    except Exception as e:
+        lines.append(f"[{i}/{total}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
+        counts['errors'] += 1
+
+    return lines, counts
+
+
+def _collect(results: Iterable[Tuple[List[str], Dict[str, int]]], stats: Dict[str, int]) -> Dict[str, int]:
+    """
+    Imprime as linhas de log na ordem de submissão e acumula as contagens.
+    Sem total conhecido (entrada em streaming), o total é o número de
+    processos contabilizados.
+    """
+    for lines, counts in results:
+        for line in lines:
+            print(line)
+        for key, value in counts.items():
+            stats[key] += value
+    if stats['total'] == '?':
+        stats['total'] = sum(stats[key] for key in ('success', 'errors', 'skipped'))
+    return stats
+
+
+def seed_processes(supabase: Client, processes: Iterable[Dict[str, Any]], creator_id: str,
+                   concurrency: int = 1, runner: Optional[RequestRunner] = None,
+                   journal: Optional[SeedJournal] = None) -> Dict[str, int]:
+    """
+    Insere processos no banco, um por vez. Com `concurrency` > 1, até N
+    processos são enviados em paralelo; o log continua na ordem original.
+    Aceita um iterador (ex.: NDJSON lido em streaming): os processos são
+    consumidos à medida que as requisições avançam.
+    """
+    
+    total = _total(processes)
+    tasks = (
+        partial(_seed_single, supabase, i, total, process, creator_id, runner, journal)
+        for i, process in enumerate(processes, 1)
+    )
+    return _collect(run_ordered(tasks, concurrency), _new_stats(total))
+
+
+def fetch_existing_processes(supabase: Client, columns: str = 'name', page_size: int = 1000,
+                             runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    """Carrega as colunas pedidas de todos os processos existentes (paginado)."""
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        result = _execute(supabase.table('processes').select(columns).range(offset, offset + page_size - 1), runner)
+        page = result.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def fetch_processes_by_name(supabase: Client, names: Iterable[str], columns: str = 'name',
+                            names_per_request: int = 100,
+                            runner: Optional[RequestRunner] = None) -> List[Dict[str, Any]]:
+    """Carrega as colunas pedidas só dos processos com os nomes dados (filtro `in`)."""
+    names = list(names)
+    rows: List[Dict[str, Any]] = []
+    for start in range(0, len(names), names_per_request):
+        chunk = names[start:start + names_per_request]
+        result = _execute(supabase.table('processes').select(columns).in_('name', chunk), runner)
+        rows.extend(result.data or [])
+    return rows
+
+
+def fetch_existing_process_names(supabase: Client, page_size: int = 1000,
+                                 runner: Optional[RequestRunner] = None) -> set:
+    """Carrega todos os nomes de processos existentes (paginado, poucas requisições)."""
+    return {row['name'] for row in fetch_existing_processes(supabase, 'name', page_size, runner)}
+
+
+def _seed_batch(supabase: Client, batch: List[Tuple[int, Dict[str, Any]]], total: int,
+                runner: Optional[RequestRunner] = None,
+                on_created: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+                journal: Optional[SeedJournal] = None
+                ) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Insere um lote já convertido: um upsert em processes e um insert em
+    process_versions. `on_created(db_data, version_row)` é chamado para cada
+    processo criado com sucesso; criados e já existentes vão para o `journal`
+    num único registro por lote.
+    """
+    lines: List[str] = []
+    counts = {'success': 0, 'errors': 0, 'skipped': 0}
+
+    # Criar processos do lote (conflitos por nome são ignorados)
+    try:
+        process_result = _execute(supabase.table('processes').upsert(
+            [db_data['process'] for _, db_data in batch],
+            on_conflict='name',
+            ignore_duplicates=True,
+        ), runner)
+    except Exception as e:
+        for i, db_data in batch:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar processo: {db_data['process']['name']}: {e}")
+        counts['errors'] += len(batch)
+        return lines, counts
+
+    process_ids = {row['name']: row['id'] for row in (process_result.data or [])}
+
+    created = []
+    done = []
+    for i, db_data in batch:
+        name = db_data['process']['name']
+        if name in process_ids:
+            created.append((i, db_data))
+        else:
+            # Criado por outra execução entre a leitura dos nomes e o upsert
+            lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+            counts['skipped'] += 1
+            done.append((i, db_data))
+
+    if not created:
+        if journal:
+            journal.commit(_journal_items(done))
+        return lines, counts
+
+    # Criar versões iniciais do lote
+    versions = [
+        {
+            **db_data['version'],
+            'process_id': process_ids[db_data['process']['name']],
+            'version_number': 1,
+        }
+        for _, db_data in created
+    ]
+
+    try:
+        version_result = _execute(supabase.table('process_versions').insert(versions), runner)
+        versioned = {row['process_id']: row for row in (version_result.data or [])}
+    except Exception as e:
+        lines.append(f"❌ Erro ao criar versões do lote: {e}")
+        versioned = {}
+
+    orphan_ids = []
+    for i, db_data in created:
+        name = db_data['process']['name']
+        if process_ids[name] in versioned:
+            lines.append(f"[{i}/{total}] ✅ Processo criado: {name}")
+            counts['success'] += 1
+            done.append((i, db_data))
+            if on_created:
+                on_created(db_data, versioned[process_ids[name]])
+        else:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar versão: {name}")
+            counts['errors'] += 1
+            orphan_ids.append(process_ids[name])
+
+    if journal:
+        journal.commit(_journal_items(done))
+
+    if orphan_ids:
+        # Tentar deletar processos criados sem versão
+        try:
+            _execute(supabase.table('processes').delete().in_('id', orphan_ids), runner)
+        except Exception as e:
+            lines.append(f"⚠️  Erro ao remover processos sem versão: {e}")
+
+    return lines, counts
+
+
+def _merge_results(prefix: Tuple[List[str], Dict[str, int]],
+                   task: Optional[Callable[[], Tuple[List[str], Dict[str, int]]]]
+                   ) -> Tuple[List[str], Dict[str, int]]:
+    """Executa `task` (se houver) e junta seu resultado ao log/contagens do pré-filtro."""
+    lines, counts = prefix
+    if task is None:
+        return lines, counts
+    task_lines, task_counts = task()
+    return lines + task_lines, {key: counts[key] + task_counts[key] for key in counts}
+
+
+def seed_processes_bulk(supabase: Client, processes: Iterable[Dict[str, Any]], creator_id: str,
+                        batch_size: int = 100, concurrency: int = 1,
+                        runner: Optional[RequestRunner] = None,
+                        journal: Optional[SeedJournal] = None) -> Dict[str, int]:
+    """
+    Insere processos em lotes: uma consulta para os nomes existentes e, por lote,
+    um upsert multi-linha em `processes` (on_conflict=name) e um insert
+    multi-linha em `process_versions`. Mantém as mesmas estatísticas por linha
+    de seed_processes. Com `concurrency` > 1, até N lotes são enviados em paralelo.
+    Com um iterador, só os lotes em andamento ficam em memória.
+    """
+
+    total = _total(processes)
+    stats = _new_stats(total)
+
+    existing_names = fetch_existing_process_names(supabase, runner=runner)
+    print(f"📋 {len(existing_names)} processos já existentes no banco")
+
+    def batches() -> Iterator[Callable[[], Tuple[List[str], Dict[str, int]]]]:
+        for batch_start, chunk in iter_chunks(processes, batch_size):
+            lines: List[str] = []
+            counts = {'success': 0, 'errors': 0, 'skipped': 0}
+            batch = []
+            for i, process in enumerate(chunk, batch_start + 1):
+                try:
+                    db_data = convert_process_to_db_format(process, creator_id)
+                except Exception as e:
+                    lines.append(f"[{i}/{total}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
+                    counts['errors'] += 1
+                    continue
+
+                name = db_data['process']['name']
+                if name in existing_names:
+                    lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+                    counts['skipped'] += 1
+                    continue
+
+                existing_names.add(name)
+                batch.append((i, db_data))
+
+            yield partial(_merge_results, (lines, counts),
+                          partial(_seed_batch, supabase, batch, total, runner, None, journal) if batch else None)
+
+    return _collect(run_ordered(batches(), concurrency), stats)
+
+
+def _bulk_record(db_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Registro plano esperado por seed_processes_bulk (migration 053): campos de
+    processo e versão juntos; criador e status da versão ficam com a função.
+    """
+    record = {key: value for key, value in db_data['process'].items() if key != 'creator_id'}
+    record.update((key, value) for key, value in db_data['version'].items()
+                  if key not in ('created_by', 'status'))
+    return record
+
+
+def _seed_rpc_payload(supabase: Client, payload: List[Tuple[int, Dict[str, Any]]], total: int,
+                      creator_id: str, runner: Optional[RequestRunner] = None,
+                      journal: Optional[SeedJournal] = None) -> Tuple[List[str], Dict[str, int]]:
+    """Uma chamada de seed_processes_bulk com o payload; log e contagens por registro."""
+    lines: List[str] = []
+    counts = {'success': 0, 'errors': 0, 'skipped': 0}
+
+    try:
+        result = _execute(supabase.rpc('seed_processes_bulk', {
+            'p_processes': [record for _, record in payload],
+            'p_creator_id': creator_id,
+        }), runner)
+    except Exception as e:
+        for i, record in payload:
+            lines.append(f"[{i}/{total}] ❌ Erro ao criar processo: {record['name']}: {e}")
+        counts['errors'] += len(payload)
+        return lines, counts
+
+    # Uma linha por registro, na ordem do array
+    outcomes = [row.get('outcome') for row in (result.data or [])]
+    done = []
+    for position, (i, record) in enumerate(payload):
+        outcome = outcomes[position] if position < len(outcomes) else None
+        name = record['name']
+        if outcome == 'created':
+            lines.append(f"[{i}/{total}] ✅ Processo criado: {name}")
+            counts['success'] += 1
+        elif outcome in ('exists', 'duplicate'):
+            lines.append(f"[{i}/{total}] ⏭️  Processo já existe: {name}")
+            counts['skipped'] += 1
+        else:
+            lines.append(f"[{i}/{total}] ❌ Sem resultado da função para: {name}")
+            counts['errors'] += 1
+            continue
+        done.append((name, record['content_hash']))
+
+    if journal:
+        journal.commit(done)
+    return lines, counts
+
+
+def seed_processes_rpc(supabase: Client, processes: Iterable[Dict[str, Any]], creator_id: str,
+                       max_bytes: int = DEFAULT_MAX_BYTES, concurrency: int = 1,
+                       runner: Optional[RequestRunner] = None,
+                       journal: Optional[SeedJournal] = None) -> Dict[str, int]:
+    """
+    Insere processos pela função set-based seed_processes_bulk: a saída de
+    convert_process_to_db_format é empacotada em payloads de até `max_bytes`
+    de JSON (um processo maior que o limite vai sozinho) e cada payload é uma
+    única chamada RPC, com dois INSERTs no banco. Não precisa da consulta
+    prévia de nomes: a função devolve created/exists/duplicate por registro.
+    """
+
+    total = _total(processes)
+    stats = _new_stats(total)
+
+    def payloads() -> Iterator[Callable[[], Tuple[List[str], Dict[str, int]]]]:
+        lines: List[str] = []
+        counts = {'success': 0, 'errors': 0, 'skipped': 0}
+        payload: List[Tuple[int, Dict[str, Any]]] = []
+        size = 0
+        for i, process in enumerate(processes, 1):
+            try:
+                record = _bulk_record(convert_process_to_db_format(process, creator_id))
+            except Exception as e:
+                lines.append(f"[{i}/{total}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
+                counts['errors'] += 1
+                continue
+
+            record_size = len(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')) + 1
+            if payload and size + record_size > max_bytes:
+                yield partial(_merge_results, (lines, counts),
+                              partial(_seed_rpc_payload, supabase, payload, total, creator_id, runner, journal))
+                lines, counts = [], {'success': 0, 'errors': 0, 'skipped': 0}
+                payload, size = [], 0
+            payload.append((i, record))
+            size += record_size
+
+        yield partial(_merge_results, (lines, counts),
+                      partial(_seed_rpc_payload, supabase, payload, total, creator_id, runner, journal)
+                      if payload else None)
+
+    return _collect(run_ordered(payloads(), concurrency), stats)
+
+
+def _update_single(supabase: Client, i: int, total: int, db_data: Dict[str, Any], entry: Dict[str, Any],
+                   manifest: SeedManifest, runner: Optional[RequestRunner] = None,
+                   journal: Optional[SeedJournal] = None) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Cria a versão `version_number + 1` de um processo cujo conteúdo mudou.
+    A linha de processes é atualizada antes (colunas do processo, hash e
+    current_version_number): o trigger de ingestão só enfileira a versão igual
+    a current_version_number. Se a versão falhar, hash e número voltam ao
+    anterior e a próxima execução tenta de novo.
+    """
+    lines: List[str] = []
+    counts = {'success': 0, 'errors': 0, 'skipped': 0, 'updated': 0}
+    name = db_data['process']['name']
+    content_hash = db_data['process']['content_hash']
+    previous_number = entry.get('version_number') or 1
+    version_number = previous_number + 1
+    process_id = entry['process_id']
+
+    # category/document_type/status entram no content_hash: gravados junto com ele
+    process_data = {key: value for key, value in db_data['process'].items() if key not in ('name', 'creator_id')}
+    process_data['current_version_number'] = version_number
+
+    version_data = {
+        **db_data['version'],
+        'process_id': process_id,
+        'version_number': version_number,
+        'change_summary': 'Atualização via seed (conteúdo alterado)',
+    }
+    if entry.get('version_id'):
+        version_data['previous_version_id'] = entry['version_id']
+
+    try:
+        _execute(supabase.table('processes').update(process_data).eq('id', process_id), runner)
+    except Exception as e:
+        lines.append(f"[{i}/{total}] ❌ Erro ao atualizar processo: {name}: {e}")
+        counts['errors'] += 1
+        return lines, counts
+
+    try:
+        version_result = _execute(supabase.table('process_versions').insert(version_data), runner)
+        if not version_result.data:
+            raise Exception("insert sem retorno")
+    except Exception as e:
+        lines.append(f"[{i}/{total}] ❌ Erro ao criar versão {version_number}: {name}: {e}")
+        counts['errors'] += 1
+        # Tentar desfazer a atualização do processo
+        try:
+            _execute(supabase.table('processes').update({
+                'content_hash': entry.get('content_hash'),
+                'current_version_number': previous_number,
+            }).eq('id', process_id), runner)
+        except Exception as e:
+            lines.append(f"⚠️  Erro ao desfazer atualização de {name}: {e}")
+        return lines, counts
+
+    manifest.record(name, content_hash, process_id, version_number, version_result.data[0].get('id'))
+    if journal:
+        journal.commit([(name, content_hash)])
+    lines.append(f"[{i}/{total}] 🔄 Processo atualizado (versão {version_number}): {name}")
+    counts['updated'] += 1
+    return lines, counts
+
+
+def seed_processes_incremental(supabase: Client, processes: List[Dict[str, Any]], creator_id: str,
+                               manifest: SeedManifest, batch_size: int = 100, concurrency: int = 1,
+                               runner: Optional[RequestRunner] = None,
+                               journal: Optional[SeedJournal] = None) -> Dict[str, int]:
+    """
+    Seed incremental guiado pelo content_hash: processos inalterados segundo o
+    manifest são pulados sem acesso à rede, novos são inseridos em lote e
+    modificados ganham uma nova linha em process_versions. O banco só é
+    consultado (uma vez, paginado) para nomes ausentes do manifest.
+    """
+
+    total = len(processes)
+    stats = _new_stats(total)
+    stats['updated'] = 0
+
+    records: List[Tuple[int, Dict[str, Any]]] = []
     for i, process in enumerate(processes, 1):
         try:
-            # Converter para formato do banco
-            db_data = convert_process_to_db_format(process, creator_id)
-            
-            # Verificar se processo já existe (por nome)
-            existing = supabase.table('processes').select('id').eq('name', db_data['process']['name']).execute()
-            
-            if existing.data:
-                print(f"[{i}/{stats['total']}] ⏭️  Processo já existe: {db_data['process']['name']}")
+            # Diagrama só é compilado para o que for enviado (novos e modificados)
+            records.append((i, convert_process_to_db_format(process, creator_id, diagram=False)))
+        except Exception as e:
+            print(f"[{i}/{total}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
+            stats['errors'] += 1
+
+    unknown = {db_data['process']['name'] for _, db_data in records
+               if manifest.get(db_data['process']['name']) is None}
+    db_rows: Dict[str, Dict[str, Any]] = {}
+    if unknown:
+        columns = 'id,name,content_hash,current_version_number'
+        # Poucos nomes (ex.: --watch): consulta por nome em vez de varrer a tabela
+        if len(unknown) <= MAX_NAME_LOOKUP:
+            rows = fetch_processes_by_name(supabase, sorted(unknown), columns, runner=runner)
+        else:
+            rows = fetch_existing_processes(supabase, columns, runner=runner)
+        db_rows = {row['name']: row for row in rows if row['name'] in unknown}
+
+    new: List[Tuple[int, Dict[str, Any]]] = []
+    modified: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+    seen = set()
+    for i, db_data in records:
+        name = db_data['process']['name']
+        content_hash = db_data['process']['content_hash']
+        if name in seen or manifest.is_unchanged(name, content_hash):
+            print(f"[{i}/{total}] ⏭️  Processo inalterado: {name}")
+            stats['skipped'] += 1
+        elif manifest.get(name) is not None:
+            modified.append((i, add_diagram_fields(db_data), manifest.get(name)))
+        elif name in db_rows:
+            row = db_rows[name]
+            entry = {'process_id': row['id'], 'version_number': row.get('current_version_number') or 1,
+                     'content_hash': row.get('content_hash')}
+            if row.get('content_hash') == content_hash:
+                manifest.record(name, content_hash, entry['process_id'], entry['version_number'])
+                print(f"[{i}/{total}] ⏭️  Processo inalterado: {name}")
                 stats['skipped'] += 1
-                continue
-            
-            # Criar processo
-            process_result = supabase.table('processes').insert(db_data['process']).execute()
-            
-            if not process_result.data:
-                print(f"[{i}/{stats['total']}] ❌ Erro ao criar processo: {db_data['process']['name']}")
-                stats['errors'] += 1
-                continue
-            
-            process_id = process_result.data[0]['id']
-            
-            # Criar versão inicial
-            version_data = {
-                **db_data['version'],
-                'process_id': process_id,
-                'version_number': 1,
-            }
-            
-            version_result = supabase.table('process_versions').insert(version_data).execute()
-            
-            if version_result.data:
-                print(f"[{i}/{stats['total']}] ✅ Processo criado: {db_data['process']['name']}")
-                stats['success'] += 1
             else:
-                print(f"[{i}/{stats['total']}] ❌ Erro ao criar versão: {db_data['process']['name']}")
-                stats['errors'] += 1
-                # Tentar deletar processo criado
-                supabase.table('processes').delete().eq('id', process_id).execute()
+                modified.append((i, add_diagram_fields(db_data), entry))
+        else:
+            new.append((i, add_diagram_fields(db_data)))
+        seen.add(name)
+
+    print(f"📋 Novos: {len(new)} | Modificados: {len(modified)} | Inalterados: {stats['skipped']}")
+
+    def on_created(db_data: Dict[str, Any], version_row: Dict[str, Any]) -> None:
+        manifest.record(db_data['process']['name'], db_data['process']['content_hash'],
+                        version_row['process_id'], 1, version_row.get('id'))
+
+    tasks: List[Callable[[], Tuple[List[str], Dict[str, int]]]] = [
+        partial(_seed_batch, supabase, new[start:start + batch_size], total, runner, on_created, journal)
+        for start in range(0, len(new), batch_size)
+    ]
+    tasks.extend(
+        partial(_update_single, supabase, i, total, db_data, entry, manifest, runner, journal)
+        for i, db_data, entry in modified
+    )
+
+    try:
+        return _collect(run_ordered(tasks, concurrency), stats)
+    finally:
+        manifest.save()
+
+
+def print_summary(stats: Dict[str, int], retries: int = 0, exit_on_error: bool = True) -> None:
+    """Imprime o resumo final e encerra com erro se houver falhas (exceto com `exit_on_error=False`)."""
+    print("\n" + "="*50)
+    print("📊 RESUMO")
+    print("="*50)
+    print(f"Total de processos: {stats['total']}")
+    print(f"✅ Criados com sucesso: {stats['success']}")
+    print(f"⏭️  Já existiam: {stats['skipped']}")
+    if 'updated' in stats:
+        print(f"🔄 Atualizados (nova versão): {stats['updated']}")
+    print(f"❌ Erros: {stats['errors']}")
+    if retries:
+        print(f"🔁 Retentativas: {retries}")
+    invalid = invalid_diagrams()
+    if invalid:
+        print(f"⚠️  Diagramas mermaid inválidos (enviados sem mermaid_graph): {len(invalid)}")
+        for name, error in sorted(invalid.items()):
+            print(f"   - {name}: {error}")
+    print("="*50)
+    
+    if stats['errors'] > 0 and exit_on_error:
+        sys.exit(1)
+
+
+def watch_and_seed(supabase: Client, path: str, index: SpanIndex, creator_id: str, manifest: SeedManifest,
+                   interval: float = DEFAULT_INTERVAL, batch_size: int = 100, concurrency: int = 1,
+                   runner: Optional[RequestRunner] = None, entity_index: bool = False) -> None:
+    """
+    Modo --watch: a cada gravação do catálogo, só os objetos alterados são
+    reparseados (catalog_watch.SpanIndex) e enviados pelo seed incremental:
+    processos novos são criados e alterados ganham uma nova versão. Nomes já
+    no manifest não consultam o banco, então o custo por edição não depende
+    do tamanho do catálogo. Com `entity_index`, o índice de entidades dos
+    processos enviados é atualizado logo depois.
+    """
+    def push(change: CatalogChange) -> None:
+        processes = change.changed()
+        if not processes:
+            return
+        start = time.perf_counter()
+        stats = seed_processes_incremental(supabase, processes, creator_id, manifest, batch_size,
+                                           concurrency, runner)
+        print(f"   💾 {stats['success']} criados, {stats['updated']} atualizados, {stats['errors']} erros "
+              f"em {(time.perf_counter() - start) * 1000:.0f} ms")
+        if entity_index:
+            # O manifest já tem o id de cada processo enviado (novo ou com versão nova)
+            entries = (manifest.get(process.get('name', '')) for process in processes)
+            process_ids = [entry['process_id'] for entry in entries if entry is not None]
+            try:
+                print_sync_summary(sync_entity_index(supabase, runner=runner, process_ids=process_ids))
+            except Exception as e:
+                print(f"   ⚠️  Falha ao atualizar o índice de entidades (refeito na próxima sincronização): {e}")
+
+    print(f"\n👀 Observando {path} ({len(index)} processos indexados, Ctrl+C para sair)")
+    try:
+        watch_catalog(path, push, interval, index=index)
+    except KeyboardInterrupt:
+        print("\n👋 Modo --watch encerrado")
+
+
+
+def seed_via_postgres(args: Any, processes: List[Dict[str, Any]],
+                      journal: Optional[SeedJournal] = None) -> None:
+    """Caminho --dsn: pool psycopg, COPY binário em staging e merge por lote."""
+    from pg_backend import create_pool, get_or_create_system_stakeholder_pg, seed_processes_pg
+    
+    pool = create_pool(args.dsn, max_size=max(1, args.concurrency))
+    try:
+        print("\n👤 Obtendo stakeholder Sistema...")
+        creator_id = get_or_create_system_stakeholder_pg(pool)
+        print(f"✅ Stakeholder ID: {creator_id}")
         
-        except Exception as e:
-            print(f"[{i}/{stats['total']}] ❌ Erro ao processar: {process.get('name', 'Desconhecido')}: {e}")
-            stats['errors'] += 1
+        batch_size = args.batch_size or 1000
+        print(f"\n💾 Inserindo {len(processes)} processos via COPY (lotes de {batch_size})...")
+        with profile(args.profile), metrics.span('seed'):
+            stats = seed_processes_pg(pool, processes, creator_id, convert_process_to_db_format,
+                                      batch_size, args.concurrency, journal)
+    finally:
+        pool.close()
     
-    return stats
+    metrics.annotate(stats=stats)
+    print_summary(stats)
 
 
 def main():
@@ -315,17 +810,52 @@ def main():
     parser = argparse.ArgumentParser(description='Migrar processos do mock para Supabase')
     parser.add_argument('--url', help='URL do Supabase', default=os.getenv('SUPABASE_URL'))
     parser.add_argument('--key', help='Service Key do Supabase', default=os.getenv('SUPABASE_SERVICE_KEY'))
-    parser.add_argument('--file', help='Caminho do arquivo processes.ts ou processes.json', 
+    parser.add_argument('--file', help='Caminho do arquivo processes.ts, processes.json, processes.ndjson ou snapshot .vdfp', 
                        default='frontend/src/data/processes.ts')
-    parser.add_argument('--json', help='Usar arquivo JSON intermediário', 
-                       default='scripts/processes.json')
+    parser.add_argument('--json', help='Usar arquivo JSON intermediário em vez do processes.ts',
+                       default=None)
     parser.add_argument('--dry-run', action='store_true', help='Apenas simular, não inserir dados')
+    parser.add_argument('--batch-size', type=int, default=0,
+                       help='Inserir em lotes de N processos (upsert multi-linha); 0 = um por vez')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Número máximo de processos (ou lotes) enviados em paralelo')
+    parser.add_argument('--rate-limit', type=float, default=0,
+                       help='Máximo de requisições por segundo (token bucket); 0 = sem limite')
+    parser.add_argument('--max-retries', type=int, default=5,
+                       help='Tentativas extras em falhas transitórias (HTTP 429/5xx)')
+    parser.add_argument('--rpc', action='store_true',
+                       help='Inserir via função seed_processes_bulk (uma chamada por payload)')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                       help='Tamanho máximo (bytes de JSON) de cada payload do --rpc')
+    parser.add_argument('--dsn', help='Conexão direta ao Postgres (COPY + pool, sem PostgREST), '
+                       'ex.: --dsn "$DATABASE_URL"')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Seed incremental por content_hash (pula inalterados, versiona modificados)')
+    parser.add_argument('--manifest', help='Arquivo de manifest do seed incremental',
+                       default=DEFAULT_MANIFEST_PATH)
+    parser.add_argument('--journal', help='Journal de checkpoints (lotes efetivados, com fsync)',
+                       default=DEFAULT_JOURNAL_PATH)
+    parser.add_argument('--entity-index', action='store_true',
+                        help='Atualizar o índice entidade → processo/passo após o seed (scripts/entity_index.py)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Retomar: pular o que o journal já registra como efetivado')
+    parser.add_argument('--watch', action='store_true',
+                        help='Após o seed incremental, observar o processes.ts e enviar só os processos editados')
+    parser.add_argument('--watch-interval', type=float, default=DEFAULT_INTERVAL,
+                        help='Intervalo (s) entre verificações do arquivo no --watch')
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    metrics.start(args.metrics)
     
-    if not args.url or not args.key:
+    if not args.dsn and (not args.url or not args.key):
         print("Erro: SUPABASE_URL e SUPABASE_SERVICE_KEY são obrigatórios")
-        print("Configure via variáveis de ambiente ou argumentos --url e --key")
+        print("Configure via variáveis de ambiente ou argumentos --url e --key (ou use --dsn)")
+        sys.exit(1)
+    
+    if not args.dsn and create_client is None:
+        print("Erro: Biblioteca 'supabase' não instalada.")
+        print("Instale com: pip install supabase")
         sys.exit(1)
     
     # Verificar se arquivo existe
@@ -333,29 +863,58 @@ def main():
         print(f"Erro: Arquivo não encontrado: {args.file}")
         sys.exit(1)
     
+    if args.watch and (args.dsn or args.json or args.file.endswith('.json') or is_ndjson(args.file)
+                       or is_snapshot(args.file)):
+        print("Erro: --watch observa um processes.ts e usa a API do Supabase (sem --dsn/--json)")
+        sys.exit(1)
+    
     print("🚀 Iniciando migração de processos...")
     print(f"📁 Arquivo: {args.file}")
-    print(f"🔗 Supabase URL: {args.url}")
-    
-    # Criar cliente Supabase
-    supabase: Client = create_client(args.url, args.key)
+    if args.dsn:
+        print("🐘 Conexão direta ao Postgres (--dsn)")
+    else:
+        print(f"🔗 Supabase URL: {args.url}")
     
     # Parsear processos do arquivo
     print("\n📖 Lendo processos do arquivo...")
     try:
-        # Tentar usar JSON primeiro se existir
-        if os.path.exists(args.json) and args.file.endswith('.ts'):
-            print(f"📄 Usando arquivo JSON: {args.json}")
-            processes = parse_processes_from_json(args.json)
+        # JSON só quando pedido explicitamente (--json ou --file *.json / *.ndjson)
+        source = args.json or args.file
+        if is_ndjson(source):
+            # NDJSON: leitura preguiçosa, o envio começa antes do fim do arquivo
+            print(f"🌊 Lendo NDJSON em streaming: {source}")
+            processes = metrics.iter_span('parse', iter_ndjson(source))
         else:
-            processes = parse_typescript_array(args.file)
-        print(f"✅ {len(processes)} processos encontrados")
+            with metrics.span('parse'):
+                if args.watch:
+                    # O índice de offsets do --watch já traz o catálogo parseado
+                    with open(args.file, 'rb') as f:
+                        watch_index = SpanIndex.from_bytes(f.read())
+                    processes = watch_index.catalog()
+                elif args.json:
+                    print(f"📄 Usando arquivo JSON: {args.json}")
+                    processes = parse_processes_from_json(args.json)
+                elif args.file.endswith('.json'):
+                    processes = parse_processes_from_json(args.file)
+                elif is_snapshot(args.file):
+                    # Snapshot colunar (process_model.py): objetos Process, sem parse
+                    print(f"⚡ Usando snapshot binário: {args.file}")
+                    processes = read_snapshot(args.file)
+                else:
+                    processes = parse_typescript_array(args.file)
+        if isinstance(processes, list):
+            print(f"✅ {len(processes)} processos encontrados")
     except Exception as e:
         print(f"❌ Erro ao ler arquivo: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
     
+    if (args.dry_run or args.dsn or args.incremental) and not isinstance(processes, list):
+        # Estes modos precisam do catálogo inteiro (contagem, pré-filtro, manifest)
+        processes = list(processes)
+        print(f"✅ {len(processes)} processos encontrados")
+    
     if args.dry_run:
         print("\n🔍 DRY RUN - Apenas simulação")
         for i, process in enumerate(processes[:5], 1):  # Mostrar apenas os 5 primeiros
@@ -365,6 +924,50 @@ def main():
         print(f"\n... e mais {len(processes) - 5} processos")
         return
     
+    try:
+        journal = SeedJournal.open(args.journal, describe_target(args.dsn or args.url), args.resume)
+    except ValueError as e:
+        print(f"❌ Erro ao abrir journal: {e}")
+        sys.exit(1)
+    if args.resume:
+        pending = journal.pending(processes, journal_key)
+        if isinstance(processes, list):
+            processes = list(pending)
+            print(f"\n🧾 Journal: {journal.resumed} já efetivados, retomando {len(processes)} processos")
+        else:
+            processes = pending
+            print(f"\n🧾 Journal: retomando a partir de {len(journal.done)} processos efetivados")
+        if isinstance(processes, list) and not processes:
+            print("✨ Nada pendente no journal")
+            return
+    
+    if args.dsn:
+        if args.incremental:
+            print("⚠️  --incremental não é suportado com --dsn; usando COPY com ON CONFLICT (name)")
+        seed_via_postgres(args, processes, journal)
+        if args.entity_index:
+            print("⚠️  --entity-index usa a API do Supabase; rode scripts/entity_index.py após o seed via --dsn")
+        return
+    
+    manifest = None
+    if args.incremental or args.watch:
+        manifest = SeedManifest.load(args.manifest, describe_target(args.url))
+        if manifest.discarded_target is not None:
+            print(f"⚠️  Manifest {args.manifest} é de outro destino ({manifest.discarded_target!r}); "
+                  f"ignorado e regravado para {manifest.target!r}")
+        pending = [
+            process for process in processes
+            if not manifest.is_unchanged(process.get('name', ''),
+                                         convert_process_to_db_format(process, '', diagram=False)['process']['content_hash'])
+        ]
+        print(f"\n🧾 Manifest: {args.manifest} ({len(processes) - len(pending)} inalterados)")
+        if not pending and not args.watch:
+            print("✨ Nenhuma alteração desde o último seed, nada a enviar")
+            return
+    
+    # Criar cliente Supabase
+    supabase: Client = create_client(args.url, args.key)
+    
     # Obter ou criar stakeholder Sistema
     print("\n👤 Obtendo stakeholder Sistema...")
     try:
@@ -375,21 +978,48 @@ def main():
         sys.exit(1)
     
     # Inserir processos
-    print(f"\n💾 Inserindo {len(processes)} processos no banco...")
-    stats = seed_processes(supabase, processes, creator_id)
+    if isinstance(processes, list):
+        print(f"\n💾 Inserindo {len(processes)} processos no banco...")
+    else:
+        print("\n💾 Inserindo processos no banco à medida que são lidos...")
+    runner = RequestRunner(
+        rate_limiter=TokenBucket(args.rate_limit) if args.rate_limit > 0 else None,
+        max_retries=args.max_retries,
+    )
+    if args.concurrency > 1:
+        print(f"⚡ Concorrência: {args.concurrency} requisições em paralelo")
+    if args.rpc and manifest is None:
+        print(f"🧮 Modo RPC: seed_processes_bulk, payloads de até {args.max_bytes // 1024} KB")
+    elif args.batch_size > 0 and manifest is None:
+        print(f"📦 Modo em lote: {args.batch_size} processos por requisição")
+    with profile(args.profile), metrics.span('seed'):
+        if manifest is not None:
+            stats = seed_processes_incremental(supabase, processes, creator_id, manifest,
+                                               args.batch_size or 100, args.concurrency, runner, journal)
+        elif args.rpc:
+            stats = seed_processes_rpc(supabase, processes, creator_id, args.max_bytes,
+                                       args.concurrency, runner, journal)
+        elif args.batch_size > 0:
+            stats = seed_processes_bulk(supabase, processes, creator_id, args.batch_size,
+                                        args.concurrency, runner, journal)
+        else:
+            stats = seed_processes(supabase, processes, creator_id, args.concurrency, runner, journal)
     
-    # Resumo
-    print("\n" + "="*50)
-    print("📊 RESUMO")
-    print("="*50)
-    print(f"Total de processos: {stats['total']}")
-    print(f"✅ Criados com sucesso: {stats['success']}")
-    print(f"⏭️  Já existiam: {stats['skipped']}")
-    print(f"❌ Erros: {stats['errors']}")
-    print("="*50)
+    if journal.resumed and not isinstance(processes, list):
+        print(f"🧾 {journal.resumed} processos já efetivados segundo o journal ({args.journal})")
+    metrics.annotate(stats=stats, retries=runner.retries, resumed=journal.resumed)
+    print_summary(stats, runner.retries, exit_on_error=not args.watch)
     
-    if stats['errors'] > 0:
-        sys.exit(1)
+    if args.entity_index:
+        # Só processos com versão nova desde a última indexação são reindexados
+        print("\n🗂️  Atualizando índice de entidades...")
+        index_stats = sync_entity_index(supabase, runner=runner)
+        metrics.annotate(entity_index=index_stats)
+        print_sync_summary(index_stats)
+    
+    if args.watch:
+        watch_and_seed(supabase, args.file, watch_index, creator_id, manifest, args.watch_interval,
+                       args.batch_size or 100, args.concurrency, runner, args.entity_index)
 
 
 if __name__ == '__main__':
@@ -4,39 +4,19 @@ Script para executar seed de processos via MCP do Supabase.
 Lê o arquivo SQL e executa em lotes.
 """
 
+import itertools
 import json
 import sys
 from pathlib import Path
 
-# Mapeamentos
-CATEGORY_MAP = {
-    "Governança": "governanca",
-    "Acesso e Segurança": "acesso_seguranca",
-    "Operação": "operacao",
-    "Áreas Comuns": "areas_comuns",
-    "Convivência": "convivencia",
-    "Eventos": "eventos",
-    "Emergências": "emergencias",
-}
+from catalog_cache import load_catalog
+from catalog_stream import iter_ndjson
+from instrumentation import add_instrumentation_arguments, metrics, profile
+from seed_journal import SeedJournal
+from sql_emitter import DEFAULT_MAX_BYTES, journal_key, process_to_record, write_recordset_sql
 
-DOCUMENT_TYPE_MAP = {
-    "Manual": "manual",
-    "Regulamento": "regulamento",
-    "POP": "pop",
-    "Fluxograma": "fluxograma",
-    "Aviso": "aviso",
-    "Comunicado": "comunicado",
-    "Checklist": "checklist",
-    "Formulário": "formulario",
-    "Política": "politica",
-}
-
-STATUS_MAP = {
-    "rascunho": "rascunho",
-    "em_revisao": "em_revisao",
-    "aprovado": "aprovado",
-    "rejeitado": "rejeitado",
-}
+OUTPUT_FILE = 'scripts/seed_remaining_processes.sql'
+DEFAULT_JOURNAL_PATH = 'scripts/.seed_journal_mcp.ndjson'
 
 def escape_sql(text):
     """Escapa texto para SQL."""
@@ -44,72 +24,112 @@ def escape_sql(text):
         return ""
     return text.replace("'", "''")
 
+@metrics.timed('generate_sql')
 def generate_sql_for_process(proc):
-    """Gera SQL para um processo."""
-    name = escape_sql(proc['name'])
-    category = CATEGORY_MAP.get(proc['category'], 'governanca')
-    doc_type = DOCUMENT_TYPE_MAP.get(proc.get('documentType', 'Manual'), 'manual')
-    status = STATUS_MAP.get(proc.get('status', 'em_revisao'), 'em_revisao')
-    description = escape_sql(proc.get('description', ''))
-    
-    content = {
-        'description': proc.get('description', ''),
-        'workflow': proc.get('workflow', []),
-        'entities': proc.get('entities', []),
-        'variables': proc.get('variables', []),
-    }
-    
-    if proc.get('mermaid_diagram'):
-        content['mermaid_diagram'] = proc['mermaid_diagram']
-    
-    if proc.get('raci'):
-        content['raci'] = proc['raci']
-    
-    content_json = json.dumps(content, ensure_ascii=False).replace("'", "''")
-    entities_json = json.dumps(proc.get('entities', []), ensure_ascii=False)
-    variables = {var: None for var in proc.get('variables', [])}
-    variables_json = json.dumps(variables, ensure_ascii=False)
+    """
+    Gera SQL para um processo a partir de process_to_record (mesmo conteúdo
+    e content_hash do seed via API). seed_single_process não recebe o hash:
+    um UPDATE o grava em seguida, para o --incremental reconhecer o processo.
+    """
+    record = process_to_record(proc)
+    name = escape_sql(record['name'])
+    description = escape_sql(record['content_text'])
+    content_json = escape_sql(json.dumps(record['content'], ensure_ascii=False))
+    entities_json = escape_sql(json.dumps(record['entities_involved'], ensure_ascii=False))
+    variables_json = escape_sql(json.dumps(record['variables_applied'], ensure_ascii=False))
     
     return f"""SELECT seed_single_process(
     '{name}',
-    '{category}',
-    '{doc_type}',
-    '{status}',
+    '{record['category']}',
+    '{record['document_type']}',
+    '{record['status']}',
     '{description}',
     '{content_json}'::jsonb,
     '{entities_json}'::jsonb,
     '{variables_json}'::jsonb
-);"""
+);
+UPDATE public.processes SET content_hash = '{record['content_hash']}'
+WHERE name = '{name}' AND content_hash IS NULL;"""
 
 def main():
-    # Ler processos
-    with open('scripts/processes.json', 'r', encoding='utf-8') as f:
-        processes = json.load(f)
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Gerar SQL de seed para execução via MCP')
+    parser.add_argument('--set-based', action='store_true',
+                        help='Um statement jsonb_to_recordset por lote em vez de um por processo')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help='Tamanho máximo do payload de cada lote (com --set-based)')
+    parser.add_argument('--input', help='Ler processos de um NDJSON (em streaming) em vez do processes.ts')
+    parser.add_argument('--skip', type=int, default=3,
+                        help='Pular os N primeiros processos (inseridos antes do journal)')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH,
+                        help='Journal de checkpoints do SQL gerado/aplicado')
+    parser.add_argument('--resume', action='store_true',
+                        help='Gerar só os processos ainda não aplicados segundo o journal')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args.metrics)
     
-    # Pular os 3 primeiros (já inseridos)
-    remaining = processes[3:]
+    journal = SeedJournal.open(args.journal, OUTPUT_FILE, args.resume)
+    hashes = {}
     
-    print(f"📊 Total: {len(processes)} processos")
-    print(f"✅ Já inseridos: 3")
-    print(f"⏳ Restam: {len(remaining)} processos")
+    def key(proc):
+        name, content_hash = journal_key(proc)
+        hashes.setdefault(name, content_hash)
+        return name, content_hash
+    
+    # Ler processos: NDJSON linha a linha ou cache compartilhado do processes.ts
+    if args.input:
+        processes = metrics.iter_span('parse', iter_ndjson(args.input))
+    else:
+        with metrics.span('parse'):
+            processes = load_catalog()
+    
+    # Pular os `skip` primeiros (já inseridos) e o que o journal já registra
+    remaining = journal.pending(itertools.islice(processes, args.skip, None), key)
+    if isinstance(processes, list):
+        remaining = list(remaining)
+    if args.resume:
+        print(f"🧾 Journal: {len(journal.done)} processos já aplicados")
+    
+    if args.set_based:
+        output_file = OUTPUT_FILE
+        with profile(args.profile), metrics.span('emit'), open(output_file, 'w', encoding='utf-8') as f:
+            stats = write_recordset_sql(remaining, f, args.max_bytes)
+        journal.emit(output_file, hashes.items())
+        print(f"✅ SQL gerado em: {output_file}")
+        print(f"📦 {stats['processes']} processos em {stats['batches']} statement(s)")
+        print(f"💡 Depois de aplicar: python scripts/seed_journal.py --journal {args.journal} commit {output_file}")
+        return
+    
+    if isinstance(processes, list):
+        print(f"📊 Total: {len(processes)} processos")
+        print(f"✅ Já inseridos: {args.skip + journal.resumed}")
+        print(f"⏳ Restam: {len(remaining)} processos")
     print(f"\n💡 Execute o SQL abaixo via MCP do Supabase:")
     print("="*70)
     
-    # Gerar SQL para todos os processos restantes
-    sql_statements = []
-    for proc in remaining:
-        sql_statements.append(generate_sql_for_process(proc))
-    
-    # Salvar em arquivo
-    output_file = 'scripts/seed_remaining_processes.sql'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('-- Seed dos processos restantes (32 processos)\n')
+    # Gerar SQL para os processos restantes, gravando um statement por vez
+    output_file = OUTPUT_FILE
+    count = 0
+    with profile(args.profile), metrics.span('emit'), open(output_file, 'w', encoding='utf-8') as f:
+        # Com --input (streaming) o total só é conhecido no fim
+        if isinstance(remaining, list):
+            f.write(f'-- Seed dos processos restantes ({len(remaining)} processos)\n')
+        else:
+            f.write('-- Seed dos processos restantes\n')
         f.write('-- Execute via MCP: mcp_supabase_Sindico_Virtual_execute_sql\n\n')
-        f.write('\n'.join(sql_statements))
+        for proc in remaining:
+            if count:
+                f.write('\n')
+            f.write(generate_sql_for_process(proc))
+            count += 1
+    journal.emit(output_file, hashes.items())
     
     print(f"\n✅ SQL gerado em: {output_file}")
-    print(f"📏 {len(sql_statements)} statements SQL")
+    print(f"📏 {count} processos (seed_single_process + content_hash)")
     print(f"\n💡 Para executar, use o MCP do Supabase com o conteúdo do arquivo")
+    print(f"   e depois: python scripts/seed_journal.py --journal {args.journal} commit {output_file}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Emissor de SQL set-based para o seed de processos.
+
+Em vez de um `SELECT seed_single_process(...)` por processo, cada lote vira
+um único statement: um array JSONB (dollar-quoted, sem escape manual)
+desempacotado com `jsonb_to_recordset` e inserido com `INSERT ... SELECT` em
+`processes` e `process_versions`. Os lotes são limitados por bytes de payload
+e escritos em streaming, então a memória fica limitada a um lote.
+
+Para cargas maiores há o formato `copy`: um script psql que carrega uma
+tabela temporária via `COPY ... FROM STDIN` e faz o merge set-based.
+
+Uso:
+    python scripts/sql_emitter.py --output scripts/seed_set_based.sql
+    python scripts/sql_emitter.py --format copy --output scripts/seed_copy.sql
+"""
+
+import itertools
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from catalog_cache import DEFAULT_SOURCE, load_catalog
+from catalog_stream import is_ndjson, iter_ndjson
+
+DEFAULT_MAX_BYTES = 256 * 1024
+SYSTEM_STAKEHOLDER_EMAIL = 'sistema@villadelfiori.com'
+
+# Colunas do registro (ordem usada no recordset e no COPY)
+RECORD_COLUMNS = [
+    ('name', 'TEXT'),
+    ('category', 'TEXT'),
+    ('document_type', 'TEXT'),
+    ('status', 'TEXT'),
+    ('content_hash', 'TEXT'),
+    ('content', 'JSONB'),
+    ('content_text', 'TEXT'),
+    ('entities_involved', 'JSONB'),
+    ('variables_applied', 'JSONB'),
+]
+
+MERGE_SQL = """INSERT INTO public.processes (
+        name, category, subcategory, document_type, status, creator_id, content_hash
+    )
+    SELECT d.name, d.category::processcategory, NULL, d.document_type::documenttype,
+           d.status::processstatus, creator.id, d.content_hash
+    FROM {source} d CROSS JOIN creator
+    ON CONFLICT (name) DO NOTHING
+    RETURNING id, name
+)
+INSERT INTO public.process_versions (
+    process_id, version_number, content, content_text,
+    entities_involved, variables_applied, created_by, status
+)
+SELECT i.id, 1, d.content, d.content_text, d.entities_involved, d.variables_applied,
+       creator.id, d.status::processstatus
+FROM inserted i
+JOIN {source} d ON d.name = i.name
+CROSS JOIN creator;"""
+
+CREATOR_CTE = f"""creator AS (
+    SELECT id FROM public.stakeholders WHERE email = '{SYSTEM_STAKEHOLDER_EMAIL}' LIMIT 1
+)"""
+
+
+def process_to_record(proc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte um processo do mock no registro plano usado pelo emissor, a
+    partir de convert_process_to_db_format (mesmo conteúdo e content_hash
+    do seed via API, para o --incremental reconhecer o que já foi enviado).
+    """
+    # Import tardio: seed_processes_to_supabase importa este módulo
+    from seed_processes_to_supabase import convert_process_to_db_format
+
+    db_data = convert_process_to_db_format(proc, '')
+    process, version = db_data['process'], db_data['version']
+    return {
+        'name': process['name'],
+        'category': process['category'],
+        'document_type': process['document_type'],
+        'status': process['status'],
+        'content_hash': process['content_hash'],
+        'content': version['content'],
+        'content_text': version['content_text'],
+        'entities_involved': version['entities_involved'],
+        'variables_applied': version['variables_applied'],
+    }
+
+
+def journal_key(proc: Dict[str, Any]) -> Tuple[str, str]:
+    """(nome, content_hash) usados no journal de checkpoints dos scripts MCP."""
+    from seed_processes_to_supabase import journal_key as seed_journal_key
+
+    return seed_journal_key(proc)
+
+
+def iter_record_batches(processes: Iterable[Dict[str, Any]], max_bytes: int = DEFAULT_MAX_BYTES
+                        ) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Agrupa os processos em lotes de no máximo `max_bytes` de JSON (um
+    processo maior que o limite vira um lote sozinho). Cada item é
+    (nome, json do registro). Nomes repetidos são descartados.
+    """
+    seen = set()
+    batch: List[Tuple[str, str]] = []
+    size = 0
+    for proc in processes:
+        if proc['name'] in seen:
+            continue
+        seen.add(proc['name'])
+        encoded = json.dumps(process_to_record(proc), ensure_ascii=False, separators=(',', ':'))
+        encoded_size = len(encoded.encode('utf-8')) + 1
+        if batch and size + encoded_size > max_bytes:
+            yield batch
+            batch, size = [], 0
+        batch.append((proc['name'], encoded))
+        size += encoded_size
+    if batch:
+        yield batch
+
+
+def dollar_quote(text: str, tag: str = 'seed') -> str:
+    """Dollar-quoting com uma tag que não aparece no texto."""
+    candidate, n = tag, 0
+    while f'${candidate}$' in text:
+        n += 1
+        candidate = f'{tag}{n}'
+    return f'${candidate}${text}${candidate}$'
+
+
+def render_recordset_statement(batch: List[Tuple[str, str]], batch_num: Optional[int] = None) -> str:
+    """Gera o statement set-based (jsonb_to_recordset) de um lote."""
+    payload = '[' + ','.join(encoded for _, encoded in batch) + ']'
+    columns = ',\n        '.join(f'{name} {sql_type}' for name, sql_type in RECORD_COLUMNS)
+    header = f"-- Lote {batch_num}: " if batch_num is not None else "-- Lote: "
+    return (
+        f"{header}{len(batch)} processos, {len(payload.encode('utf-8'))} bytes\n"
+        f"WITH {CREATOR_CTE}, data AS (\n"
+        f"    SELECT * FROM jsonb_to_recordset({dollar_quote(payload)}::jsonb) AS d(\n"
+        f"        {columns}\n"
+        f"    )\n"
+        f"), inserted AS (\n"
+        f"    {MERGE_SQL.format(source='data')}\n"
+    )
+
+
+def write_recordset_sql(processes: Iterable[Dict[str, Any]], out: TextIO,
+                        max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, int]:
+    """Escreve um statement por lote em `out`. Retorna estatísticas da emissão."""
+    stats = {'batches': 0, 'processes': 0}
+    out.write("-- Seed set-based de processos (jsonb_to_recordset)\n")
+    out.write("-- Requer índice único em processes(name) (migration 051)\n\n")
+    for batch_num, batch in enumerate(iter_record_batches(processes, max_bytes), 1):
+        out.write(render_recordset_statement(batch, batch_num))
+        out.write("\n\n")
+        stats['batches'] += 1
+        stats['processes'] += len(batch)
+    return stats
+
+
+def _copy_escape(value: Any) -> str:
+    """Escapa um valor no formato texto do COPY."""
+    if value is None:
+        return '\\N'
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def write_copy_sql(processes: Iterable[Dict[str, Any]], out: TextIO) -> Dict[str, int]:
+    """
+    Escreve um script psql: tabela temporária de staging carregada com
+    `COPY ... FROM STDIN` e merge set-based em processes/process_versions.
+    """
+    stats = {'batches': 1, 'processes': 0}
+    column_names = ', '.join(name for name, _ in RECORD_COLUMNS)
+    column_defs = ',\n    '.join(f'{name} {sql_type}' for name, sql_type in RECORD_COLUMNS)
+
+    out.write("-- Seed de processos via COPY (executar com psql)\n")
+    out.write("-- Requer índice único em processes(name) (migration 051)\n\n")
+    out.write("BEGIN;\n\n")
+    out.write(f"CREATE TEMP TABLE seed_process_staging (\n    {column_defs}\n) ON COMMIT DROP;\n\n")
+    out.write(f"COPY seed_process_staging ({column_names}) FROM STDIN;\n")
+    seen = set()
+    for proc in processes:
+        if proc['name'] in seen:
+            continue
+        seen.add(proc['name'])
+        record = process_to_record(proc)
+        out.write('\t'.join(_copy_escape(record[name]) for name, _ in RECORD_COLUMNS))
+        out.write('\n')
+        stats['processes'] += 1
+    out.write("\\.\n\n")
+    out.write(f"WITH {CREATOR_CTE}, inserted AS (\n    {MERGE_SQL.format(source='seed_process_staging')}\n\n")
+    out.write("COMMIT;\n")
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Gerar SQL set-based para seed de processos')
+    parser.add_argument('--file', help='Arquivo processes.ts', default=DEFAULT_SOURCE)
+    parser.add_argument('--json', help='Ler de um arquivo JSON (ou NDJSON, em streaming) em vez do processes.ts')
+    parser.add_argument('--output', help='Arquivo SQL de saída', default='scripts/seed_set_based.sql')
+    parser.add_argument('--format', choices=['recordset', 'copy'], default='recordset',
+                        help='recordset: um statement por lote; copy: COPY FROM STDIN (psql)')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help='Tamanho máximo do payload JSON de cada lote')
+    parser.add_argument('--skip', type=int, default=0, help='Pular os N primeiros processos')
+    args = parser.parse_args()
+
+    try:
+        if args.json and is_ndjson(args.json):
+            processes = iter_ndjson(args.json)
+        elif args.json:
+            with open(args.json, 'r', encoding='utf-8') as f:
+                processes = json.load(f)
+        else:
+            processes = load_catalog(args.file)
+    except FileNotFoundError as e:
+        print(f"❌ Arquivo não encontrado: {e.filename}")
+        sys.exit(1)
+
+    remaining = itertools.islice(processes, args.skip, None)
+    with open(args.output, 'w', encoding='utf-8') as out:
+        if args.format == 'copy':
+            stats = write_copy_sql(remaining, out)
+        else:
+            stats = write_recordset_sql(remaining, out, args.max_bytes)
+
+    print(f"✅ SQL gerado em: {args.output}")
+    print(f"📦 {stats['processes']} processos em {stats['batches']} statement(s)")
+
+
+if __name__ == '__main__':
+    main()
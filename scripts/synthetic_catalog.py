@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Gerador de catálogos sintéticos no formato de frontend/src/data/processes.ts
+(interface, imports de ícones, objetos com workflow, RACI e diagrama mermaid
+em template string), para benchmarks com muito mais processos que o catálogo
+real. A saída é determinística para a mesma semente.
+
+Uso:
+    python scripts/synthetic_catalog.py --count 10000 --output /tmp/processes_10k.ts
+    python scripts/synthetic_catalog.py --count 1000 --workflow-steps 20 --raci-rows 20 --mermaid-lines 200
+"""
+
+import json
+import os
+import random
+from typing import Optional, TextIO
+
+from process_maps import CATEGORY_MAP, DOCUMENT_TYPE_MAP, STATUS_MAP
+
+ICONS = ['FileText', 'Shield', 'Lock', 'Wrench', 'Building2', 'Users', 'Calendar', 'AlertTriangle']
+ENTITIES = ['Síndico', 'Conselho Consultivo', 'Administradora', 'Moradores', 'Portaria', 'Zelador',
+            'Faxineiro', 'Fornecedores', 'Visitantes', 'Corpo de Bombeiros', 'Segurança']
+WORDS = ['processo', 'condomínio', 'manutenção', 'registro', 'aprovação', 'comunicação', 'área comum',
+         'segurança', 'reserva', 'vistoria', 'documento', 'prazo', 'responsável', 'regulamento',
+         'emergência', 'controle', 'acesso', 'relatório', 'assembleia', 'orçamento']
+
+HEADER = '''import { %s, LucideIcon } from "lucide-react"
+import { RACIEntry } from "@/types/raci"
+
+export interface Process {
+  id: number
+  name: string
+  category: string
+  icon: LucideIcon
+  status: string
+  description: string
+  workflow: string[]
+  entities: string[]
+  variables: string[]
+  documentType: string
+  mermaid_diagram?: string
+  raci?: RACIEntry[] // Matriz RACI para o processo
+}
+
+export const processesData: Process[] = [
+''' % ', '.join(ICONS)
+
+
+def _ts_string(text: str) -> str:
+    # json.dumps gera um literal válido em TS (aspas duplas, escapes \\" e \\n)
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _ts_list(items, indent: str) -> str:
+    if not items:
+        return '[]'
+    inner = f',\n{indent}  '.join(_ts_string(item) for item in items)
+    return f'[\n{indent}  {inner}\n{indent}]'
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _mermaid(rng: random.Random, lines: int) -> str:
+    body = ['flowchart TD']
+    for n in range(max(0, lines - 1)):
+        if n % 4 == 3:
+            body.append(f'    style N{n} fill:#1e3a8a,stroke:#3b82f6,color:#fff')
+        else:
+            body.append(f'    N{n}["{_sentence(rng, 3)}<br/>({rng.choice(ENTITIES)})"] --> N{n + 1}')
+    # Template string: crase e ${ precisam de escape
+    return '\n'.join(body).replace('`', '\\`').replace('${', '\\${')
+
+
+def render_process(rng: random.Random, pid: int, workflow_steps: int, raci_rows: int, mermaid_lines: int) -> str:
+    category = rng.choice(list(CATEGORY_MAP))
+    steps = [f"{n}. {_sentence(rng, rng.randint(4, 10))}" for n in range(1, workflow_steps + 1)]
+    entities = rng.sample(ENTITIES, k=rng.randint(2, 5))
+    variables = [f"var_{pid}_{n}" for n in range(rng.randint(0, 4))]
+    # Aspas escapadas na descrição exercitam o lexer
+    description = f'{_sentence(rng, 25)} "{rng.choice(WORDS)}" {_sentence(rng, 15)}.'
+
+    lines = [
+        '  {',
+        f'    id: {pid},',
+        f'    name: {_ts_string(f"{_sentence(rng, 3)} #{pid}")},',
+        f'    category: {_ts_string(category)},',
+        f'    icon: {rng.choice(ICONS)},',
+        f'    status: {_ts_string(rng.choice(list(STATUS_MAP)))},',
+        f'    description: {_ts_string(description)},',
+        f'    workflow: {_ts_list(steps, "    ")},',
+        f'    entities: {_ts_list(entities, "    ")},',
+        f'    variables: {_ts_list(variables, "    ")},',
+        f'    documentType: {_ts_string(rng.choice(list(DOCUMENT_TYPE_MAP)))},',
+    ]
+    if mermaid_lines:
+        lines.append(f'    mermaid_diagram: `{_mermaid(rng, mermaid_lines)}`,')
+    if raci_rows:
+        entries = []
+        for n in range(raci_rows):
+            step = steps[n % len(steps)] if steps else f"{n + 1}. Etapa"
+            entries.append(
+                '      {\n'
+                f'        step: {_ts_string(step)},\n'
+                f'        responsible: {_ts_list(rng.sample(ENTITIES, 1), "        ")},\n'
+                f'        accountable: {_ts_list(rng.sample(ENTITIES, 1), "        ")},\n'
+                f'        consulted: {_ts_list(rng.sample(ENTITIES, rng.randint(0, 2)), "        ")},\n'
+                f'        informed: {_ts_list(rng.sample(ENTITIES, rng.randint(0, 2)), "        ")}\n'
+                '      }'
+            )
+        lines.append('    raci: [\n' + ',\n'.join(entries) + '\n    ]')
+    else:
+        lines[-1] = lines[-1].rstrip(',')
+    lines.append('  }')
+    return '\n'.join(lines)
+
+
+def write_catalog(out: TextIO, count: int, workflow_steps: int = 6, raci_rows: int = 6,
+                  mermaid_lines: int = 15, seed: Optional[int] = 0) -> None:
+    """Escreve um processes.ts sintético com `count` processos (em streaming)."""
+    rng = random.Random(seed)
+    out.write(HEADER)
+    for pid in range(1, count + 1):
+        out.write(render_process(rng, pid, workflow_steps, raci_rows, mermaid_lines))
+        out.write(',\n' if pid < count else '\n')
+    out.write(']\n')
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Gerar processes.ts sintético para benchmarks')
+    parser.add_argument('--count', type=int, default=1000, help='Número de processos')
+    parser.add_argument('--workflow-steps', type=int, default=6, help='Passos de workflow por processo')
+    parser.add_argument('--raci-rows', type=int, default=6, help='Linhas RACI por processo')
+    parser.add_argument('--mermaid-lines', type=int, default=15, help='Linhas do diagrama mermaid (0 = sem)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='scripts/.cache/processes_synthetic.ts')
+    args = parser.parse_args()
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as out:
+        write_catalog(out, args.count, args.workflow_steps, args.raci_rows, args.mermaid_lines, args.seed)
+    print(f"✅ {args.count} processos sintéticos em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Lexer/parser de passagem única para o subconjunto de TypeScript usado em
+frontend/src/data/processes.ts (array de objetos literais).
+
+Lê o texto uma única vez, em tempo linear, e entrega os processos um a um
+conforme cada objeto de topo do array é fechado. Suporta strings com aspas
+simples/duplas, template literals (incluindo chaves dentro de diagramas
+mermaid), arrays e objetos aninhados, comentários e vírgulas finais.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Um único regex mestre: cada chamada a match() consome exatamente um token
+TOKEN_RE = re.compile(r'''
+    (?P<ws>(?:\s+|//[^\n]*|/\*[\s\S]*?\*/)+)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<template>`(?:[^`\\]|\\[\s\S])*`)
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,=])
+  | (?P<other>[\s\S])
+''', re.VERBOSE)
+
+TEMPLATE_ESCAPE_RE = re.compile(r'\\([\s\S])')
+TEMPLATE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+
+class ParseError(Exception):
+    """Erro de sintaxe com a posição (offset) no texto de origem."""
+
+    def __init__(self, message: str, pos: int, text: str = ''):
+        self.reason = message
+        if text:
+            line = text.count('\n', 0, pos) + 1
+            message = f"{message} (linha {line})"
+        super().__init__(message)
+        self.pos = pos
+
+
+class Identifier(str):
+    """Referência a um identificador (ex.: `icon: FileText`), sem valor de dado."""
+
+
+def _decode_string(raw: str) -> str:
+    body = raw[1:-1]
+    if '\\' not in body:
+        return body
+    if raw[0] == "'":
+        body = body.replace("\\'", "'").replace('"', '\\"')
+    return json.loads(f'"{body}"')
+
+
+def _decode_template(raw: str) -> str:
+    body = raw[1:-1]
+    if '\\' not in body:
+        return body
+    return TEMPLATE_ESCAPE_RE.sub(lambda m: TEMPLATE_ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+class Parser:
+    """Parser recursivo descendente sobre o fluxo de tokens de TOKEN_RE."""
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+        self._peeked: Optional[Tuple[str, str, int, int]] = None
+
+    def next_token(self) -> Tuple[str, str, int, int]:
+        """Retorna (tipo, texto, início, fim); tipo 'eof' no fim do texto."""
+        if self._peeked is not None:
+            tok, self._peeked = self._peeked, None
+            return tok
+        text, pos = self.text, self.pos
+        while True:
+            if pos >= len(text):
+                self.pos = pos
+                return ('eof', '', pos, pos)
+            m = TOKEN_RE.match(text, pos)
+            pos = m.end()
+            kind = m.lastgroup
+            if kind != 'ws':
+                self.pos = pos
+                return (kind, m.group(kind), m.start(), pos)
+
+    def peek(self) -> Tuple[str, str, int, int]:
+        if self._peeked is None:
+            self._peeked = self.next_token()
+        return self._peeked
+
+    def expect(self, value: str) -> Tuple[str, str, int, int]:
+        tok = self.next_token()
+        if tok[1] != value or tok[0] not in ('punct', 'other'):
+            raise ParseError(f"Esperado '{value}', encontrado {tok[1]!r}", tok[2], self.text)
+        return tok
+
+    def parse_value(self) -> Any:
+        kind, value, start, _ = self.next_token()
+        if kind == 'string':
+            return _decode_string(value)
+        if kind == 'template':
+            return _decode_template(value)
+        if kind == 'number':
+            return float(value) if '.' in value else int(value)
+        if kind == 'ident':
+            if value in KEYWORDS:
+                return KEYWORDS[value]
+            return Identifier(value)
+        if kind == 'punct' and value == '{':
+            return self._parse_object_body()
+        if kind == 'punct' and value == '[':
+            return self._parse_array_body()
+        raise ParseError(f"Valor inesperado: {value!r}", start, self.text)
+
+    def _parse_object_body(self) -> Dict[str, Any]:
+        obj: Dict[str, Any] = {}
+        while True:
+            kind, value, start, _ = self.next_token()
+            if kind == 'punct' and value == '}':
+                return obj
+            if kind == 'ident':
+                key = value
+            elif kind == 'string':
+                key = _decode_string(value)
+            else:
+                raise ParseError(f"Chave inválida: {value!r}", start, self.text)
+            self.expect(':')
+            obj[key] = self.parse_value()
+            kind, value, start, _ = self.next_token()
+            if kind == 'punct' and value == '}':
+                return obj
+            if not (kind == 'punct' and value == ','):
+                raise ParseError(f"Esperado ',' ou '}}', encontrado {value!r}", start, self.text)
+
+    def _parse_array_body(self) -> List[Any]:
+        items: List[Any] = []
+        while True:
+            kind, value, _, _ = self.peek()
+            if kind == 'punct' and value == ']':
+                self.next_token()
+                return items
+            items.append(self.parse_value())
+            kind, value, start, _ = self.next_token()
+            if kind == 'punct' and value == ']':
+                return items
+            if not (kind == 'punct' and value == ','):
+                raise ParseError(f"Esperado ',' ou ']', encontrado {value!r}", start, self.text)
+
+    def seek_array(self, array_name: Optional[str]) -> None:
+        """
+        Posiciona o parser logo após o '[' do array `array_name`
+        (ex.: `export const processesData: Process[] = [`). Sem nome, usa o
+        primeiro array atribuído com '='.
+        """
+        seen_name = array_name is None
+        while True:
+            kind, value, start, _ = self.next_token()
+            if kind == 'eof':
+                raise ParseError(f"Array '{array_name}' não encontrado", start, self.text)
+            if kind == 'ident' and value == array_name:
+                seen_name = True
+            elif seen_name and kind == 'punct' and value == '=':
+                kind, value, start, _ = self.next_token()
+                if kind == 'punct' and value == '[':
+                    return
+                seen_name = array_name is None
+
+    def iter_array_objects(self) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Itera (início, fim, objeto) para cada objeto do array corrente."""
+        while True:
+            kind, value, start, _ = self.next_token()
+            if kind == 'punct' and value == ']':
+                return
+            if not (kind == 'punct' and value == '{'):
+                raise ParseError(f"Esperado objeto, encontrado {value!r}", start, self.text)
+            obj = self._parse_object_body()
+            yield start, self.pos, obj
+            kind, value, start, _ = self.next_token()
+            if kind == 'punct' and value == ']':
+                return
+            if not (kind == 'punct' and value == ','):
+                raise ParseError(f"Esperado ',' ou ']', encontrado {value!r}", start, self.text)
+
+
+def normalize_process(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte o objeto literal no dicionário de processo usado pelos scripts:
+    remove referências a identificadores (ex.: icon) e apara o mermaid_diagram.
+    """
+    process = {key: value for key, value in obj.items() if not isinstance(value, Identifier)}
+    if isinstance(process.get('mermaid_diagram'), str):
+        process['mermaid_diagram'] = process['mermaid_diagram'].strip()
+    return process
+
+
+def iter_process_spans(text: str, array_name: Optional[str] = 'processesData'
+                       ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """Itera (início, fim, processo) com os offsets de cada objeto de topo no texto."""
+    parser = Parser(text)
+    parser.seek_array(array_name)
+    for start, end, obj in parser.iter_array_objects():
+        process = normalize_process(obj)
+        if process.get('name'):
+            yield start, end, process
+
+
+def iter_processes(text: str, array_name: Optional[str] = 'processesData') -> Iterator[Dict[str, Any]]:
+    """Itera os processos do texto TypeScript, na ordem em que aparecem."""
+    for _, _, process in iter_process_spans(text, array_name):
+        yield process
+
+
+def iter_processes_from_file(file_path: str, array_name: Optional[str] = 'processesData'
+                             ) -> Iterator[Dict[str, Any]]:
+    """Lê o arquivo uma vez e itera seus processos."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return iter_processes(text, array_name)
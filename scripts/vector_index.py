@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+Índice vetorial de knowledge_base_documents.embedding: recomenda os
+parâmetros, constrói o índice sem bloquear escritas e verifica o recall.
+
+A migration 014 deixa o IVFFlat comentado ("será criado após a primeira
+ingestão de dados") e, sem índice, toda chamada de search_knowledge_base é
+uma varredura sequencial. Este script:
+
+1. inspeciona a tabela: linhas com embedding, tipo da coluna (vector ou
+   halfvec), versão do pgvector, maintenance_work_mem, índice atual e uma
+   amostra dos vetores (concentração, duplicatas, equilíbrio das listas);
+2. escolhe HNSW (pgvector >= 0.5.0) ou IVFFlat e os parâmetros: m e
+   ef_construction, ou lists (linhas/1000 até 1M, √linhas acima) e probes
+   (√lists), como recomenda o pgvector;
+3. constrói com CREATE INDEX CONCURRENTLY num nome temporário e troca pelo
+   idx_kb_docs_embedding (o índice antigo atende as buscas até a troca);
+4. mede o recall@k contra a busca exata em consultas amostradas e dobra
+   ivfflat.probes/hnsw.ef_search até atingir o alvo, gravando o valor nas
+   funções search_knowledge_base* (ALTER FUNCTION ... SET);
+5. registra o build em vector_index_builds (migration 055).
+
+`ensure` é idempotente: cria o índice quando a tabela passa de --min-rows,
+refaz a verificação quando as linhas crescem --growth vezes desde o último
+build (reconstruindo se o IVFFlat ou os parâmetros recomendados mudaram) e
+reaplica o ajuste de busca se uma migration recriou as funções. A ingestão
+chama `ensure` com `--vector-index`.
+
+Uso:
+    python scripts/vector_index.py inspect --dsn "$DATABASE_URL"
+    python scripts/vector_index.py ensure --dsn "$DATABASE_URL"
+    python scripts/vector_index.py ensure --force --method ivfflat --target-recall 0.98
+    python scripts/vector_index.py verify --queries 100 --k 10
+    # Sem banco: recomendação e recall do IVFFlat simulado em NumPy
+    python scripts/vector_index.py advise --input scripts/kb_export.jsonl
+    python scripts/vector_index.py advise --synthetic 200000 --method ivfflat
+
+Requisitos:
+    pip install numpy "psycopg[binary]"
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+from quantize_embeddings import sample_queries
+from vector_search import VectorSearch, percentile, require_numpy, synthetic_index
+
+TABLE = 'public.knowledge_base_documents'
+INDEX_NAME = 'idx_kb_docs_embedding'
+BUILD_NAME = INDEX_NAME + '_new'
+SEARCH_FUNCTIONS = ('search_knowledge_base', 'search_knowledge_base_hybrid')
+
+# Abaixo disso a varredura sequencial é rápida e exata: não vale um índice aproximado
+MIN_INDEX_ROWS = 10_000
+# Refaz a verificação (e o IVFFlat) quando as linhas crescem este fator desde o último build
+GROWTH_FACTOR = 2.0
+TARGET_RECALL = 0.95
+DEFAULT_K = 10
+DEFAULT_QUERIES = 50
+SAMPLE_SIZE = 10_000
+
+SEARCH_SETTINGS = {'ivfflat': 'ivfflat.probes', 'hnsw': 'hnsw.ef_search'}
+MAX_EF_SEARCH = 1000
+
+
+def require_driver() -> None:
+    if psycopg is None:
+        print("Erro: Biblioteca 'psycopg' não instalada.")
+        print('Instale com: pip install "psycopg[binary]"')
+        sys.exit(1)
+
+
+def _version(text: Optional[str]) -> Tuple[int, ...]:
+    return tuple(int(part) for part in (text or '0').split('.') if part.isdigit())
+
+
+# ---- recomendação ----
+
+def distribution(sample: 'np.ndarray', lists: int = 0) -> Dict[str, Any]:
+    """
+    Forma da amostra: concentração (norma do vetor médio; 0 = espalhada,
+    perto de 1 = tudo no mesmo cone), fração de quase-duplicatas e, com
+    `lists`, o desequilíbrio das listas de um k-means (desvio/média).
+    """
+    norms = np.linalg.norm(sample, axis=1)
+    normalized = sample[norms > 0] / norms[norms > 0, None]
+    if not len(normalized):
+        return {'sample': 0}
+    rounded = {row.tobytes() for row in np.round(normalized, 3).astype(np.float16)}
+    stats: Dict[str, Any] = {
+        'sample': len(normalized),
+        'concentration': round(float(np.linalg.norm(normalized.mean(axis=0))), 4),
+        'duplicate_ratio': round(1 - len(rounded) / len(normalized), 4),
+    }
+    # O pgvector treina o IVFFlat com ~50 vetores por lista; amostras menores limitam as listas
+    lists = min(lists, len(normalized) // 50)
+    if lists > 1:
+        index = VectorSearch([{}] * len(normalized), np.ascontiguousarray(normalized, dtype=np.float32),
+                             np.ones(len(normalized), dtype=bool))
+        index.build_ivf(lists)
+        sizes = np.array([len(members) for members in index.lists], dtype=np.float64)
+        stats['list_imbalance'] = round(float(sizes.std() / sizes.mean()), 4)
+        stats['empty_lists'] = int((sizes == 0).sum())
+    return stats
+
+
+def ivfflat_lists(rows: int) -> int:
+    return max(1, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+
+
+def advise(rows: int, dimensions: int, stats: Optional[Dict[str, Any]] = None, method: str = 'auto',
+           pgvector_version: Optional[str] = None, column_type: str = 'vector',
+           maintenance_work_mem: Optional[int] = None, k: int = DEFAULT_K,
+           min_rows: int = MIN_INDEX_ROWS) -> Dict[str, Any]:
+    """Método, parâmetros de build e valor inicial do ajuste de busca, com os motivos."""
+    stats = stats or {}
+    notes: List[str] = []
+    if rows < min_rows:
+        return {'method': None, 'rows': rows,
+                'notes': [f"{rows} linhas < {min_rows}: busca exata (varredura) é rápida e sem perda de recall"]}
+    if method == 'auto':
+        method = 'hnsw' if _version(pgvector_version) >= (0, 5, 0) else 'ivfflat'
+        notes.append('HNSW: melhor recall por latência e sem re-treino com o crescimento'
+                     if method == 'hnsw' else f"pgvector {pgvector_version} sem HNSW: IVFFlat")
+    if dimensions > 2000 and column_type.startswith('vector'):
+        notes.append(f"{dimensions} dimensões: vector indexa até 2000, use halfvec (quantize_embeddings.py)")
+
+    vector_bytes = (2 if column_type.startswith('halfvec') else 4) * dimensions + 8
+    advice: Dict[str, Any] = {'method': method, 'rows': rows, 'dimensions': dimensions,
+                              'setting': SEARCH_SETTINGS[method], 'notes': notes}
+    if method == 'ivfflat':
+        lists = ivfflat_lists(rows)
+        probes = max(1, round(math.sqrt(lists)))
+        if stats.get('list_imbalance', 0) > 1.0:
+            probes = min(lists, probes * 2)
+            notes.append(f"listas desbalanceadas (desvio/média {stats['list_imbalance']}): probes em dobro")
+        advice.update(params={'lists': lists}, value=probes, max_value=lists)
+        estimate = rows * vector_bytes
+    else:
+        large = rows > 1_000_000
+        m = 24 if large else 16
+        ef_construction = 128 if large else 64
+        ef_search = max(40, 2 * k)
+        if stats.get('concentration', 0) > 0.5:
+            # Vetores num cone estreito: distâncias próximas, o grafo precisa de mais candidatos
+            ef_search *= 2
+            notes.append(f"vetores concentrados ({stats['concentration']}): ef_search em dobro")
+        advice.update(params={'m': m, 'ef_construction': ef_construction}, value=ef_search,
+                      max_value=MAX_EF_SEARCH)
+        # Estimativa: vetor + vizinhos da camada 0 (2m) e das superiores (~m/ln m), 6 bytes por TID
+        estimate = int(rows * (vector_bytes + 6 * (2 * m + m / math.log(m)) + 64))
+    advice['build_memory_estimate'] = estimate
+    if method == 'hnsw' and maintenance_work_mem and estimate > maintenance_work_mem:
+        notes.append(f"grafo estimado em {estimate / 1024 ** 2:.0f} MB > maintenance_work_mem "
+                     f"({maintenance_work_mem / 1024 ** 2:.0f} MB): o build fica bem mais lento; "
+                     f"use --maintenance-work-mem")
+    if stats.get('duplicate_ratio', 0) > 0.2:
+        notes.append(f"{stats['duplicate_ratio']:.0%} de quase-duplicatas na amostra: chunks repetidos ocupam o top-k")
+    return advice
+
+
+def simulate_ivfflat(index: VectorSearch, advice: Dict[str, Any], queries: 'np.ndarray', k: int = DEFAULT_K,
+                     target_recall: float = TARGET_RECALL) -> Dict[str, Any]:
+    """Recall@k do IVFFlat recomendado (k-means em NumPy), dobrando probes até o alvo."""
+    start = time.perf_counter()
+    index.build_ivf(advice['params']['lists'])
+    build_seconds = time.perf_counter() - start
+    exact = [{i for i, _ in index.search_indices(query, -1.0, k)} for query in queries]
+    probes = advice['value']
+    tried: List[Dict[str, Any]] = []
+    while True:
+        recalls = []
+        latencies = []
+        for query, expected in zip(queries, exact):
+            start = time.perf_counter()
+            found = {i for i, _ in index.search_indices(query, -1.0, k, nprobe=probes)}
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+        recall = sum(recalls) / len(recalls)
+        tried.append({'probes': probes, 'recall': round(recall, 4), 'p50_ms': round(percentile(latencies, 50), 3)})
+        if recall >= target_recall or probes >= advice['max_value']:
+            break
+        probes = min(advice['max_value'], probes * 2)
+    return {'build_seconds': round(build_seconds, 3), 'probes': probes, 'recall': tried[-1]['recall'],
+            'tried': tried}
+
+
+# ---- banco ----
+
+def connect(dsn: str) -> 'psycopg.Connection':
+    """Conexão em autocommit (CREATE/DROP INDEX CONCURRENTLY não rodam em transação)."""
+    require_driver()
+    return psycopg.connect(dsn, autocommit=True)
+
+
+def _parse_vector(text: str) -> List[float]:
+    # vector/halfvec em texto: '[0.1,0.2,...]'
+    return json.loads(text)
+
+
+def _vector_literal(values: Any) -> str:
+    return '[' + ','.join(f'{float(value):.7g}' for value in values) + ']'
+
+
+def current_index(conn: Any) -> Optional[Dict[str, Any]]:
+    """Índice ivfflat/hnsw de nome INDEX_NAME na coluna embedding (None se não existe)."""
+    row = conn.execute(
+        """SELECT am.amname, c.reloptions, ix.indisvalid
+           FROM pg_index ix
+           JOIN pg_class c ON c.oid = ix.indexrelid
+           JOIN pg_am am ON am.oid = c.relam
+           WHERE ix.indrelid = %s::regclass AND c.relname = %s""",
+        (TABLE, INDEX_NAME),
+    ).fetchone()
+    if not row:
+        return None
+    params = {}
+    for option in row[1] or []:
+        key, _, value = option.partition('=')
+        params[key] = int(value) if value.isdigit() else value
+    return {'method': row[0], 'params': params, 'valid': row[2]}
+
+
+def last_build(conn: Any) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        """SELECT method, params, search_setting, search_value, rows_at_build, recall, built_at
+           FROM public.vector_index_builds WHERE index_name = %s
+           ORDER BY built_at DESC LIMIT 1""",
+        (INDEX_NAME,),
+    ).fetchone()
+    if not row:
+        return None
+    keys = ('method', 'params', 'search_setting', 'search_value', 'rows_at_build', 'recall', 'built_at')
+    return dict(zip(keys, row))
+
+
+def inspect(conn: Any, sample_size: int = SAMPLE_SIZE) -> Dict[str, Any]:
+    """Linhas, tipo da coluna, pgvector, memória de manutenção, índice atual e amostra dos vetores."""
+    rows = conn.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE embedding IS NOT NULL").fetchone()[0]
+    column_type = conn.execute(
+        """SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+           WHERE attrelid = %s::regclass AND attname = 'embedding'""",
+        (TABLE,),
+    ).fetchone()[0]
+    version = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()
+    memory = conn.execute("SELECT pg_size_bytes(current_setting('maintenance_work_mem'))").fetchone()[0]
+
+    sample: List[List[float]] = []
+    if rows and sample_size:
+        # Amostra Bernoulli com folga; evita ORDER BY random() na tabela inteira
+        pct = min(100.0, 100.0 * sample_size * 1.5 / rows)
+        cursor = conn.execute(
+            f"""SELECT embedding::text FROM {TABLE} TABLESAMPLE BERNOULLI (%s)
+                WHERE embedding IS NOT NULL LIMIT %s""",
+            (pct, sample_size),
+        )
+        sample = [_parse_vector(text) for (text,) in cursor]
+    dimensions = len(sample[0]) if sample else int(column_type.split('(')[-1].rstrip(')') or 0)
+    return {
+        'rows': rows,
+        'column_type': column_type,
+        'dimensions': dimensions,
+        'pgvector': version[0] if version else None,
+        'maintenance_work_mem': memory,
+        'index': current_index(conn),
+        'last_build': last_build(conn),
+        'sample': np.asarray(sample, dtype=np.float32) if sample else None,
+    }
+
+
+def _opclass(column_type: str) -> str:
+    return 'halfvec_cosine_ops' if column_type.startswith('halfvec') else 'vector_cosine_ops'
+
+
+def build_index(conn: Any, advice: Dict[str, Any], column_type: str,
+                maintenance_work_mem: Optional[str] = None) -> float:
+    """CREATE INDEX CONCURRENTLY num nome temporário e troca pelo INDEX_NAME; devolve os segundos."""
+    if maintenance_work_mem:
+        conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+    # Um build concorrente interrompido deixa um índice inválido com o nome temporário
+    conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{BUILD_NAME}")
+    options = ', '.join(f'{key} = {value}' for key, value in advice['params'].items())
+    start = time.perf_counter()
+    conn.execute(
+        f"CREATE INDEX CONCURRENTLY {BUILD_NAME} ON {TABLE} "
+        f"USING {advice['method']} (embedding {_opclass(column_type)}) WITH ({options})"
+    )
+    seconds = time.perf_counter() - start
+    conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{INDEX_NAME}")
+    conn.execute(f"ALTER INDEX public.{BUILD_NAME} RENAME TO {INDEX_NAME}")
+    return seconds
+
+
+def _top_ids(conn: Any, query: str, column_type: str, k: int, setting: Optional[Tuple[str, int]]) -> List[Any]:
+    with conn.transaction():
+        if setting is None:
+            # Busca exata: sem índice
+            conn.execute("SET LOCAL enable_indexscan = off")
+            conn.execute("SET LOCAL enable_bitmapscan = off")
+        else:
+            conn.execute(f"SET LOCAL {setting[0]} = {int(setting[1])}")
+        cursor = conn.execute(
+            f"""SELECT id FROM {TABLE} WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> %s::{column_type} LIMIT %s""",
+            (query, k),
+        )
+        return [row[0] for row in cursor]
+
+
+def index_used(conn: Any, query: str, column_type: str, k: int) -> bool:
+    """Se o planejador usa o índice no ORDER BY ... LIMIT das funções de busca."""
+    plan = conn.execute(
+        f"""EXPLAIN SELECT id FROM {TABLE} WHERE embedding IS NOT NULL
+            ORDER BY embedding <=> %s::{column_type} LIMIT %s""",
+        (query, k),
+    ).fetchall()
+    return any(INDEX_NAME in line for (line,) in plan)
+
+
+def measure_recall(conn: Any, queries: List[str], column_type: str, setting: str, value: int,
+                   k: int = DEFAULT_K, exact: Optional[List[set]] = None) -> Dict[str, Any]:
+    """Recall@k do índice (com `setting = value`) contra a busca exata, e latência."""
+    if exact is None:
+        exact = [set(_top_ids(conn, query, column_type, k, None)) for query in queries]
+    recalls = []
+    latencies = []
+    for query, expected in zip(queries, exact):
+        start = time.perf_counter()
+        found = set(_top_ids(conn, query, column_type, k, (setting, value)))
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+    return {
+        'value': value,
+        'recall': round(sum(recalls) / len(recalls), 4) if recalls else None,
+        'p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 3) if latencies else None,
+        'exact': exact,
+    }
+
+
+def tune_search(conn: Any, queries: List[str], column_type: str, advice: Dict[str, Any], k: int = DEFAULT_K,
+                target_recall: float = TARGET_RECALL) -> Dict[str, Any]:
+    """Dobra probes/ef_search a partir da recomendação até o recall alvo (ou o máximo)."""
+    value = advice['value']
+    exact = None
+    tried = []
+    while True:
+        result = measure_recall(conn, queries, column_type, advice['setting'], value, k, exact)
+        exact = result.pop('exact')
+        tried.append(result)
+        if (result['recall'] or 0) >= target_recall or value >= advice['max_value']:
+            break
+        value = min(advice['max_value'], value * 2)
+    return {**tried[-1], 'tried': tried}
+
+
+def _search_functions(conn: Any) -> List[Tuple[str, List[str]]]:
+    cursor = conn.execute(
+        """SELECT p.oid::regprocedure::text, COALESCE(p.proconfig, '{}')
+           FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+           WHERE n.nspname = 'public' AND p.proname = ANY(%s)""",
+        (list(SEARCH_FUNCTIONS),),
+    )
+    return [(signature, list(config)) for signature, config in cursor]
+
+
+def apply_search_setting(conn: Any, setting: str, value: int) -> int:
+    """
+    Grava `setting = value` nas funções de busca (valem nas chamadas via RPC)
+    e remove o ajuste do outro método. Devolve quantas funções mudaram.
+    """
+    changed = 0
+    for signature, config in _search_functions(conn):
+        if f'{setting}={value}' in config:
+            continue
+        for other in SEARCH_SETTINGS.values():
+            if other != setting and any(item.startswith(other + '=') for item in config):
+                conn.execute(f"ALTER FUNCTION {signature} RESET {other}")
+        conn.execute(f"ALTER FUNCTION {signature} SET {setting} = {int(value)}")
+        changed += 1
+    return changed
+
+
+def record_build(conn: Any, advice: Dict[str, Any], rows: int, rebuilt: bool, tuning: Dict[str, Any],
+                 k: int, queries: int, build_seconds: Optional[float]) -> None:
+    conn.execute(
+        """INSERT INTO public.vector_index_builds
+           (index_name, method, params, search_setting, search_value, rows_at_build, rebuilt,
+            recall, k, queries, build_seconds)
+           VALUES (%s, %s, %s::jsonb, %s, %s, %s, %s, %s, %s, %s, %s)""",
+        (INDEX_NAME, advice['method'], json.dumps(advice['params']), advice['setting'], tuning['value'],
+         rows, rebuilt, tuning['recall'], k, queries, build_seconds),
+    )
+
+
+def _queries_from_sample(sample: Optional['np.ndarray'], count: int) -> List[str]:
+    if sample is None or not len(sample):
+        return []
+    return [_vector_literal(query) for query in sample_queries(sample, count)]
+
+
+def ensure_vector_index(dsn: str, method: str = 'auto', min_rows: int = MIN_INDEX_ROWS,
+                        growth_factor: float = GROWTH_FACTOR, target_recall: float = TARGET_RECALL,
+                        k: int = DEFAULT_K, query_count: int = DEFAULT_QUERIES, force: bool = False,
+                        maintenance_work_mem: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Cria, reconstrói ou só reverifica o índice conforme o crescimento desde o
+    último build. Devolve {action, reason, rows, advice, ...}.
+    """
+    require_numpy()
+    conn = connect(dsn)
+    try:
+        info = inspect(conn)
+        sample = info['sample']
+        lists_hint = ivfflat_lists(info['rows']) if method in ('auto', 'ivfflat') else 0
+        stats = distribution(sample, lists_hint) if sample is not None else {}
+        advice = advise(info['rows'], info['dimensions'], stats, method, info['pgvector'], info['column_type'],
+                        info['maintenance_work_mem'], k, min_rows)
+        result: Dict[str, Any] = {'rows': info['rows'], 'index': info['index'], 'advice': advice,
+                                  'distribution': stats, 'action': 'none'}
+        if advice['method'] is None:
+            result['reason'] = advice['notes'][0]
+            return result
+
+        index, last = info['index'], info['last_build']
+        rebuild = None
+        if force:
+            rebuild = 'forçado'
+        elif index is None:
+            rebuild = 'sem índice'
+        elif not index['valid']:
+            rebuild = 'índice inválido (build concorrente interrompido)'
+        elif index['method'] != advice['method'] or index['params'] != advice['params']:
+            if last is None or info['rows'] >= last['rows_at_build'] * growth_factor:
+                rebuild = f"parâmetros {index['method']} {index['params']} → {advice['method']} {advice['params']}"
+        grown = last is None or info['rows'] >= last['rows_at_build'] * growth_factor
+
+        if rebuild is None and not grown:
+            # Uma migration que recria as funções (CREATE OR REPLACE) apaga o SET
+            changed = apply_search_setting(conn, last['search_setting'], last['search_value'])
+            result.update(action='none', reason=f"{info['rows']} linhas < {growth_factor:g}× "
+                                                f"{last['rows_at_build']} do último build",
+                          reapplied=changed)
+            return result
+
+        build_seconds = None
+        if rebuild is not None:
+            build_seconds = build_index(conn, advice, info['column_type'], maintenance_work_mem)
+        else:
+            # Mesmo índice (HNSW cresce sem re-treino): só reajusta a busca
+            advice = {**advice, 'method': index['method'], 'params': index['params'],
+                      'setting': SEARCH_SETTINGS[index['method']]}
+        queries = _queries_from_sample(sample, query_count)
+        tuning = tune_search(conn, queries, info['column_type'], advice, k, target_recall)
+        changed = apply_search_setting(conn, advice['setting'], tuning['value'])
+        record_build(conn, advice, info['rows'], rebuild is not None, tuning, k, len(queries), build_seconds)
+        result.update(
+            action='build' if rebuild is not None else 'verify',
+            reason=rebuild or f"linhas cresceram {growth_factor:g}× desde o último build",
+            build_seconds=round(build_seconds, 3) if build_seconds is not None else None,
+            tuning=tuning,
+            functions_updated=changed,
+            index_used=index_used(conn, queries[0], info['column_type'], k) if queries else None,
+        )
+        return result
+    finally:
+        conn.close()
+
+
+def print_ensure_summary(result: Dict[str, Any]) -> None:
+    advice = result['advice']
+    if result['action'] == 'none':
+        print(f"🧭 Índice vetorial: nada a fazer ({result['reason']})")
+        if result.get('reapplied'):
+            print(f"   🔧 Ajuste de busca reaplicado em {result['reapplied']} funções")
+        return
+    params = ', '.join(f'{key}={value}' for key, value in advice['params'].items())
+    verb = 'construído' if result['action'] == 'build' else 'reverificado'
+    print(f"🧭 Índice vetorial {advice['method']} ({params}) {verb}: {result['reason']}")
+    if result.get('build_seconds') is not None:
+        print(f"   ⏱️  Build em {result['build_seconds']:.1f}s ({result['rows']} linhas)")
+    tuning = result['tuning']
+    print(f"   🎯 {advice['setting']} = {tuning['value']}: recall {tuning['recall']} "
+          f"(p50 {tuning['p50_ms']} ms, p95 {tuning['p95_ms']} ms)")
+    if result.get('index_used') is False:
+        print("   ⚠️  O planejador não usou o índice na consulta de teste")
+    for note in advice['notes']:
+        print(f"   ℹ️  {note}")
+
+
+def _print_advice(advice: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    if stats:
+        print(f"📐 Amostra: {json.dumps(stats)}")
+    if advice['method'] is None:
+        print(f"🧭 {advice['notes'][0]}")
+        return
+    params = ', '.join(f'{key}={value}' for key, value in advice['params'].items())
+    print(f"🧭 {advice['method']} ({params}), {advice['setting']} inicial = {advice['value']}, "
+          f"memória de build ~{advice['build_memory_estimate'] / 1024 ** 2:.0f} MB")
+    for note in advice['notes']:
+        print(f"   ℹ️  {note}")
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Índice vetorial da base de conhecimento (IVFFlat/HNSW)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    inspect_cmd = sub.add_parser('inspect', help='Estatísticas da tabela e recomendação (sem alterar nada)')
+    ensure = sub.add_parser('ensure', help='Criar/reconstruir o índice se necessário e ajustar a busca')
+    verify = sub.add_parser('verify', help='Medir o recall do índice atual e reajustar a busca')
+    for command in (inspect_cmd, ensure, verify):
+        command.add_argument('--dsn', default=os.getenv('DATABASE_URL'), help='Conexão direta ao Postgres')
+    for command in (inspect_cmd, ensure):
+        command.add_argument('--min-rows', type=int, default=MIN_INDEX_ROWS,
+                             help='Linhas mínimas para criar o índice')
+    for command in (ensure, verify):
+        command.add_argument('--target-recall', type=float, default=TARGET_RECALL)
+        command.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help='Consultas amostradas')
+    ensure.add_argument('--growth', type=float, default=GROWTH_FACTOR,
+                        help='Fator de crescimento das linhas que dispara nova verificação/reconstrução')
+    ensure.add_argument('--force', action='store_true', help='Reconstruir mesmo sem crescimento')
+    ensure.add_argument('--maintenance-work-mem', help="Memória do build, ex.: '2GB'")
+
+    advise_cmd = sub.add_parser('advise', help='Recomendação offline (exportação ou sintético)')
+    advise_cmd.add_argument('--input', help='Exportação NDJSON (vector_search.py export)')
+    advise_cmd.add_argument('--synthetic', type=int, default=100_000, help='Vetores sintéticos (sem --input)')
+    advise_cmd.add_argument('--dim', type=int, default=1536)
+    advise_cmd.add_argument('--min-rows', type=int, default=0, help='Linhas mínimas para recomendar índice')
+    advise_cmd.add_argument('--target-recall', type=float, default=TARGET_RECALL)
+    advise_cmd.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+
+    for command in (inspect_cmd, ensure, advise_cmd):
+        command.add_argument('--method', choices=['auto', 'ivfflat', 'hnsw'], default='auto')
+    for command in (inspect_cmd, ensure, verify, advise_cmd):
+        command.add_argument('--k', type=int, default=DEFAULT_K, help='k do recall@k (match_count)')
+
+    args = parser.parse_args()
+    require_numpy()
+
+    if args.command == 'advise':
+        index = VectorSearch.from_export(args.input) if args.input else synthetic_index(args.synthetic, args.dim)
+        rng = np.random.default_rng(0)
+        sample = index.matrix[rng.choice(len(index), size=min(SAMPLE_SIZE, len(index)), replace=False)]
+        lists_hint = ivfflat_lists(len(index)) if args.method in ('auto', 'ivfflat') else 0
+        stats = distribution(sample, lists_hint)
+        advice = advise(len(index), index.matrix.shape[1], stats, args.method,
+                        '0.5.0' if args.method != 'ivfflat' else None, k=args.k, min_rows=args.min_rows)
+        _print_advice(advice, stats)
+        if advice['method'] == 'ivfflat':
+            queries = sample_queries(index.matrix, args.queries)
+            simulation = simulate_ivfflat(index, advice, queries, args.k, args.target_recall)
+            for attempt in simulation['tried']:
+                print(f"   probes={attempt['probes']:<5} recall@{args.k}={attempt['recall']:.4f} "
+                      f"p50={attempt['p50_ms']:.3f} ms")
+            print(f"🎯 probes = {simulation['probes']} (k-means em {simulation['build_seconds']:.1f}s)")
+        elif advice['method'] == 'hnsw':
+            print("   ℹ️  Recall do HNSW só é medido no banco (ensure/verify)")
+        return
+
+    if not args.dsn:
+        print("Erro: informe --dsn ou DATABASE_URL")
+        sys.exit(1)
+
+    if args.command == 'ensure':
+        result = ensure_vector_index(args.dsn, args.method, args.min_rows, args.growth, args.target_recall,
+                                     args.k, args.queries, args.force, args.maintenance_work_mem)
+        print_ensure_summary(result)
+        return
+
+    conn = connect(args.dsn)
+    try:
+        info = inspect(conn)
+        print(f"📦 {info['rows']} linhas com embedding ({info['column_type']}), pgvector {info['pgvector']}, "
+              f"maintenance_work_mem {info['maintenance_work_mem'] / 1024 ** 2:.0f} MB")
+        if info['index']:
+            state = '' if info['index']['valid'] else ' (INVÁLIDO)'
+            print(f"🗂️  Índice atual: {info['index']['method']} {info['index']['params']}{state}")
+        else:
+            print("🗂️  Sem índice vetorial: buscas fazem varredura sequencial")
+        if info['last_build']:
+            last = info['last_build']
+            print(f"🕓 Último build: {last['built_at']} com {last['rows_at_build']} linhas, "
+                  f"{last['search_setting']} = {last['search_value']}, recall {last['recall']}")
+
+        if args.command == 'inspect':
+            lists_hint = ivfflat_lists(info['rows']) if args.method in ('auto', 'ivfflat') else 0
+            stats = distribution(info['sample'], lists_hint) if info['sample'] is not None else {}
+            _print_advice(advise(info['rows'], info['dimensions'], stats, args.method, info['pgvector'],
+                                 info['column_type'], info['maintenance_work_mem'], args.k, args.min_rows), stats)
+            return
+
+        index = info['index']
+        if index is None or not index['valid']:
+            print("Erro: nenhum índice válido para verificar; rode 'ensure'")
+            sys.exit(1)
+        method = index['method']
+        if method == 'ivfflat':
+            value = max(1, round(math.sqrt(index['params'].get('lists', 100))))
+            max_value = index['params'].get('lists', 100)
+        else:
+            value, max_value = max(40, 2 * args.k), MAX_EF_SEARCH
+        advice = {'method': method, 'params': index['params'], 'setting': SEARCH_SETTINGS[method],
+                  'value': value, 'max_value': max_value}
+        queries = _queries_from_sample(info['sample'], args.queries)
+        tuning = tune_search(conn, queries, info['column_type'], advice, args.k, args.target_recall)
+        for attempt in tuning['tried']:
+            print(f"   {advice['setting']}={attempt['value']:<5} recall@{args.k}={attempt['recall']} "
+                  f"p50={attempt['p50_ms']} ms p95={attempt['p95_ms']} ms")
+        changed = apply_search_setting(conn, advice['setting'], tuning['value'])
+        record_build(conn, advice, info['rows'], False, tuning, args.k, len(queries), None)
+        print(f"🎯 {advice['setting']} = {tuning['value']} (recall {tuning['recall']}), "
+              f"{changed} funções atualizadas")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
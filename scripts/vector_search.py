@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Busca vetorial offline (NumPy) espelhando `search_knowledge_base`
+(migration 016), para medir latência/recall e ajustar `match_threshold` e
+`match_count` sem o banco, ou como fallback local.
+
+Mesma semântica da função SQL: similaridade = 1 - distância de cosseno,
+filtro `similarity >= match_threshold`, `metadata @> filter_metadata`,
+apenas processos aprovados, ordenação por similaridade e LIMIT
+`match_count`. Os embeddings ficam numa matriz float32 contígua com linhas
+normalizadas, então cada consulta é um produto matriz-vetor seguido de um
+top-k parcial (argpartition). Um índice IVF opcional (k-means esférico)
+restringe a busca às `nprobe` listas mais próximas.
+
+Uso:
+    # Exportar knowledge_base_documents (com nome/categoria/status do processo)
+    python scripts/vector_search.py export --output scripts/kb_export.jsonl
+    # Consultar a exportação
+    python scripts/vector_search.py query --input scripts/kb_export.jsonl --text "vazamento de gás"
+    # Latência e recall em 10k–1M chunks sintéticos (exato x IVF)
+    python scripts/vector_search.py bench --synthetic 100000 --nlist 316 --nprobe 8
+
+Requisitos:
+    pip install numpy
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+APPROVED_STATUS = 'aprovado'
+
+# Colunas retornadas por search_knowledge_base (além de similarity)
+RESULT_FIELDS = ('id', 'process_id', 'process_version_id', 'chunk_index', 'chunk_type',
+                 'content', 'metadata', 'process_name', 'process_category')
+
+
+def require_numpy() -> None:
+    if np is None:
+        print("Erro: Biblioteca 'numpy' não instalada.")
+        print("Instale com: pip install numpy")
+        sys.exit(1)
+
+
+def jsonb_contains(container: Any, contained: Any, top_level: bool = True) -> bool:
+    """Semântica do operador `@>` do jsonb."""
+    if isinstance(contained, dict):
+        return isinstance(container, dict) and all(
+            key in container and jsonb_contains(container[key], value, False)
+            for key, value in contained.items()
+        )
+    if isinstance(contained, list):
+        return isinstance(container, list) and all(
+            any(jsonb_contains(item, wanted, False) for item in container) for wanted in contained
+        )
+    if isinstance(container, list):
+        # Caso especial do Postgres: array no nível superior contém um escalar
+        return top_level and any(_jsonb_scalar_equal(item, contained) for item in container)
+    return _jsonb_scalar_equal(container, contained)
+
+
+def _jsonb_scalar_equal(a: Any, b: Any) -> bool:
+    # jsonb compara números por valor (1 = 1.0), mas true não é igual a 1
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+def _parse_embedding(value: Any) -> Optional[List[float]]:
+    # PostgREST devolve vector como texto '[0.1,0.2,...]'
+    if value is None:
+        return None
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def iter_export(path: str) -> Iterator[Dict[str, Any]]:
+    """Lê uma exportação NDJSON de knowledge_base_documents."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class VectorSearch:
+    """
+    Índice em memória: matriz float32 (n, d) normalizada + metadados.
+    Linhas sem embedding (ou com vetor nulo) nunca são retornadas, como em
+    `kb.embedding IS NOT NULL`.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], matrix: 'np.ndarray', approved: 'np.ndarray'):
+        self.rows = rows
+        self.matrix = matrix
+        self.approved = approved
+        self.centroids: Optional['np.ndarray'] = None
+        self.lists: List['np.ndarray'] = []
+        self._filter_masks: Dict[str, 'np.ndarray'] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], dimensions: Optional[int] = None) -> 'VectorSearch':
+        """
+        Monta o índice. Linhas sem `process_status` (ex.: saída de
+        ingest_processes.py --offline) são tratadas como aprovadas.
+        """
+        require_numpy()
+        kept: List[Dict[str, Any]] = []
+        vectors: List[List[float]] = []
+        for row in rows:
+            embedding = _parse_embedding(row.get('embedding'))
+            if embedding is None:
+                continue
+            # Cópia sem o vetor: as linhas do chamador ficam intactas
+            kept.append({key: value for key, value in row.items() if key != 'embedding'})
+            vectors.append(embedding)
+
+        if not vectors:
+            matrix = np.zeros((0, dimensions or 0), dtype=np.float32)
+        else:
+            matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1)
+        valid = norms > 0
+        matrix[valid] /= norms[valid, None]
+
+        approved = np.fromiter((row.get('process_status', APPROVED_STATUS) == APPROVED_STATUS for row in kept),
+                               dtype=bool, count=len(kept))
+        return cls(kept, matrix, approved & valid)
+
+    @classmethod
+    def from_export(cls, path: str) -> 'VectorSearch':
+        return cls.from_rows(iter_export(path))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ---- filtros ----
+
+    def filter_mask(self, filter_metadata: Optional[Dict[str, Any]]) -> 'np.ndarray':
+        """Máscara de linhas elegíveis (aprovadas e com metadata @> filtro), memoizada por filtro."""
+        if not filter_metadata:
+            return self.approved
+        key = json.dumps(filter_metadata, sort_keys=True)
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter((jsonb_contains(row.get('metadata') or {}, filter_metadata) for row in self.rows),
+                               dtype=bool, count=len(self.rows)) & self.approved
+            self._filter_masks[key] = mask
+        return mask
+
+    # ---- IVF ----
+
+    def build_ivf(self, nlist: int, iterations: int = 10, sample_size: int = 50_000, seed: int = 0) -> None:
+        """
+        Índice IVF: k-means esférico (centróides normalizados) treinado numa
+        amostra; cada linha vai para a lista do centróide mais próximo.
+        Índice vazio não tem o que agrupar: fica sem IVF (busca exata).
+        """
+        n = len(self.rows)
+        if n == 0:
+            self.centroids, self.lists = None, []
+            return
+        rng = np.random.default_rng(seed)
+        nlist = max(1, min(nlist, n))
+        sample = self.matrix[rng.choice(n, size=min(n, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            # Lista vazia mantém o centróide anterior
+            centroids[norms > 0] = sums[norms > 0] / norms[norms > 0, None]
+
+        assignment = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65_536):
+            assignment[start:start + 65_536] = np.argmax(self.matrix[start:start + 65_536] @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind='stable')
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        self.centroids = centroids
+        self.lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+
+    # ---- busca ----
+
+    def _normalize_query(self, query_embedding: Any) -> 'np.ndarray':
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+
+    def search_indices(self, query_embedding: Any, match_threshold: float = 0.7, match_count: int = 10,
+                       filter_metadata: Optional[Dict[str, Any]] = None,
+                       nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(linha, similaridade) dos `match_count` mais similares acima do threshold."""
+        query = self._normalize_query(query_embedding)
+        mask = self.filter_mask(filter_metadata)
+
+        if nprobe and self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            candidates = np.concatenate([self.lists[c] for c in probes])
+            candidates = candidates[mask[candidates]]
+        else:
+            candidates = np.flatnonzero(mask)
+        if not len(candidates) or match_count <= 0:
+            return []
+
+        if len(candidates) > len(self.rows) // 4:
+            # Produto com a matriz inteira é mais barato que copiar muitas linhas
+            scores = (self.matrix @ query)[candidates]
+        else:
+            scores = self.matrix[candidates] @ query
+        keep = scores >= match_threshold
+        candidates, scores = candidates[keep], scores[keep]
+        if len(scores) > match_count:
+            top = np.argpartition(-scores, match_count - 1)[:match_count]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(int(candidates[i]), float(scores[i])) for i in order]
+
+    def search(self, query_embedding: Any, match_threshold: float = 0.7, match_count: int = 10,
+               filter_metadata: Optional[Dict[str, Any]] = None,
+               nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Mesmas colunas de search_knowledge_base."""
+        results = []
+        for index, similarity in self.search_indices(query_embedding, match_threshold, match_count,
+                                                     filter_metadata, nprobe):
+            row = self.rows[index]
+            result = {field: row.get(field) for field in RESULT_FIELDS}
+            result['similarity'] = similarity
+            results.append(result)
+        return results
+
+
+def export_knowledge_base(supabase: Any, path: str, page_size: int = 500) -> int:
+    """
+    Exporta knowledge_base_documents (com nome, categoria e status do
+    processo) para NDJSON, paginando com `range`.
+    """
+    count = 0
+    offset = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while True:
+            result = (
+                supabase.table('knowledge_base_documents')
+                .select('id,process_id,process_version_id,chunk_index,chunk_type,content,metadata,embedding,'
+                        'processes(name,category,status)')
+                .range(offset, offset + page_size - 1)
+                .execute()
+            )
+            for row in result.data or []:
+                process = row.pop('processes', None) or {}
+                row['process_name'] = process.get('name')
+                row['process_category'] = process.get('category')
+                row['process_status'] = process.get('status')
+                row['embedding'] = _parse_embedding(row.get('embedding'))
+                f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n')
+                count += 1
+            if not result.data or len(result.data) < page_size:
+                return count
+            offset += page_size
+
+
+def synthetic_index(count: int, dimensions: int = 1536, clusters: int = 64, seed: int = 0) -> VectorSearch:
+    """Chunks sintéticos agrupados em `clusters` tópicos, com categorias e status variados."""
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions), dtype=np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    matrix = centers[labels] + 0.6 * rng.standard_normal((count, dimensions), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    categories = ['governanca', 'operacao', 'areas_comuns', 'convivencia', 'eventos', 'emergencias']
+    rows = [{
+        'id': f'synthetic-{i}',
+        'chunk_index': i % 6,
+        'chunk_type': 'description',
+        'content': '',
+        'metadata': {'category': categories[int(labels[i]) % len(categories)]},
+        'process_category': categories[int(labels[i]) % len(categories)],
+    } for i in range(count)]
+    approved = rng.random(count) < 0.9
+    return VectorSearch(rows, np.ascontiguousarray(matrix), approved)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_bench(index: VectorSearch, queries: 'np.ndarray', match_threshold: float, match_count: int,
+              nprobe: Optional[int], filter_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Latência do modo exato (e do IVF, se construído) e recall@k do IVF contra o exato."""
+    report: Dict[str, Any] = {'rows': len(index), 'queries': len(queries), 'match_count': match_count,
+                              'match_threshold': match_threshold}
+    modes = [('exact', None)] + ([('ivf', nprobe)] if nprobe and index.centroids is not None else [])
+    exact_results: List[set] = []
+    for mode, probe in modes:
+        latencies = []
+        recalls = []
+        for q, query in enumerate(queries):
+            start = time.perf_counter()
+            found = index.search_indices(query, match_threshold, match_count, filter_metadata, probe)
+            latencies.append((time.perf_counter() - start) * 1000)
+            ids = {i for i, _ in found}
+            if mode == 'exact':
+                exact_results.append(ids)
+            elif exact_results[q]:
+                recalls.append(len(ids & exact_results[q]) / len(exact_results[q]))
+        report[mode] = {
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'qps': round(len(latencies) / (sum(latencies) / 1000), 1) if sum(latencies) else None,
+        }
+        if mode == 'ivf':
+            report[mode]['nprobe'] = probe
+            report[mode]['recall'] = round(sum(recalls) / len(recalls), 4) if recalls else None
+    return report
+
+
+def main():
+    """Função principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Busca vetorial offline (espelho de search_knowledge_base)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help='Exportar knowledge_base_documents do Supabase para NDJSON')
+    export.add_argument('--url', default=os.getenv('SUPABASE_URL'))
+    export.add_argument('--key', default=os.getenv('SUPABASE_SERVICE_KEY'))
+    export.add_argument('--output', default='scripts/kb_export.jsonl')
+
+    query = sub.add_parser('query', help='Consultar uma exportação')
+    query.add_argument('--input', required=True, help='Exportação NDJSON')
+    query.add_argument('--text', required=True, help='Texto da consulta')
+    query.add_argument('--embedder', choices=['api', 'local'], default='api')
+
+    bench = sub.add_parser('bench', help='Latência e recall (exato x IVF)')
+    bench.add_argument('--input', help='Exportação NDJSON (em vez de dados sintéticos)')
+    bench.add_argument('--synthetic', type=int, default=10_000, help='Número de chunks sintéticos')
+    bench.add_argument('--dim', type=int, default=1536, help='Dimensão dos vetores sintéticos')
+    bench.add_argument('--queries', type=int, default=100)
+    bench.add_argument('--output', help='Salvar o relatório em JSON')
+
+    for command in (query, bench):
+        command.add_argument('--match-threshold', type=float, default=0.7)
+        command.add_argument('--match-count', type=int, default=10)
+        command.add_argument('--filter', help='filter_metadata em JSON, ex.: \'{"category": "emergencias"}\'')
+        command.add_argument('--nlist', type=int, default=0, help='Listas do índice IVF (0 = busca exata)')
+        command.add_argument('--nprobe', type=int, default=8, help='Listas visitadas por consulta no IVF')
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        try:
+            from supabase import create_client
+        except ImportError:
+            print("Erro: Biblioteca 'supabase' não instalada.")
+            print("Instale com: pip install supabase")
+            sys.exit(1)
+        if not args.url or not args.key:
+            print("Erro: SUPABASE_URL e SUPABASE_SERVICE_KEY são obrigatórios")
+            sys.exit(1)
+        count = export_knowledge_base(create_client(args.url, args.key), args.output)
+        print(f"✅ {count} documentos exportados para {args.output}")
+        return
+
+    require_numpy()
+    filter_metadata = json.loads(args.filter) if args.filter else None
+
+    start = time.perf_counter()
+    if args.command == 'bench' and not args.input:
+        index = synthetic_index(args.synthetic, args.dim)
+    else:
+        index = VectorSearch.from_export(args.input)
+    print(f"📦 {len(index)} chunks carregados em {time.perf_counter() - start:.2f}s")
+    if args.nlist:
+        start = time.perf_counter()
+        index.build_ivf(args.nlist)
+        print(f"🗂️  IVF com {args.nlist} listas em {time.perf_counter() - start:.2f}s")
+    nprobe = args.nprobe if args.nlist else None
+
+    if args.command == 'query':
+        from embedders import embedder_from_env
+        embedding = embedder_from_env(args.embedder).embed([args.text])[0]
+        for result in index.search(embedding, args.match_threshold, args.match_count, filter_metadata, nprobe):
+            print(f"{result['similarity']:.4f}  [{result['chunk_type']}] {result['process_name'] or '-'}: "
+                  f"{result['content'][:80]!r}")
+        return
+
+    rng = np.random.default_rng(1)
+    queries = index.matrix[rng.choice(len(index), size=min(args.queries, len(index)), replace=False)]
+    queries = queries + 0.3 * rng.standard_normal(queries.shape, dtype=np.float32) / np.sqrt(queries.shape[1])
+    report = run_bench(index, queries, args.match_threshold, args.match_count, nprobe, filter_metadata)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Relatório salvo em: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+-- Migration: Nome de processo único
+-- Descrição: Permite upsert em lote (on_conflict=name) no seed de processos
+-- Data: 2026-10-18
+
+-- Índice único usado como alvo de ON CONFLICT pelo seed em lote
+-- (scripts/seed_processes_to_supabase.py --batch-size)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_processes_name_unique
+ON processes(name);
+
+COMMENT ON INDEX idx_processes_name_unique IS 'Garante nome único de processo e serve de alvo para upsert em lote';
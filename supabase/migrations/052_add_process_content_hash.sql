@@ -0,0 +1,10 @@
+-- Migration: Hash de conteúdo do processo
+-- Descrição: Armazena o hash do conteúdo seedado para seed incremental/idempotente
+-- Data: 2026-10-18
+
+-- sha256 do registro convertido por scripts/seed_processes_to_supabase.py
+-- (ignora criador), usado para detectar processos inalterados ou modificados
+ALTER TABLE processes
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN processes.content_hash IS 'Hash sha256 do conteúdo enviado pelo seed (scripts/seed_manifest.py)';
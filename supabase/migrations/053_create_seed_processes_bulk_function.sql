@@ -0,0 +1,159 @@
+-- Migration: Seed de processos em lote (set-based)
+-- Descrição: seed_processes_bulk(jsonb) insere um array de processos e suas versões 1
+--            com dois INSERTs e devolve o resultado por nome; o trigger de ingestão de
+--            process_versions passa a disparar uma vez por statement
+-- Data: 2026-10-18
+
+-- Registros esperados em p_processes (saída de convert_process_to_db_format,
+-- ver scripts/seed_processes_to_supabase.py --rpc):
+--   name, category, subcategory, document_type, status, content_hash,
+--   content, content_text, entities_involved, variables_applied
+--
+-- Resultado por registro, na ordem do array:
+--   created    processo e versão 1 inseridos
+--   exists     já havia processo com o nome (nada alterado)
+--   duplicate  nome repetido no próprio array (só a primeira ocorrência conta)
+CREATE OR REPLACE FUNCTION seed_processes_bulk(p_processes JSONB, p_creator_id UUID DEFAULT NULL)
+RETURNS TABLE (name TEXT, outcome TEXT, process_id UUID, version_id UUID)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_creator_id UUID;
+BEGIN
+  IF p_processes IS NULL OR jsonb_typeof(p_processes) != 'array' THEN
+    RAISE EXCEPTION 'p_processes deve ser um array JSON';
+  END IF;
+
+  v_creator_id := COALESCE(
+    p_creator_id,
+    (SELECT s.id FROM stakeholders s WHERE s.email = 'sistema@villadelfiori.com' LIMIT 1)
+  );
+
+  IF v_creator_id IS NULL THEN
+    RAISE EXCEPTION 'Stakeholder criador não encontrado (informe p_creator_id)';
+  END IF;
+
+  RETURN QUERY
+  WITH input AS (
+    SELECT d.*
+    FROM ROWS FROM (
+      jsonb_to_recordset(p_processes) AS (
+        name TEXT,
+        category TEXT,
+        subcategory TEXT,
+        document_type TEXT,
+        status TEXT,
+        content_hash TEXT,
+        content JSONB,
+        content_text TEXT,
+        entities_involved JSONB,
+        variables_applied JSONB
+      )
+    ) WITH ORDINALITY AS d(
+      name, category, subcategory, document_type, status, content_hash,
+      content, content_text, entities_involved, variables_applied, ord
+    )
+  ),
+  first_by_name AS (
+    SELECT DISTINCT ON (i.name) i.*
+    FROM input i
+    ORDER BY i.name, i.ord
+  ),
+  -- 1º INSERT: todos os processos do array; nomes existentes são ignorados (migration 051)
+  new_processes AS (
+    INSERT INTO processes (
+      name, category, subcategory, document_type, status, creator_id, content_hash
+    )
+    SELECT f.name,
+           f.category::processcategory,
+           f.subcategory,
+           f.document_type::documenttype,
+           COALESCE(f.status, 'rascunho')::processstatus,
+           v_creator_id,
+           f.content_hash
+    FROM first_by_name f
+    ORDER BY f.ord
+    ON CONFLICT (name) DO NOTHING
+    RETURNING id, name
+  ),
+  -- 2º INSERT: versão 1 de cada processo criado acima
+  new_versions AS (
+    INSERT INTO process_versions (
+      process_id, version_number, content, content_text,
+      entities_involved, variables_applied, created_by, status
+    )
+    SELECT np.id,
+           1,
+           f.content,
+           COALESCE(f.content_text, ''),
+           COALESCE(f.entities_involved, '[]'::jsonb),
+           COALESCE(f.variables_applied, '{}'::jsonb),
+           v_creator_id,
+           COALESCE(f.status, 'rascunho')::processstatus
+    FROM new_processes np
+    JOIN first_by_name f ON f.name = np.name
+    RETURNING id, process_id
+  )
+  SELECT i.name,
+         CASE
+           WHEN i.ord <> f.ord THEN 'duplicate'
+           WHEN np.id IS NOT NULL THEN 'created'
+           ELSE 'exists'
+         END,
+         COALESCE(np.id, p.id),
+         CASE WHEN i.ord = f.ord THEN nv.id END
+  FROM input i
+  JOIN first_by_name f ON f.name = i.name
+  LEFT JOIN new_processes np ON np.name = i.name
+  LEFT JOIN new_versions nv ON nv.process_id = np.id
+  LEFT JOIN processes p ON p.name = i.name
+  ORDER BY i.ord;
+END;
+$$;
+
+COMMENT ON FUNCTION seed_processes_bulk(JSONB, UUID) IS 'Seed set-based: insere processos e versões 1 de um array JSONB com dois INSERTs e retorna created/exists/duplicate por nome';
+
+-- Só o service role (scripts de seed) pode chamar a função
+REVOKE EXECUTE ON FUNCTION seed_processes_bulk(JSONB, UUID) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION seed_processes_bulk(JSONB, UUID) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION seed_processes_bulk(JSONB, UUID) TO service_role;
+
+-- Trigger de ingestão em process_versions: uma execução por statement, com as
+-- linhas novas na tabela de transição (antes: uma execução e uma consulta a
+-- processes por linha inserida). Mesma regra da migration 015/045.
+CREATE OR REPLACE FUNCTION trigger_process_versions_inserted_for_ingestion()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+  INSERT INTO knowledge_base_ingestion_status (
+    process_id,
+    process_version_id,
+    status,
+    started_at
+  )
+  SELECT nv.process_id, nv.id, 'pending', NOW()
+  FROM new_versions nv
+  JOIN processes p
+    ON p.id = nv.process_id
+   AND p.status = 'aprovado'
+   AND p.current_version_number = nv.version_number
+  ON CONFLICT DO NOTHING;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_process_version_approved_for_ingestion ON process_versions;
+
+CREATE TRIGGER trigger_process_version_approved_for_ingestion
+  AFTER INSERT ON process_versions
+  REFERENCING NEW TABLE AS new_versions
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION trigger_process_versions_inserted_for_ingestion();
+
+COMMENT ON FUNCTION trigger_process_versions_inserted_for_ingestion() IS 'Marca novas versões aprovadas para ingestão na base de conhecimento (uma execução por statement)';
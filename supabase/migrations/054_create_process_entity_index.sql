@@ -0,0 +1,61 @@
+-- Migration: Índice invertido entidade → processo/passo
+-- Descrição: Tabela pré-computada pelos scripts de seed/ingestão (scripts/entity_index.py)
+--            a partir de entities, workflow e raci do conteúdo da versão atual
+-- Data: 2026-10-18
+
+-- Uma linha por ocorrência de uma entidade em um processo:
+--   source = 'entity'    lista entities do processo (step = '', role = '')
+--   source = 'workflow'  entidade citada no texto de um passo do workflow (role = '')
+--   source = 'raci'      entidade em uma linha da matriz RACI (role = R/A/C/I)
+-- entity_key é o nome normalizado (minúsculas, sem acentos, espaços simples).
+CREATE TABLE IF NOT EXISTS process_entity_index (
+    entity_key TEXT NOT NULL,
+    entity_name TEXT NOT NULL,
+    process_id UUID NOT NULL REFERENCES processes(id) ON DELETE CASCADE,
+    process_version_id UUID NOT NULL REFERENCES process_versions(id) ON DELETE CASCADE,
+    source TEXT NOT NULL CHECK (source IN ('entity', 'workflow', 'raci')),
+    step TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '' CHECK (role IN ('', 'R', 'A', 'C', 'I')),
+    PRIMARY KEY (entity_key, process_id, source, step, role)
+);
+
+-- "Quais processos envolvem X?" usa a PK; "onde X é A?" usa este índice
+CREATE INDEX IF NOT EXISTS idx_process_entity_index_key_role
+    ON process_entity_index(entity_key, role, process_id);
+-- Reindexação incremental apaga as linhas por processo
+CREATE INDEX IF NOT EXISTS idx_process_entity_index_process_id
+    ON process_entity_index(process_id);
+CREATE INDEX IF NOT EXISTS idx_process_entity_index_version_id
+    ON process_entity_index(process_version_id);
+
+-- Versão indexada de cada processo: só processos cujo current_version_number
+-- mudou são reindexados
+CREATE TABLE IF NOT EXISTS process_entity_index_state (
+    process_id UUID PRIMARY KEY REFERENCES processes(id) ON DELETE CASCADE,
+    process_version_id UUID NOT NULL REFERENCES process_versions(id) ON DELETE CASCADE,
+    version_number INTEGER NOT NULL,
+    entries_count INTEGER NOT NULL DEFAULT 0,
+    indexed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE process_entity_index IS 'Índice invertido entidade → processo/passo RACI/papel, mantido por scripts/entity_index.py';
+COMMENT ON COLUMN process_entity_index.entity_key IS 'Nome da entidade normalizado (minúsculas, sem acentos)';
+COMMENT ON COLUMN process_entity_index.step IS 'Passo do workflow/RACI onde a entidade aparece ('''' para a lista entities)';
+COMMENT ON COLUMN process_entity_index.role IS 'Papel RACI: R (responsible), A (accountable), C (consulted), I (informed)';
+COMMENT ON TABLE process_entity_index_state IS 'Versão de cada processo refletida em process_entity_index';
+
+-- RLS: leitura para usuários autenticados; escrita só pelo service role (scripts)
+ALTER TABLE process_entity_index ENABLE ROW LEVEL SECURITY;
+ALTER TABLE process_entity_index_state ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Usuários autenticados podem consultar o índice de entidades"
+ON process_entity_index
+FOR SELECT
+TO authenticated
+USING (true);
+
+CREATE POLICY "Usuários autenticados podem consultar o estado do índice de entidades"
+ON process_entity_index_state
+FOR SELECT
+TO authenticated
+USING (true);
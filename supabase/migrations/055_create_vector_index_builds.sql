@@ -0,0 +1,32 @@
+-- Migration: Registro dos builds do índice vetorial
+-- Descrição: Histórico dos índices IVFFlat/HNSW de knowledge_base_documents.embedding criados
+--            por scripts/vector_index.py (parâmetros, linhas no build e recall medido), usado
+--            para decidir quando reconstruir após ingestões em massa
+-- Data: 2026-10-18
+
+-- Uma linha por build (ou reverificação) do índice; a mais recente por index_name é o estado atual
+CREATE TABLE IF NOT EXISTS vector_index_builds (
+    id BIGSERIAL PRIMARY KEY,
+    index_name TEXT NOT NULL,
+    method TEXT NOT NULL CHECK (method IN ('ivfflat', 'hnsw')),
+    params JSONB NOT NULL DEFAULT '{}', -- lists (ivfflat) ou m/ef_construction (hnsw)
+    search_setting TEXT, -- ivfflat.probes ou hnsw.ef_search, aplicado nas funções de busca
+    search_value INTEGER,
+    rows_at_build BIGINT NOT NULL,
+    rebuilt BOOLEAN NOT NULL DEFAULT true, -- false: só reverificação do recall
+    recall DOUBLE PRECISION,
+    k INTEGER,
+    queries INTEGER,
+    build_seconds DOUBLE PRECISION,
+    built_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_vector_index_builds_name_built_at
+    ON vector_index_builds(index_name, built_at DESC);
+
+COMMENT ON TABLE vector_index_builds IS 'Builds do índice vetorial da base de conhecimento, mantidos por scripts/vector_index.py';
+COMMENT ON COLUMN vector_index_builds.rows_at_build IS 'Linhas com embedding quando o índice foi construído (base dos limiares de crescimento)';
+COMMENT ON COLUMN vector_index_builds.recall IS 'Recall@k do índice contra a busca exata, em consultas amostradas';
+
+-- RLS sem políticas: apenas o service role / dono do banco (scripts) lê e escreve
+ALTER TABLE vector_index_builds ENABLE ROW LEVEL SECURITY;